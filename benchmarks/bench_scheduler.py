@@ -0,0 +1,305 @@
+"""Time the agent's task operations, persistence and reminder paths at growing task counts.
+
+    python benchmarks/bench_scheduler.py --sizes 1000 10000 100000 1000000 --output results.json
+
+Each size gets a fresh synthetic tasks.json in a temporary directory. Timings are
+wall-clock seconds; per-operation figures are averages over --ops calls. Results are
+written as JSON (benchmarks/bench_results.json unless --output says otherwise) so runs
+from different releases can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reminder_bus import DIGEST_WINDOW_SECONDS, notification_task_ids  # noqa: E402
+from reminder_queue import REMINDER_KINDS  # noqa: E402
+from task_metrics import REMINDERS_SENT, WORKER_LOOP_SECONDS  # noqa: E402
+from task_model import CATEGORIES, COMPLETED, PENDING, PRIORITIES  # noqa: E402
+from task_engine import TaskManagerAgent  # noqa: E402
+from task_storage import write_json_atomic  # noqa: E402
+from task_view import LiveTaskList  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results.json")
+# Minutes between a latency probe's manual reminder and its due time; beyond the auto-reminder
+# window, so the probe's auto reminder does not fire during the measurement
+PROBE_LEAD_MINUTES = 45
+DUE_DISTRIBUTIONS = ("uniform", "clustered", "soon")
+
+
+def due_offsets(count: int, distribution: str, horizon_hours: float, rng: random.Random) -> Iterator[float]:
+    """Seconds from now until each task is due.
+
+    uniform: spread over the horizon, with a tenth of it already overdue
+    clustered: bunched around a few deadlines within the horizon
+    soon: inside the 30 minute auto-reminder window, so reminders fire at once
+    """
+    horizon = horizon_hours * 3600
+    if distribution == "uniform":
+        return (rng.uniform(-0.1 * horizon, horizon) for _ in range(count))
+    if distribution == "clustered":
+        centres = [rng.uniform(0, horizon) for _ in range(8)]
+        return (rng.gauss(rng.choice(centres), horizon / 50) for _ in range(count))
+    if distribution == "soon":
+        return (rng.uniform(60, 29 * 60) for _ in range(count))
+    raise ValueError(f"Unknown due distribution: {distribution!r}")
+
+
+def generate_records(count: int, pending_ratio: float = 0.7, distribution: str = "uniform",
+                     horizon_hours: float = 24 * 14, seed: int = 0) -> Iterator[Dict]:
+    """Synthetic tasks.json records with the given pending/completed mix and due-date spread"""
+    rng = random.Random(seed)
+    now = time.time()
+    for i, offset in enumerate(due_offsets(count, distribution, horizon_hours, rng)):
+        due = now + offset
+        created = min(now, due) - rng.uniform(3600, 7 * 86400)
+        done = rng.random() >= pending_ratio
+        manual = due - rng.choice((5, 15, 60)) * 60 if rng.random() < 0.5 else None
+        yield {
+            'id': f"task_{i + 1}_{int(created)}",
+            'title': f"Synthetic task {i + 1}",
+            'description': "Generated by bench_scheduler" if i % 4 == 0 else "",
+            'due_date': datetime.fromtimestamp(due).isoformat(),
+            'priority': PRIORITIES[i % len(PRIORITIES)],
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'status': COMPLETED if done else PENDING,
+            'created_at': datetime.fromtimestamp(created).isoformat(),
+            'completed_at': datetime.fromtimestamp(created + rng.uniform(60, 86400)).isoformat() if done else None,
+            'reminders_sent': 0,
+            'last_reminder_sent': None,
+            'manual_reminder_time': datetime.fromtimestamp(manual).isoformat() if manual else None,
+            'manual_reminder_sent': done,
+        }
+
+
+class LatencySink:
+    """Records when each reminder reaches the notification layer, alone or in a digest"""
+
+    name = "latency"
+    timeout = 1.0
+
+    def __init__(self):
+        self.received: Dict[str, float] = {}
+
+    async def send(self, notification: Dict):
+        for task_id in notification_task_ids(notification):
+            self.received.setdefault(task_id, time.time())
+
+
+@contextmanager
+def quiet():
+    """Silence the agent's per-operation prints while timing"""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
+
+
+@contextmanager
+def timed(results: List[Dict], size: int, operation: str, ops: int = 1):
+    """Time the block and append a result row for it"""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    results.append({'size': size, 'operation': operation, 'ops': ops,
+                    'seconds': elapsed, 'per_op_ms': elapsed / ops * 1000})
+
+
+def reminders_sent() -> float:
+    """Auto and manual reminders sent by this process so far"""
+    return sum(REMINDERS_SENT.value(kind=kind) for kind in REMINDER_KINDS)
+
+
+def measure_worker_sweep(agent: TaskManagerAgent, timeout: float = 600) -> Dict:
+    """Start the reminder service and time its first pass: everything already due, popped and sent"""
+    due_now = agent.reminder_queue.next_fire_time()
+    due_now = due_now is not None and due_now <= time.time()
+    sent, batches = reminders_sent(), WORKER_LOOP_SECONDS.count()
+    start = time.perf_counter()
+    agent.start_reminder_service()
+    # The worker observes the loop histogram once it has handled a batch
+    deadline = time.time() + timeout
+    while due_now and WORKER_LOOP_SECONDS.count() == batches and time.time() < deadline:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    agent.stop_reminder_service()
+    fired = int(reminders_sent() - sent)
+    return {'operation': "reminder_worker_sweep", 'ops': max(fired, 1), 'seconds': elapsed,
+            'per_op_ms': elapsed / max(fired, 1) * 1000, 'fired': fired}
+
+
+def measure_fire_latency(agent: TaskManagerAgent, sink: LatencySink, count: int, spread: float) -> Dict:
+    """Create `count` tasks whose manual reminders fire over the next `spread` seconds and time how late they arrive"""
+    now = time.time()
+    fire_times = [now + 0.2 + spread * i / count for i in range(count)]
+    with quiet():
+        task_ids = agent.create_tasks([
+            {'title': f"Latency probe {i}", 'description': "",
+             'due_date': datetime.fromtimestamp(fire_at) + timedelta(minutes=PROBE_LEAD_MINUTES),
+             'manual_reminder_minutes': PROBE_LEAD_MINUTES}
+            for i, fire_at in enumerate(fire_times)])
+        scheduled = dict(zip(task_ids, fire_times))
+        sink.received.clear()
+        agent.start_reminder_service()
+        deadline = time.time() + spread + 10
+        while not all(task_id in sink.received for task_id in scheduled) and time.time() < deadline:
+            time.sleep(0.05)
+        agent.stop_reminder_service()
+    lateness = sorted((sink.received[task_id] - fire_at) * 1000
+                      for task_id, fire_at in scheduled.items() if task_id in sink.received)
+    if not lateness:
+        return {'count': count, 'delivered': 0}
+    return {
+        'count': count,
+        'delivered': len(lateness),
+        'p50_ms': statistics.median(lateness),
+        'p95_ms': lateness[int(0.95 * (len(lateness) - 1))],
+        'max_ms': lateness[-1],
+    }
+
+
+def bench_size(size: int, args, workdir: str) -> Dict:
+    results: List[Dict] = []
+    rng = random.Random(args.seed)
+    tasks_file = os.path.join(workdir, f"tasks_{size}.json")
+    write_json_atomic(tasks_file, list(generate_records(
+        size, args.pending_ratio, args.due, args.horizon_hours, args.seed)))
+
+    sink = LatencySink()
+    with quiet():
+        with timed(results, size, "startup"):
+            # No archive runs: the worker sweep should time reminders only
+            agent = TaskManagerAgent(tasks_file, storage_mode=args.storage,
+                                     write_behind_interval=args.write_behind, notification_sinks=[sink],
+                                     archive_after_days=None)
+            agent.digester.window = args.digest_window
+
+        if args.storage != "sqlite":
+            # Reading tasks.json again replaces the store's contents, as at startup
+            with timed(results, size, "load_tasks"):
+                agent.load_tasks()
+
+        ops = min(args.ops, max(1, agent.store.count(PENDING) // 3))
+        due = datetime.now() + timedelta(hours=3)
+        with timed(results, size, "create_task", ops):
+            for i in range(ops):
+                agent.create_task(f"Bench task {i}", "", due, manual_reminder_minutes=15)
+
+        pending_ids = [task.id for task in agent.store.pending()]
+        picked = rng.sample(pending_ids, 2 * ops)
+        with timed(results, size, "mark_task_completed", ops):
+            for task_id in picked[:ops]:
+                agent.mark_task_completed(task_id)
+        with timed(results, size, "delete_task", ops):
+            for task_id in picked[ops:]:
+                agent.delete_task(task_id)
+        with timed(results, size, "flush"):
+            agent.flush()
+
+        with timed(results, size, "get_tasks_due_soon", ops):
+            for _ in range(ops):
+                agent.get_tasks_due_soon()
+
+        with timed(results, size, "save_tasks"):
+            agent.save_tasks()
+
+        # What a UI list fragment pays per refresh: a full build once, then one change at a time
+        live = LiveTaskList(PENDING)
+        with timed(results, size, "live_list_rebuild"):
+            live.refresh(agent.store)
+        with timed(results, size, "live_list_delta_refresh", ops):
+            for task in rng.sample(live.tasks, ops):
+                agent.store.modify(task.id, priority=PRIORITIES[0])
+                live.refresh(agent.store)
+
+        # Full-text search: the first query builds the index, later ones use it
+        with timed(results, size, "search_index_build"):
+            agent.search_tasks("synthetic")
+        queries = [f"task {rng.randrange(size)}" for _ in range(ops)]
+        with timed(results, size, "search_query", ops):
+            for query in queries:
+                agent.search_tasks(query)
+        with timed(results, size, "search_prefix_query", ops):
+            for _ in range(ops):
+                agent.search_tasks("synth gen")
+
+        # Startup scheduled every pending task's reminders; the service's first pass sends
+        # whatever came due since
+        results.append({'size': size, **measure_worker_sweep(agent)})
+        agent.dispatcher.drain(30)
+
+    latency = measure_fire_latency(agent, sink, args.latency_probes, args.latency_spread)
+    with quiet():
+        agent.close()
+    return {'size': size, 'timings': results, 'fire_latency': latency}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--storage", default="json", choices=("json", "journal", "sqlite"))
+    parser.add_argument("--write-behind", type=float, default=1.0,
+                        help="write-behind interval in seconds, as the app uses (negative for synchronous writes)")
+    parser.add_argument("--ops", type=int, default=200, help="calls per timed operation")
+    parser.add_argument("--pending-ratio", type=float, default=0.7)
+    parser.add_argument("--due", default="uniform", choices=DUE_DISTRIBUTIONS)
+    parser.add_argument("--horizon-hours", type=float, default=24 * 14)
+    parser.add_argument("--latency-probes", type=int, default=50)
+    parser.add_argument("--latency-spread", type=float, default=2.0, help="seconds the probes are spread over")
+    parser.add_argument("--digest-window", type=float, default=DIGEST_WINDOW_SECONDS,
+                        help="seconds reminders are coalesced over before reaching the sinks (0 sends each at once)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--keep", action="store_true", help="keep the generated task files")
+    args = parser.parse_args()
+    if args.write_behind is not None and args.write_behind < 0:
+        args.write_behind = None
+
+    workdir = tempfile.mkdtemp(prefix="task-bench-")
+    report = {
+        'meta': {
+            'started_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'storage': args.storage,
+            'write_behind': args.write_behind,
+            'ops': args.ops,
+            'pending_ratio': args.pending_ratio,
+            'due': args.due,
+            'digest_window': args.digest_window,
+            'seed': args.seed,
+        },
+        'runs': [],
+    }
+    try:
+        for size in args.sizes:
+            run = bench_size(size, args, workdir)
+            report['runs'].append(run)
+            print(f"\n{size:,} tasks ({args.storage})")
+            for row in run['timings']:
+                print(f"  {row['operation']:<24} {row['seconds']:9.4f}s  {row['per_op_ms']:10.3f} ms/op")
+            latency = run['fire_latency']
+            if latency.get('delivered'):
+                print(f"  {'reminder fire latency':<24} p50 {latency['p50_ms']:.1f} ms  "
+                      f"p95 {latency['p95_ms']:.1f} ms  max {latency['max_ms']:.1f} ms")
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📊 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
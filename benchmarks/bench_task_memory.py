@@ -0,0 +1,77 @@
+"""Compare per-task memory of the original dict tasks with slotted Task objects.
+
+    python benchmarks/bench_task_memory.py --count 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_model import CATEGORIES, PRIORITIES, Task  # noqa: E402
+
+
+def make_dict_task(i: int, now: datetime) -> dict:
+    """A task in the shape create_task used to build"""
+    due = now + timedelta(minutes=i % 10000)
+    return {
+        'id': f"task_{i}_{int(now.timestamp())}",
+        'title': f"Task {i}",
+        'description': "",
+        'due_date': due,
+        'priority': PRIORITIES[i % len(PRIORITIES)],
+        'category': CATEGORIES[i % len(CATEGORIES)],
+        'status': 'pending',
+        'created_at': now,
+        'completed_at': None,
+        'reminders_sent': 0,
+        'last_reminder_sent': None,
+        'manual_reminder_time': due - timedelta(minutes=15),
+        'manual_reminder_sent': False,
+    }
+
+
+def make_slotted_task(i: int, now: datetime) -> Task:
+    return Task.from_dict(_record(make_dict_task(i, now)))
+
+
+def _record(task: dict) -> dict:
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in task.items()}
+
+
+def measure(factory, count: int) -> dict:
+    now = datetime.now()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = [factory(i, now) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    gc.collect()
+    return {'bytes_per_task': current / count, 'total_mb': current / 2 ** 20, 'build_seconds': elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = {
+        'dict': measure(make_dict_task, args.count),
+        'slotted': measure(make_slotted_task, args.count),
+    }
+    for name, result in results.items():
+        print(f"{name:>8}: {result['bytes_per_task']:8.1f} bytes/task  "
+              f"{result['total_mb']:9.1f} MiB total  built in {result['build_seconds']:.2f}s")
+    saved = 1 - results['slotted']['bytes_per_task'] / results['dict']['bytes_per_task']
+    print(f"Slotted tasks use {saved:.0%} less memory at {args.count:,} tasks")
+
+
+if __name__ == "__main__":
+    main()
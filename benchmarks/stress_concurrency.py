@@ -0,0 +1,182 @@
+"""Hammer the agent from several threads at once while the reminder worker runs.
+
+    python benchmarks/stress_concurrency.py --seconds 10 --storage journal
+
+Creator threads add tasks due soon (so auto and manual reminders fire), completer and
+deleter threads finish or remove random tasks, reminder threads send manual reminders and
+reader threads check that every snapshot is internally consistent. At the end the store's
+indexes are verified and the tasks are reloaded from disk and compared.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_model import COMPLETED, PENDING  # noqa: E402
+from task_engine import TaskManagerAgent  # noqa: E402
+
+
+class QuietSink:
+    """Counts deliveries instead of printing them"""
+
+    name = "quiet"
+    timeout = 1.0
+
+    def __init__(self):
+        self.delivered = 0
+
+    async def send(self, notification):
+        self.delivered += 1
+
+
+def run(agent, seconds: float, threads: int):
+    stop = threading.Event()
+    errors = []
+    counters = {'created': 0, 'completed': 0, 'deleted': 0, 'reminded': 0, 'snapshots': 0}
+    lock = threading.Lock()
+
+    def count(name: str, amount: int = 1):
+        with lock:
+            counters[name] += amount
+
+    def pick_pending():
+        pending = agent.get_snapshot().pending
+        return random.choice(pending).id if pending else None
+
+    def creator():
+        while not stop.is_set():
+            due = datetime.now() + timedelta(seconds=random.uniform(1, 40 * 60))
+            if random.random() < 0.2:
+                agent.create_tasks([{'title': f"Bulk {i}", 'description': "", 'due_date': due,
+                                     'manual_reminder_minutes': 1} for i in range(20)])
+                count('created', 20)
+            else:
+                agent.create_task("Stress task", "", due, manual_reminder_minutes=random.choice((0, 1, 30)))
+                count('created')
+
+    def completer():
+        while not stop.is_set():
+            task_id = pick_pending()
+            if task_id and agent.mark_task_completed(task_id):
+                count('completed')
+
+    def deleter():
+        while not stop.is_set():
+            task_id = pick_pending()
+            if task_id:
+                agent.delete_task(task_id)
+                count('deleted')
+            time.sleep(0.001)
+
+    def reminder():
+        while not stop.is_set():
+            task_id = pick_pending()
+            if task_id and agent.send_manual_reminder_now(task_id):
+                count('reminded')
+
+    def reader():
+        while not stop.is_set():
+            snapshot = agent.get_snapshot()
+            due = [task.due_ts for task in snapshot.pending]
+            if due != sorted(due):
+                raise AssertionError("pending snapshot is not sorted by due date")
+            if any(task.status != PENDING for task in snapshot.pending):
+                raise AssertionError("a task changed status inside a pending snapshot")
+            if any(task.status != COMPLETED for task in snapshot.completed):
+                raise AssertionError("a task changed status inside a completed snapshot")
+            agent.get_task_stats()
+            agent.get_tasks_due_soon()
+            count('snapshots')
+
+    def guarded(target):
+        def body():
+            try:
+                target()
+            except Exception as e:
+                errors.append(f"{target.__name__}: {e!r}")
+                stop.set()
+        return body
+
+    roles = [creator, completer, deleter, reminder, reader]
+    workers = [threading.Thread(target=guarded(role), daemon=True)
+               for role in roles for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    stop.wait(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return counters, errors
+
+
+def check_store(agent) -> list:
+    """Cross-check the snapshot, the counts and the range index"""
+    problems = []
+    snapshot = agent.get_snapshot()
+    stats = agent.get_task_stats()
+    if stats['pending'] != len(snapshot.pending):
+        problems.append(f"pending count {stats['pending']} != snapshot {len(snapshot.pending)}")
+    if stats['completed'] != len(snapshot.completed):
+        problems.append(f"completed count {stats['completed']} != snapshot {len(snapshot.completed)}")
+    if len(agent.store) != len(snapshot.pending) + len(snapshot.completed):
+        problems.append("store size does not match its partitions")
+    ids = [task.id for task in snapshot.pending + snapshot.completed]
+    if len(ids) != len(set(ids)):
+        problems.append("a task appears more than once")
+    everything = agent.store.due_between(datetime.fromtimestamp(0), datetime.now() + timedelta(days=3650))
+    if [task.id for task in everything] != [task.id for task in snapshot.pending]:
+        problems.append("due-date index disagrees with the pending partition")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--threads", type=int, default=2, help="threads per role")
+    parser.add_argument("--storage", default="journal", choices=("json", "journal", "sqlite"))
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="task-stress-")
+    tasks_file = os.path.join(directory, "tasks.json")
+    sink = QuietSink()
+    agent = TaskManagerAgent(tasks_file, storage_mode=args.storage, write_behind_interval=0.2,
+                             notification_sinks=[sink])
+    agent.start_reminder_service()
+
+    # The agent prints a line per mutation; keep the run readable
+    stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        counters, errors = run(agent, args.seconds, args.threads)
+        agent.stop_reminder_service()
+        agent.dispatcher.drain(5)
+        problems = errors + check_store(agent)
+        expected = agent.get_task_stats()
+        agent.storage.close()
+        reloaded = TaskManagerAgent(tasks_file, storage_mode=args.storage, write_behind_interval=None,
+                                    notification_sinks=[])
+        actual = reloaded.get_task_stats()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    if (actual['pending'], actual['completed']) != (expected['pending'], expected['completed']):
+        problems.append(f"reloaded counts {actual} != in-memory counts {expected}")
+
+    print(f"{args.seconds:.0f}s with {args.threads} thread(s) per role, {args.storage} storage in {directory}")
+    print("  " + ", ".join(f"{name}={value}" for name, value in counters.items())
+          + f", notifications delivered={sink.delivered}")
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ No errors; {expected['pending']} pending and {expected['completed']} completed tasks survived a reload")
+
+
+if __name__ == "__main__":
+    main()
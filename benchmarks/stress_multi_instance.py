@@ -0,0 +1,170 @@
+"""Run several agent processes on one task file and check nothing is lost or sent twice.
+
+    python benchmarks/stress_multi_instance.py --instances 3 --seconds 20 --storage journal
+
+Every instance creates tasks whose manual reminders fall due during the run and completes
+some tasks of its own, recording each id once it has been flushed. Part way through the
+leader is killed with SIGKILL so another instance has to take over. At the end the shared
+file is reloaded and checked: every recorded task is there, every recorded completion
+stuck, no reminder was delivered twice, and every reminder that fell due was delivered,
+including the ones the killed leader had fired but not yet delivered.
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notifications import FileSink  # noqa: E402
+from reminder_bus import notification_task_ids  # noqa: E402
+from task_model import COMPLETED  # noqa: E402
+from task_engine import TaskManagerAgent  # noqa: E402
+
+# Reminders are due this long before the end of the run, so a new leader has time to send them
+GRACE_SECONDS = 4
+
+
+def record(path: str, values):
+    with open(path, 'a') as f:
+        for value in values:
+            f.write(f"{value}\n")
+
+
+def read_lines(path: str):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def worker(args, index: int):
+    """One instance: create tasks with reminders due during the run, complete a few, until SIGTERM"""
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    rng = random.Random(index)
+    workdir = args.workdir
+    agent = TaskManagerAgent(os.path.join(workdir, "tasks.json"), storage_mode=args.storage,
+                             write_behind_interval=0.2, multi_instance=True,
+                             notification_sinks=[FileSink(os.path.join(workdir, f"delivered_{index}.jsonl"))])
+    agent.start_reminder_service()
+    end = args.started + args.seconds
+    ids = []
+    while not stopping and time.time() < end:
+        # Reminders fall due between now and the grace period; some never do and get completed
+        fire_in = rng.uniform(0.5, max(1.0, end - GRACE_SECONDS - time.time()))
+        never = rng.random() < 0.25
+        if never:
+            fire_in = 3600
+        due = datetime.now() + timedelta(minutes=60, seconds=fire_in)
+        task_id = agent.create_task(f"Instance {index} task {len(ids)}", "", due, manual_reminder_minutes=60)
+        agent.flush()
+        record(os.path.join(workdir, f"created_{index}.txt"), [f"{task_id} {time.time() + fire_in:.3f}"])
+        ids.append((task_id, never))
+        done = [task_id for task_id, never in ids if never and rng.random() < 0.3]
+        if done:
+            agent.complete_tasks(done)
+            agent.flush()
+            record(os.path.join(workdir, f"completed_{index}.txt"), done)
+            ids = [(task_id, never) for task_id, never in ids if task_id not in done]
+        time.sleep(rng.uniform(0.05, args.pause))
+    while not stopping:
+        time.sleep(0.1)
+    agent.close()
+
+
+def leader_pid(workdir: str):
+    with open(os.path.join(workdir, "tasks.json.leader")) as f:
+        holder = f.read().split()
+    return int(holder[0].split(":")[1]) if holder else None
+
+
+def check(args, killed_index: int) -> bool:
+    workdir = args.workdir
+    created = {}
+    completed = set()
+    delivered = Counter()
+    for index in range(args.instances):
+        for line in read_lines(os.path.join(workdir, f"created_{index}.txt")):
+            task_id, fire_at = line.split()
+            created[task_id] = float(fire_at)
+        completed.update(read_lines(os.path.join(workdir, f"completed_{index}.txt")))
+        for line in read_lines(os.path.join(workdir, f"delivered_{index}.jsonl")):
+            delivered.update(notification_task_ids(json.loads(line)))
+
+    agent = TaskManagerAgent(os.path.join(workdir, "tasks.json"), storage_mode=args.storage,
+                             write_behind_interval=None, notification_sinks=[])
+    lost = [task_id for task_id in created if task_id not in agent.store]
+    undone = [task_id for task_id in completed
+              if task_id in agent.store and agent.store.get(task_id).status != COMPLETED]
+    duplicates = {task_id: count for task_id, count in delivered.items() if count > 1}
+    due = [task_id for task_id, fire_at in created.items()
+           if fire_at < args.started + args.seconds and task_id not in completed]
+    missing = [task_id for task_id in due if not delivered[task_id]]
+    agent.close()
+
+    print(f"📊 {len(created)} tasks created by {args.instances} instances ({args.storage}), "
+          f"instance {killed_index} killed while leading")
+    print(f"   completions recorded: {len(completed)}, reminders due: {len(due)}, "
+          f"delivered: {sum(delivered.values())}")
+    print(f"   lost tasks: {len(lost)}, lost completions: {len(undone)}, "
+          f"duplicate reminders: {len(duplicates)}, undelivered reminders: {len(missing)}")
+    return not lost and not undone and not duplicates and not missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--storage", default="json", choices=("json", "journal", "sqlite"))
+    parser.add_argument("--pause", type=float, default=0.3, help="longest pause between an instance's writes")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--started", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker is not None:
+        with open(os.devnull, 'w') as devnull:
+            sys.stdout = devnull
+            worker(args, args.worker)
+        return
+
+    args.workdir = tempfile.mkdtemp(prefix="task-multi-")
+    args.started = time.time() + 1
+    common = [sys.executable, os.path.abspath(__file__), "--storage", args.storage,
+              "--seconds", str(args.seconds), "--pause", str(args.pause),
+              "--workdir", args.workdir, "--started", str(args.started)]
+    processes = [subprocess.Popen(common + ["--worker", str(index)]) for index in range(args.instances)]
+
+    time.sleep(1 + args.seconds * 0.4)
+    pid = leader_pid(args.workdir)
+    killed_index = next(index for index, process in enumerate(processes) if process.pid == pid)
+    os.kill(pid, signal.SIGKILL)
+    print(f"💥 Killed the leader (instance {killed_index}, pid {pid})")
+
+    time.sleep(max(0.0, args.started + args.seconds + 1 - time.time()))
+    for process in processes:
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+    for process in processes:
+        process.wait(30)
+    # A survivor that died on its own leaves nobody to take over; that is a failure, not a loss
+    crashed = [index for index, process in enumerate(processes)
+               if index != killed_index and process.returncode != 0]
+    if crashed:
+        print(f"❌ Instances {crashed} exited with an error")
+
+    ok = check(args, killed_index) and not crashed
+    print("✅ No lost writes or duplicate reminders" if ok else "❌ Check failed")
+    print(f"   files kept in {args.workdir}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
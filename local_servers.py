@@ -0,0 +1,145 @@
+"""Stand-in webhook and SMTP servers for exercising reminder delivery offline.
+
+    python local_servers.py            # webhook on :8025/hook, SMTP on :2525
+
+then start the app with REMINDER_WEBHOOK_URL=http://127.0.0.1:8025/hook,
+REMINDER_SMTP_HOST=127.0.0.1, REMINDER_SMTP_PORT=2525 and REMINDER_EMAIL_TO=you@example.com.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class LocalWebhookServer:
+    """HTTP server on localhost that records every JSON body POSTed to it.
+
+    `fail_first` makes the first N requests return HTTP 500 and `delay` stalls every
+    response, to exercise the dispatcher's retries and timeouts.
+    """
+
+    def __init__(self, port: int = 0, fail_first: int = 0, delay: float = 0.0):
+        self.received: List[Dict] = []
+        self.requests = 0
+        self.fail_first = fail_first
+        self.delay = delay
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                if server.requests <= server.fail_first:
+                    self.send_response(500)
+                else:
+                    server.received.append(json.loads(body or b"null"))
+                    self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.port = self._httpd.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}/hook"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def start(self) -> "LocalWebhookServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class LocalSmtpServer:
+    """Minimal SMTP server on localhost that accepts every message and keeps the raw DATA"""
+
+    def __init__(self, port: int = 0):
+        self.messages: List[Dict] = []
+        self.port = port
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "LocalSmtpServer":
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._session, "127.0.0.1", self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def reply(line: str):
+            writer.write((line + "\r\n").encode())
+
+        sender, recipients = None, []
+        reply("220 localhost stand-in SMTP ready")
+        try:
+            while True:
+                line = (await reader.readline()).decode(errors="replace").rstrip("\r\n")
+                if not line:
+                    break
+                command = line[:4].upper()
+                if command in ("HELO", "EHLO"):
+                    reply("250 localhost")
+                elif command == "MAIL":
+                    sender, recipients = line.split(":", 1)[1].strip(), []
+                    reply("250 OK")
+                elif command == "RCPT":
+                    recipients.append(line.split(":", 1)[1].strip())
+                    reply("250 OK")
+                elif command == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await writer.drain()
+                    data_lines = []
+                    while True:
+                        data_line = (await reader.readline()).decode(errors="replace")
+                        if data_line.rstrip("\r\n") == ".":
+                            break
+                        data_lines.append(data_line)
+                    self.messages.append({'from': sender, 'to': recipients, 'data': "".join(data_lines)})
+                    reply("250 OK: queued")
+                elif command == "QUIT":
+                    reply("221 Bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("250 OK")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+if __name__ == "__main__":
+    webhook = LocalWebhookServer(port=8025).start()
+    smtp = LocalSmtpServer(port=2525).start()
+    print(f"Webhook listening on {webhook.url}, SMTP on 127.0.0.1:{smtp.port} (Ctrl+C to stop)")
+    seen_hooks = seen_mail = 0
+    try:
+        while True:
+            time.sleep(0.5)
+            for body in webhook.received[seen_hooks:]:
+                print(f"📨 webhook: {body}")
+            for message in smtp.messages[seen_mail:]:
+                print(f"📧 mail to {', '.join(message['to'])}")
+            seen_hooks, seen_mail = len(webhook.received), len(smtp.messages)
+    except KeyboardInterrupt:
+        webhook.stop()
+        smtp.stop()
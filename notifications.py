@@ -0,0 +1,334 @@
+import asyncio
+import atexit
+import json
+import logging.handlers
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+from typing import Callable, Dict, List, Optional
+
+from task_metrics import METRICS, record_error
+
+NOTIFICATIONS_THROTTLED = METRICS.counter(
+    "task_notifications_throttled_total", "Deliveries delayed by a sink's rate limit", labels=("sink",))
+
+
+class ConsoleSink:
+    """Prints reminders to stdout, as the reminder service always has"""
+
+    name = "console"
+    timeout = 1.0
+
+    async def send(self, notification: Dict):
+        print("=" * 60)
+        print("🚨🚨🚨  TASK REMINDER  🚨🚨🚨")
+        print(notification['message'])
+        print(f"Due at: {notification['due_at']}")
+        if notification.get('description'):
+            print(f"Description: {notification['description']}")
+        print("=" * 60)
+
+
+class WebhookSink:
+    """POSTs each reminder as JSON to an HTTP(S) endpoint using asyncio streams"""
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0,
+                 rate_per_minute: Optional[float] = 60, burst: int = 10):
+        self.url = url
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.name = f"webhook:{urllib.parse.urlsplit(url).netloc}"
+
+    async def send(self, notification: Dict):
+        parts = urllib.parse.urlsplit(self.url)
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        body = json.dumps(notification).encode()
+
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=ssl.create_default_context() if secure else None)
+        try:
+            head = [f"POST {path} HTTP/1.1", f"Host: {parts.netloc}",
+                    "Content-Type: application/json", f"Content-Length: {len(body)}",
+                    "Connection: close"]
+            head += [f"{key}: {value}" for key, value in self.headers.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+            await writer.drain()
+            status_line = await reader.readline()
+        finally:
+            writer.close()
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise ConnectionError(f"malformed HTTP response: {status_line!r}")
+        if not 200 <= status < 300:
+            raise ConnectionError(f"webhook returned HTTP {status}")
+
+
+class SmtpSink:
+    """Emails each reminder; smtplib is blocking, so it runs in a worker thread"""
+
+    def __init__(self, host: str, port: int, sender: str, recipients: List[str],
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = False, timeout: float = 10.0,
+                 rate_per_minute: Optional[float] = 6, burst: int = 3):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.name = f"smtp:{host}:{port}"
+
+    async def send(self, notification: Dict):
+        await asyncio.to_thread(self._send_blocking, notification)
+
+    def _send_blocking(self, notification: Dict):
+        # Imported here so processes that never email don't pay for smtplib and the email package
+        import smtplib
+        from email.message import EmailMessage
+
+        message = EmailMessage()
+        message['Subject'] = f"Task reminder: {notification['title']}"
+        message['From'] = self.sender
+        message['To'] = ", ".join(self.recipients)
+        lines = [notification['message'], f"Due at: {notification['due_at']}"]
+        if notification.get('description'):
+            lines.append(f"Description: {notification['description']}")
+        message.set_content("\n".join(lines))
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or "")
+            smtp.send_message(message)
+
+
+class FileSink:
+    """Appends each reminder as a JSON line to a local file"""
+
+    def __init__(self, path: str, timeout: float = 2.0):
+        self.path = path
+        self.timeout = timeout
+        self.name = f"file:{path}"
+
+    async def send(self, notification: Dict):
+        await asyncio.to_thread(self._append, json.dumps(notification) + "\n")
+
+    def _append(self, line: str):
+        with open(self.path, 'a') as f:
+            f.write(line)
+
+
+class SyslogSink:
+    """Sends each reminder to syslog (a local socket path or a (host, port) UDP address)"""
+
+    def __init__(self, address="/dev/log", timeout: float = 2.0):
+        self.timeout = timeout
+        self.name = f"syslog:{address}"
+        self._handler = logging.handlers.SysLogHandler(address=address)
+
+    async def send(self, notification: Dict):
+        record = logging.LogRecord("task_scheduler", logging.WARNING, __file__, 0,
+                                   notification['message'], None, None)
+        await asyncio.to_thread(self._handler.emit, record)
+
+
+class TokenBucket:
+    """Allows `rate` sends per second on average, in bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it (0 if one was free)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Tokens go negative so queued senders are spaced out in arrival order
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class NotificationDispatcher:
+    """Delivers reminders to every sink on a private asyncio loop, so slow channels never block the caller.
+
+    submit() schedules delivery and returns at once. At most `max_concurrency` deliveries
+    run at a time. Sinks with a `rate_per_minute` wait for a token from their own bucket
+    first, so one throttled channel never holds up the others. Each attempt is bounded by
+    the sink's `timeout` and retried with exponential backoff. Notifications that still
+    fail are appended to the dead-letter file. Once every sink has taken a notification
+    or given up on it, `on_settled` is called with it in a worker thread.
+    """
+
+    def __init__(self, sinks: List, max_concurrency: int = 8, max_retries: int = 3,
+                 backoff: float = 0.5, dead_letter_path: Optional[str] = "reminders_dead_letter.jsonl",
+                 on_settled: Optional[Callable[[Dict], None]] = None):
+        self.sinks = list(sinks)
+        self.on_settled = on_settled
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.dead_letter_path = dead_letter_path
+        self.dead_letters = 0
+        self._buckets = {id(sink): TokenBucket(sink.rate_per_minute / 60, max(1, getattr(sink, 'burst', 1)))
+                         for sink in self.sinks if getattr(sink, 'rate_per_minute', None)}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def submit(self, notification: Dict):
+        """Queue a notification for delivery to all sinks; never blocks on delivery"""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._deliver_all(notification), loop)
+        with self._lock:
+            self._in_flight.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def backlog(self) -> int:
+        """Notifications submitted but not yet delivered (or given up on)"""
+        with self._lock:
+            return len(self._in_flight)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for in-flight deliveries to finish; returns False if the timeout ran out first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending = list(self._in_flight)
+            if not pending:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                pending[0].result(remaining)
+            except Exception:
+                pass
+
+    def close(self, timeout: float = 5.0):
+        self.drain(timeout)
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop = None
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight.discard(future)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="notification-dispatcher", daemon=True).start()
+                started.wait()
+                self._loop = loop
+                atexit.register(self.close)
+            return self._loop
+
+    async def _deliver_all(self, notification: Dict):
+        await asyncio.gather(*(self._deliver(sink, notification) for sink in self.sinks))
+        if self.on_settled is not None:
+            try:
+                # Off the loop: the callback may write to storage
+                await asyncio.to_thread(self.on_settled, notification)
+            except Exception as e:
+                record_error("notify", e)
+                print(f"Error recording reminder delivery: {e}")
+
+    async def _deliver(self, sink, notification: Dict):
+        bucket = self._buckets.get(id(sink))
+        if bucket is not None:
+            delay = bucket.reserve()
+            if delay:
+                NOTIFICATIONS_THROTTLED.inc(sink=sink.name)
+                await asyncio.sleep(delay)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Back off outside the semaphore so retries don't hold a delivery slot
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            async with self._semaphore:
+                try:
+                    await asyncio.wait_for(sink.send(notification), getattr(sink, 'timeout', 5.0))
+                    return
+                except Exception as e:
+                    error = e
+        await self._dead_letter(sink, notification, error)
+
+    async def _dead_letter(self, sink, notification: Dict, error: Exception):
+        self.dead_letters += 1
+        record_error("notify", error)
+        print(f"❌ Giving up on reminder delivery to {sink.name}: {error!r}")
+        if not self.dead_letter_path:
+            return
+        entry = {
+            'sink': sink.name,
+            'notification': notification,
+            'error': repr(error),
+            'attempts': self.max_retries + 1,
+            'failed_at': time.time(),
+        }
+        try:
+            await asyncio.to_thread(_append_line, self.dead_letter_path, json.dumps(entry))
+        except Exception as e:
+            print(f"Error writing dead letter: {e}")
+
+
+def _append_line(path: str, line: str):
+    with open(path, 'a') as f:
+        f.write(line + "\n")
+
+
+def _rate(variable: str, default: float) -> Optional[float]:
+    """A per-minute rate limit from the environment; 0 turns the limit off"""
+    value = float(os.environ.get(variable, default))
+    return value if value > 0 else None
+
+
+def sinks_from_env() -> List:
+    """Console output plus any sinks configured through REMINDER_* environment variables"""
+    sinks: List = [ConsoleSink()]
+    if os.environ.get("REMINDER_WEBHOOK_URL"):
+        sinks.append(WebhookSink(os.environ["REMINDER_WEBHOOK_URL"],
+                                 rate_per_minute=_rate("REMINDER_WEBHOOK_RATE_PER_MINUTE", 60)))
+    if os.environ.get("REMINDER_SMTP_HOST") and os.environ.get("REMINDER_EMAIL_TO"):
+        sinks.append(SmtpSink(
+            host=os.environ["REMINDER_SMTP_HOST"],
+            port=int(os.environ.get("REMINDER_SMTP_PORT", "25")),
+            sender=os.environ.get("REMINDER_EMAIL_FROM", "task-scheduler@localhost"),
+            recipients=[address.strip() for address in os.environ["REMINDER_EMAIL_TO"].split(",")],
+            username=os.environ.get("REMINDER_SMTP_USER"),
+            password=os.environ.get("REMINDER_SMTP_PASSWORD"),
+            starttls=os.environ.get("REMINDER_SMTP_STARTTLS") == "1",
+            rate_per_minute=_rate("REMINDER_SMTP_RATE_PER_MINUTE", 6),
+        ))
+    if os.environ.get("REMINDER_LOG_FILE"):
+        sinks.append(FileSink(os.environ["REMINDER_LOG_FILE"]))
+    if os.environ.get("REMINDER_SYSLOG"):
+        sinks.append(SyslogSink(os.environ["REMINDER_SYSLOG"]))
+    return sinks
@@ -0,0 +1,159 @@
+"""Recurrence rules for repeating tasks.
+
+A rule is a short string stored on the task:
+
+    every 90m | every 2h | every 3d     fixed interval after the previous occurrence
+    daily 09:00                         every day at a local time
+    weekly mon,thu 18:30                on the given weekdays at a local time
+    cron */15 9-17 * * mon-fri          five-field cron: minute hour day month weekday
+
+Only the next occurrence is ever computed; a series never materializes future instances.
+"""
+import math
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+INTERVAL_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+WEEKDAYS = ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+# Shorter intervals would roll a series over faster than the worker can keep up
+MIN_INTERVAL_SECONDS = 60
+# Give up on cron expressions that never match (e.g. February 30th) after this many years
+CRON_SEARCH_YEARS = 5
+
+
+class Interval:
+    """Occurrences `seconds` apart, counted from the previous one"""
+
+    def __init__(self, seconds: float):
+        if not math.isfinite(seconds) or seconds < MIN_INTERVAL_SECONDS:
+            raise ValueError(f"interval must be a number of at least {MIN_INTERVAL_SECONDS} seconds")
+        self.seconds = seconds
+
+    def next_occurrence(self, previous: float, after: float) -> Optional[float]:
+        # Skip whole periods that were missed, keeping the series on its original grid
+        steps = max(1, math.floor((after - previous) / self.seconds) + 1)
+        return previous + steps * self.seconds
+
+
+class Cron:
+    """Calendar schedule in local time; daily and weekly rules are cron expressions too"""
+
+    def __init__(self, minutes: FrozenSet[int], hours: FrozenSet[int], days: FrozenSet[int],
+                 months: FrozenSet[int], weekdays: FrozenSet[int], any_day: bool, any_weekday: bool):
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        self.weekdays = weekdays
+        self.any_day = any_day
+        self.any_weekday = any_weekday
+
+    def next_occurrence(self, previous: float, after: float) -> Optional[float]:
+        when = datetime.fromtimestamp(max(previous, after)).replace(second=0, microsecond=0)
+        when += timedelta(minutes=1)
+        limit = when + timedelta(days=366 * CRON_SEARCH_YEARS)
+        while when < limit:
+            if when.month not in self.months:
+                when = (when.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self._day_matches(when):
+                when = (when + timedelta(days=1)).replace(hour=0, minute=0)
+            elif when.hour not in self.hours:
+                when = (when + timedelta(hours=1)).replace(minute=0)
+            elif when.minute not in self.minutes:
+                when += timedelta(minutes=1)
+            else:
+                return when.timestamp()
+        return None
+
+    def _day_matches(self, when: datetime) -> bool:
+        day = when.day in self.days
+        weekday = (when.weekday() + 1) % 7 in self.weekdays
+        # As in cron, a restricted day-of-month and day-of-week match if either does
+        if self.any_day:
+            return weekday
+        if self.any_weekday:
+            return day
+        return day or weekday
+
+
+def _parse_value(value: str, names) -> int:
+    value = value.lower()
+    if names and value[:3] in names:
+        return names.index(value[:3]) + (1 if names is MONTHS else 0)
+    return int(value)
+
+
+def _parse_field(field: str, low: int, high: int, names=()) -> FrozenSet[int]:
+    values = set()
+    for part in field.split(','):
+        spec, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if spec == '*':
+            start, end = low, high
+        elif '-' in spec:
+            start, end = (_parse_value(value, names) for value in spec.split('-', 1))
+        else:
+            start = _parse_value(spec, names)
+            end = high if step > 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"{part!r} is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def _parse_time(value: str):
+    try:
+        moment = datetime.strptime(value, "%H:%M")
+    except ValueError:
+        raise ValueError(f"{value!r} is not a HH:MM time")
+    return str(moment.minute), str(moment.hour)
+
+
+def _cron(expression: str) -> Cron:
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError("cron rules need five fields: minute hour day month weekday")
+    minute, hour, day, month, weekday = fields
+    weekdays = _parse_field(weekday, 0, 7, WEEKDAYS)
+    # 7 is Sunday as well as 0
+    weekdays = frozenset(value % 7 for value in weekdays)
+    return Cron(_parse_field(minute, 0, 59), _parse_field(hour, 0, 23), _parse_field(day, 1, 31),
+                _parse_field(month, 1, 12, MONTHS), weekdays, day == '*', weekday == '*')
+
+
+@lru_cache(maxsize=1024)
+def parse(rule: str):
+    """Parse a recurrence rule, raising ValueError if it is malformed"""
+    kind, _, spec = rule.strip().partition(' ')
+    kind = kind.lower()
+    spec = spec.strip()
+    try:
+        if kind == 'every':
+            amount, unit = spec[:-1].strip(), spec[-1:].lower()
+            if unit not in INTERVAL_UNITS:
+                raise ValueError("intervals end in m, h, d or w, e.g. 'every 2h'")
+            return Interval(float(amount) * INTERVAL_UNITS[unit])
+        if kind == 'daily':
+            minute, hour = _parse_time(spec)
+            return _cron(f"{minute} {hour} * * *")
+        if kind == 'weekly':
+            days, _, at = spec.rpartition(' ')
+            if not days:
+                raise ValueError("weekly rules look like 'weekly mon,thu 09:00'")
+            minute, hour = _parse_time(at)
+            return _cron(f"{minute} {hour} * * {days}")
+        if kind == 'cron':
+            return _cron(spec)
+    except ValueError as e:
+        raise ValueError(f"Invalid recurrence {rule!r}: {e}")
+    raise ValueError(f"Invalid recurrence {rule!r}: expected 'every', 'daily', 'weekly' or 'cron'")
+
+
+def next_occurrence(rule: str, previous: float, after: Optional[float] = None) -> Optional[float]:
+    """Epoch time of the first occurrence of `rule` after both `previous` and `after` (default now).
+
+    Returns None when the rule has no further occurrence.
+    """
+    return parse(rule).next_occurrence(previous, after if after is not None else datetime.now().timestamp())
@@ -0,0 +1,217 @@
+"""Reminder events between the reminder worker and everything that reports them.
+
+The worker publishes one event per reminder and moves on. UI sessions and the digester
+each read with their own cursor, so none of them can hold the worker up: the bus keeps
+the last `capacity` events and a reader that falls further behind is told how many it
+missed. The digester sends a reminder on its own straight away, and folds only a burst
+of reminders into one notification for the sinks, so 300 tasks due at 09:00 send a
+handful of messages instead of 300.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from task_metrics import METRICS, record_error
+
+# Reminders beyond DIGEST_BURST within this many seconds share a digest
+DIGEST_WINDOW_SECONDS = 0.5
+# Reminders sent on their own in each window before the rest are folded into a digest
+DIGEST_BURST = 5
+# A digest goes out once it holds this many reminders, even while the dispatcher is behind
+MAX_HELD_REMINDERS = 1000
+# Reminders listed in a digest's message; the rest are counted
+DIGEST_LISTED = 10
+# The digester holds a digest back while the dispatcher has this many deliveries in flight
+MAX_DISPATCH_BACKLOG = 100
+
+EVENTS_PUBLISHED = METRICS.counter("task_reminder_events_total", "Reminder events published to the bus")
+EVENTS_MISSED = METRICS.counter("task_reminder_events_missed_total",
+                                "Reminder events a bus reader fell too far behind to see", labels=("reader",))
+DIGESTS_SENT = METRICS.counter("task_reminder_digests_total", "Notifications that combined several reminders")
+DIGESTS_FORCED = METRICS.counter("task_reminder_digests_forced_total",
+                                 "Digests sent while the dispatcher was behind because too many reminders were held")
+
+
+class ReminderBus:
+    """Bounded, thread-safe log of reminder events read through per-reader cursors"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._events = deque(maxlen=capacity)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    @property
+    def cursor(self) -> int:
+        """Sequence number of the newest event; reading from here skips everything before"""
+        with self._cond:
+            return self._seq
+
+    def publish(self, event: Dict) -> int:
+        """Append an event and wake waiting readers; never blocks, the oldest event drops out when full"""
+        with self._cond:
+            self._seq += 1
+            event['seq'] = self._seq
+            self._events.append(event)
+            self._cond.notify_all()
+        EVENTS_PUBLISHED.inc()
+        return event['seq']
+
+    def read(self, cursor: int, limit: Optional[int] = None) -> Tuple[List[Dict], int, int]:
+        """Events after `cursor` (at most `limit`), the cursor to pass next time and how many were missed"""
+        with self._cond:
+            return self._read(cursor, limit)
+
+    def wait(self, cursor: int, timeout: Optional[float] = None, limit: Optional[int] = None,
+             stop: Optional[threading.Event] = None) -> Tuple[List[Dict], int, int]:
+        """Like read(), but block up to `timeout` seconds (or until `stop` is set and wake() called)
+        for an event after `cursor`"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > cursor or (stop is not None and stop.is_set()), timeout)
+            return self._read(cursor, limit)
+
+    def wake(self):
+        """Release readers blocked in wait(), e.g. when shutting down"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def _read(self, cursor: int, limit: Optional[int]) -> Tuple[List[Dict], int, int]:
+        if cursor >= self._seq or not self._events:
+            return [], max(cursor, 0), 0
+        oldest = self._events[0]['seq']
+        missed = max(0, oldest - cursor - 1)
+        start = max(cursor + 1, oldest) - oldest
+        end = len(self._events) if limit is None else min(len(self._events), start + limit)
+        events = [self._events[i] for i in range(start, end)]
+        return events, events[-1]['seq'], missed
+
+
+def notification_task_ids(notification: Dict) -> List[str]:
+    """Ids of the tasks a notification is about, whether it is a single reminder or a digest"""
+    return notification.get('task_ids') or [notification['task_id']]
+
+
+def notification_reminders(notification: Dict) -> List[Tuple[str, str]]:
+    """(task_id, reminder type) of each reminder a notification carries"""
+    if 'task_ids' in notification:
+        return list(zip(notification['task_ids'], notification['types']))
+    return [(notification['task_id'], notification['type'])]
+
+
+def make_digest(notifications: List[Dict]) -> Dict:
+    """One notification standing for several reminders; a single reminder is returned unchanged"""
+    if len(notifications) == 1:
+        return notifications[0]
+    listed = [f"• {item['title']} (due {item['due_at']})" for item in notifications[:DIGEST_LISTED]]
+    if len(notifications) > DIGEST_LISTED:
+        listed.append(f"… and {len(notifications) - DIGEST_LISTED} more")
+    return {
+        'type': 'digest',
+        'count': len(notifications),
+        'task_ids': [item['task_id'] for item in notifications],
+        'types': [item['type'] for item in notifications],
+        'title': f"{len(notifications)} task reminders",
+        'message': f"🔔 {len(notifications)} REMINDERS",
+        'description': "\n".join(listed),
+        'due_at': min(item['due_at'] for item in notifications),
+        'sent_at': notifications[-1]['sent_at'],
+    }
+
+
+class ReminderDigester:
+    """Reads reminder events off the bus and submits them to the dispatcher, coalescing bursts.
+
+    The first `burst` reminders in each `window` seconds are submitted at once. Later ones
+    in the same window are held and go out together as one digest when it closes, or later
+    if the dispatcher is still working through `max_backlog` deliveries; the bus, not the
+    worker, absorbs the wait. Once `max_held` reminders are held the digest goes out anyway.
+    """
+
+    def __init__(self, bus: ReminderBus, submit: Callable[[Dict], object], backlog: Callable[[], int],
+                 window: float = DIGEST_WINDOW_SECONDS, max_backlog: int = MAX_DISPATCH_BACKLOG,
+                 burst: int = DIGEST_BURST, max_held: int = MAX_HELD_REMINDERS):
+        self.bus = bus
+        self.submit = submit
+        self.backlog = backlog
+        self.window = window
+        self.max_backlog = max_backlog
+        self.burst = burst
+        self.max_held = max_held
+        self._cursor = bus.cursor
+        self._held: List[Dict] = []
+        # Start of the current window and how many reminders went out alone in it
+        self._window_start = 0.0
+        self._singles = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reminder-digester", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Submit whatever is held and stop"""
+        self._stop.set()
+        self.bus.wake()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            timeout = None
+            if self._held:
+                timeout = max(0.0, self._window_start + self.window - time.time())
+            events, self._cursor, missed = self.bus.wait(self._cursor, timeout, stop=self._stop)
+            if missed:
+                EVENTS_MISSED.inc(missed, reader="digester")
+            for event in events:
+                self._take(event)
+            if self._held and self._ready():
+                self._flush()
+        self._flush()
+
+    def _take(self, event: Dict):
+        now = time.time()
+        if not self._held and now - self._window_start >= self.window:
+            self._window_start, self._singles = now, 0
+        if not self._held and self._singles < self.burst and self.backlog() < self.max_backlog:
+            self._singles += 1
+            self._submit([event])
+        else:
+            self._held.append(event)
+
+    def _ready(self) -> bool:
+        if len(self._held) >= self.max_held:
+            if self.backlog() >= self.max_backlog:
+                DIGESTS_FORCED.inc()
+            return True
+        if time.time() - self._window_start < self.window:
+            return False
+        if self.backlog() >= self.max_backlog:
+            # Sinks are behind; keep collecting so the next digest covers more
+            self._window_start = time.time()
+            return False
+        return True
+
+    def _flush(self):
+        if not self._held:
+            return
+        held, self._held = self._held, []
+        # The digest opens a new window, so a burst that carries on is folded again
+        self._window_start, self._singles = time.time(), self.burst
+        self._submit(held)
+
+    def _submit(self, events: List[Dict]):
+        try:
+            notification = make_digest(events)
+            if notification.get('type') == 'digest':
+                DIGESTS_SENT.inc()
+            self.submit(notification)
+        except Exception as e:
+            record_error("notify", e)
+            print(f"Error submitting reminder: {e}")
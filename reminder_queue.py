@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# auto/manual reminders, the point where a recurring task moves on to its next occurrence,
+# and the engine's periodic archive run
+KINDS = ("auto", "manual", "rollover", "archive")
+# The kinds that notify someone; the other two are bookkeeping jobs
+REMINDER_KINDS = ("auto", "manual")
+
+
+class ReminderQueue:
+    """Min-heap of reminder deadlines that the worker sleeps on until the earliest one is due"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str, str]] = []
+        # (task_id, kind) -> sequence number of the live heap entry; anything else in the heap is stale
+        self._live: Dict[Tuple[str, str], int] = {}
+        # How many live entries are of REMINDER_KINDS
+        self._reminders = 0
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._live)
+
+    def schedule(self, task_id: str, kind: str, fire_at: float):
+        """Schedule (or move) the `kind` reminder of a task to the epoch time `fire_at`"""
+        with self._cond:
+            seq = next(self._counter)
+            if (task_id, kind) not in self._live and kind in REMINDER_KINDS:
+                self._reminders += 1
+            self._live[(task_id, kind)] = seq
+            heapq.heappush(self._heap, (fire_at, seq, task_id, kind))
+            self._maybe_compact()
+            # Only the worker's deadline can have moved earlier, so a single waiter is enough
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+
+    def cancel(self, task_id: str, kind: Optional[str] = None):
+        """Cancel one reminder kind of a task, or all of them when kind is None"""
+        with self._cond:
+            for each in (KINDS if kind is None else (kind,)):
+                if self._live.pop((task_id, each), None) is not None and each in REMINDER_KINDS:
+                    self._reminders -= 1
+            self._maybe_compact()
+
+    def next_fire_time(self) -> Optional[float]:
+        """Epoch time of the earliest live reminder, or None when nothing is scheduled"""
+        with self._cond:
+            self._drop_stale_head()
+            return self._heap[0][0] if self._heap else None
+
+    def reminder_count(self) -> int:
+        """Number of scheduled auto/manual reminders, leaving out rollover and archive jobs"""
+        with self._cond:
+            return self._reminders
+
+    def next_reminder_time(self) -> Optional[float]:
+        """Epoch time of the earliest live auto/manual reminder, or None when there is none"""
+        with self._cond:
+            heap = self._heap
+            # Walk the heap in fire order from the root, so only entries due earlier get looked at
+            frontier = [(heap[0][0], heap[0][1], 0)] if heap else []
+            while frontier:
+                fire_at, _, index = heapq.heappop(frontier)
+                _, seq, task_id, kind = heap[index]
+                if kind in REMINDER_KINDS and self._live.get((task_id, kind)) == seq:
+                    return fire_at
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+            return None
+
+    def wait_due(self) -> List[Tuple[str, str, float]]:
+        """Block until at least one reminder is due and return (task_id, kind, fire_at) for each.
+
+        Returns an empty list once the queue has been closed.
+        """
+        with self._cond:
+            while not self._closed:
+                self._drop_stale_head()
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    return self._pop_due(now)
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._cond.wait(timeout)
+            return []
+
+    def close(self):
+        """Wake the worker and make wait_due() return immediately"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+
+    def clear(self):
+        """Drop every scheduled reminder"""
+        with self._cond:
+            self._heap = []
+            self._live.clear()
+            self._reminders = 0
+
+    def _pop_due(self, now: float) -> List[Tuple[str, str, float]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, seq, task_id, kind = heapq.heappop(self._heap)
+            if self._live.get((task_id, kind)) == seq:
+                del self._live[(task_id, kind)]
+                if kind in REMINDER_KINDS:
+                    self._reminders -= 1
+                due.append((task_id, kind, fire_at))
+        return due
+
+    def _drop_stale_head(self):
+        while self._heap:
+            _, seq, task_id, kind = self._heap[0]
+            if self._live.get((task_id, kind)) == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def _maybe_compact(self):
+        # Cancelled and rescheduled entries are removed lazily; rebuild once they dominate the heap
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [entry for entry in self._heap
+                          if self._live.get((entry[2], entry[3])) == entry[1]]
+            heapq.heapify(self._heap)
@@ -0,0 +1,302 @@
+import os
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from task_model import PENDING, Task
+from task_store import CHANGE_LOG_LIMIT, StoreDelta, StoreSnapshot, classify_changes, fold_changes
+from task_storage import JsonTaskStorage
+
+COLUMNS = ('id', 'title', 'description', 'due_date', 'priority', 'category', 'status',
+           'created_at', 'completed_at', 'reminders_sent', 'last_reminder_sent',
+           'manual_reminder_time', 'manual_reminder_sent', 'recurrence',
+           'completed_occurrences', 'missed_occurrences')
+# Task slot stored in each column; timestamp columns hold epoch seconds
+ATTRIBUTES = ('id', 'title', 'description', 'due_ts', 'priority', 'category', 'status',
+              'created_ts', 'completed_ts', 'reminders_sent', 'last_reminder_ts',
+              'manual_reminder_ts', 'manual_reminder_sent', 'recurrence',
+              'completed_occurrences', 'missed_occurrences')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    due_date REAL,
+    priority TEXT NOT NULL,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    completed_at REAL,
+    reminders_sent INTEGER NOT NULL DEFAULT 0,
+    last_reminder_sent REAL,
+    manual_reminder_time REAL,
+    manual_reminder_sent INTEGER NOT NULL DEFAULT 0,
+    recurrence TEXT,
+    completed_occurrences INTEGER NOT NULL DEFAULT 0,
+    missed_occurrences INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_manual_reminder ON tasks (manual_reminder_time);
+"""
+
+# Columns added after the first schema, for databases created before them
+ADDED_COLUMNS = (
+    "recurrence TEXT",
+    "completed_occurrences INTEGER NOT NULL DEFAULT 0",
+    "missed_occurrences INTEGER NOT NULL DEFAULT 0",
+)
+
+_SELECT = f"SELECT {', '.join(COLUMNS)} FROM tasks"
+_UPSERT = (f"INSERT OR REPLACE INTO tasks ({', '.join(COLUMNS)}) "
+           f"VALUES ({', '.join('?' * len(COLUMNS))})")
+
+
+def _task_to_row(task: Task) -> tuple:
+    return tuple(getattr(task, attribute) for attribute in ATTRIBUTES)
+
+
+def _row_to_task(row: tuple) -> Task:
+    task = Task.__new__(Task)
+    for attribute, value in zip(ATTRIBUTES, row):
+        setattr(task, attribute, value)
+    task.manual_reminder_sent = bool(task.manual_reminder_sent)
+    return task
+
+
+class SqliteTaskStore:
+    """Task store and storage backend in one: every query and mutation is a SQL statement.
+
+    Nothing is held in memory, so startup cost and footprint do not grow with history.
+    Tasks handed out are fresh objects; callers write changes back with update().
+    """
+
+    def __init__(self, db_path: str, migrate_from: Optional[str] = None):
+        self.db_path = db_path
+        is_new = not os.path.exists(db_path)
+        self._lock = threading.RLock()
+        self.version = 0
+        self._changes = deque(maxlen=CHANGE_LOG_LIMIT)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        for column in ADDED_COLUMNS:
+            if column.split()[0] not in existing:
+                self._conn.execute(f"ALTER TABLE tasks ADD COLUMN {column}")
+        if is_new and migrate_from and os.path.exists(migrate_from):
+            count = self.import_records(JsonTaskStorage(migrate_from).load())
+            print(f"📦 Migrated {count} tasks from {migrate_from} to {db_path}")
+        # Changes whenever another connection commits, so other processes' writes can be noticed
+        self._data_version = self._scalar("PRAGMA data_version")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[Task]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_row_to_task(row) for row in rows]
+
+    def _scalar(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._scalar("SELECT COUNT(*) FROM tasks")
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._query(f"{_SELECT} ORDER BY rowid"))
+
+    def __contains__(self, task_id: str) -> bool:
+        return self._scalar("SELECT COUNT(*) FROM tasks WHERE id = ?", (task_id,)) > 0
+
+    def records(self) -> Iterator[Dict]:
+        for task in self:
+            yield task.to_dict()
+
+    def contents(self) -> Tuple[List[Task], List[Dict]]:
+        """Every task, built from its row; nothing is deferred here"""
+        return list(self), []
+
+    def snapshot(self) -> StoreSnapshot:
+        """Pending and completed tasks read under one lock, so both sides match the same version"""
+        with self._lock:
+            return StoreSnapshot(self.version, tuple(self.pending()), tuple(self.completed()))
+
+    def listing(self, status: str) -> Tuple[int, Tuple[Task, ...]]:
+        """One status's tasks and the version they were read at"""
+        with self._lock:
+            return self.version, tuple(self.pending() if status == PENDING else self.completed())
+
+    def categories(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT DISTINCT category FROM tasks")}
+
+    def changes_since(self, version: int) -> Optional[List[str]]:
+        """Ids of tasks changed after `version`, or None if a bulk write or the log limit hides them"""
+        with self._lock:
+            if version == self.version:
+                return []
+            if not self._changes or self._changes[0][0] > version + 1:
+                return None
+            return list(dict.fromkeys(task_id for changed, task_id, _ in self._changes if changed > version))
+
+    def delta_since(self, version: int) -> Optional[StoreDelta]:
+        """Tasks created, updated and deleted after `version`, or None where changes_since() would be"""
+        with self._lock:
+            if version == self.version:
+                return StoreDelta(version, (), (), ())
+            if not self._changes or self._changes[0][0] > version + 1:
+                return None
+            delta = classify_changes(fold_changes(self._changes, version), self.get)
+            return delta._replace(version=self.version)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        tasks = self._query(f"{_SELECT} WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def batch(self):
+        """Run several mutations in one transaction"""
+        return self._transaction()
+
+    def add(self, task: Task):
+        with self._lock:
+            self._write(task, task.id in self)
+
+    def update(self, task: Task):
+        with self._lock:
+            self._write(task, True)
+
+    def modify(self, task_id: str, **changes) -> Optional[Task]:
+        """Read, change and write back one task under the lock; returns the new task"""
+        with self._lock:
+            task = self.get(task_id)
+            if task is None:
+                return None
+            for attribute, value in changes.items():
+                setattr(task, attribute, value)
+            self._write(task, True)
+            return task
+
+    def remove(self, task_id: str) -> Optional[Task]:
+        with self._lock:
+            task = self.get(task_id)
+            if task is not None:
+                self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                self._changed(task_id, True)
+        return task
+
+    def count(self, status: str) -> int:
+        return self._scalar("SELECT COUNT(*) FROM tasks WHERE status = ?", (status,))
+
+    def pending(self) -> List[Task]:
+        """Pending tasks sorted by due date"""
+        return self._query(f"{_SELECT} WHERE status = 'pending' ORDER BY due_date, id")
+
+    def completed(self) -> List[Task]:
+        """Completed tasks in insertion order"""
+        return self._query(f"{_SELECT} WHERE status = 'completed' ORDER BY rowid")
+
+    def completed_before(self, cutoff: float) -> List[Dict]:
+        """Records of tasks completed before `cutoff`"""
+        return [task.to_dict() for task in self._query(
+            f"{_SELECT} WHERE status = 'completed' AND completed_at < ? ORDER BY completed_at", (cutoff,))]
+
+    def due_between(self, start: datetime, end: datetime) -> List[Task]:
+        """Pending tasks with start <= due_date <= end"""
+        return self._query(
+            f"{_SELECT} WHERE status = 'pending' AND due_date BETWEEN ? AND ? ORDER BY due_date, id",
+            (start.timestamp(), end.timestamp()))
+
+    def count_due_between(self, start: datetime, end: datetime) -> int:
+        return self._scalar(
+            "SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND due_date BETWEEN ? AND ?",
+            (start.timestamp(), end.timestamp()))
+
+    def manual_reminders_before(self, when: datetime) -> List[Task]:
+        """Pending tasks whose unsent manual reminder time is at or before `when`"""
+        return self._query(
+            f"{_SELECT} WHERE manual_reminder_time <= ? AND manual_reminder_sent = 0 "
+            "AND status = 'pending' ORDER BY manual_reminder_time",
+            (when.timestamp(),))
+
+    # Storage interface: rows are written by add/update/remove, so mutations need no extra step
+
+    def load(self) -> List[Dict]:
+        return []
+
+    def save(self, records: Iterable[Dict]):
+        """Replace the table contents with the given JSON records"""
+        with self._transaction():
+            self._conn.execute("DELETE FROM tasks")
+            self._changed(None)
+            self._insert_records(records)
+
+    def append(self, op: str, record: Dict, snapshot=None):
+        pass
+
+    def append_many(self, entries, snapshot=None):
+        pass
+
+    def flush(self):
+        pass
+
+    def sync_external(self, apply=None, reload=None) -> bool:
+        """Notice commits from other processes; rows are read live, so only the version moves"""
+        with self._lock:
+            data_version = self._scalar("PRAGMA data_version")
+            if data_version == self._data_version:
+                return False
+            self._data_version = data_version
+            self._changed(None)
+            return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def import_records(self, records: Iterable[Dict]) -> int:
+        """Insert or replace JSON records in a single transaction"""
+        with self._transaction():
+            return self._insert_records(records)
+
+    def _insert_records(self, records: Iterable[Dict]) -> int:
+        rows = (_task_to_row(Task.from_dict(record)) for record in records)
+        self._changed(None)
+        return self._conn.executemany(_UPSERT, rows).rowcount
+
+    def _write(self, task: Task, existed: bool):
+        self._conn.execute(_UPSERT, _task_to_row(task))
+        self._changed(task.id, existed)
+
+    def _changed(self, task_id: Optional[str], existed: bool = True):
+        """Bump the version; task_id None marks a bulk write that readers must rebuild after"""
+        self.version += 1
+        if task_id is None:
+            self._changes.clear()
+        else:
+            self._changes.append((self.version, task_id, existed))
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            # Take the write lock up front: a deferred transaction that reads first cannot
+            # upgrade once another process has committed, and fails without waiting
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+
+def migrate_json_to_sqlite(json_path: str, db_path: str) -> int:
+    """One-shot import of a tasks.json file (plus any leftover journal) into a SQLite database"""
+    store = SqliteTaskStore(db_path)
+    try:
+        return store.import_records(JsonTaskStorage(json_path).load())
+    finally:
+        store.close()
@@ -0,0 +1,410 @@
+import json
+import os
+import threading
+from itertools import islice
+from operator import attrgetter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+import numpy as np
+import pandas as pd
+
+from task_model import CATEGORIES, COMPLETED, PENDING, PRIORITIES, Task
+
+STATUS_CODES = {PENDING: 0, COMPLETED: 1}
+STATUSES = (PENDING, COMPLETED)
+# Rows per DataFrame chunk when exporting, so memory stays flat however many tasks there are
+EXPORT_CHUNK_ROWS = 100_000
+EXPORT_FORMATS = ('.csv', '.json', '.jsonl')
+
+
+def _nan(value: Optional[float]) -> float:
+    return np.nan if value is None else value
+
+
+class TaskColumns:
+    """Columnar NumPy copy of a task store, one row per task, for vectorized reports.
+
+    refresh() brings the columns up to the store's version by rewriting only the rows
+    named in the store's change log. Rows of removed tasks are marked dead and reused.
+    A full rebuild from the store's contents happens on first use, or when the change log no
+    longer reaches back to the last refresh. Columns built with from_records() have no
+    store and never change.
+    """
+
+    def __init__(self, store, capacity: int = 1024):
+        self.store = store
+        self.version = -1
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        self._codes: Dict[str, Dict[str, int]] = {
+            'priority': {name: code for code, name in enumerate(PRIORITIES)},
+            'category': {name: code for code, name in enumerate(CATEGORIES)},
+        }
+        self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "TaskColumns":
+        """Fixed columns over task records that live outside the store, e.g. archived ones"""
+        columns = cls(None)
+        with columns._lock:
+            for chunk in _chunks(records, EXPORT_CHUNK_ROWS):
+                columns._append([Task.from_dict(record) for record in chunk])
+            columns.version = 0
+        return columns
+
+    def refresh(self):
+        """Apply every store change since the last refresh"""
+        if self.store is None:
+            return
+        with self._lock:
+            changed = self.store.changes_since(self.version) if self.version >= 0 else None
+            if changed is None:
+                self._rebuild()
+                return
+            with self.store.batch():
+                for task_id in changed:
+                    task = self.store.get(task_id)
+                    if task is None:
+                        self._drop(task_id)
+                    else:
+                        self._write(self._row_for(task_id), task)
+                self.version = self.store.version
+
+    def summary(self, now: Optional[float] = None, archived: Optional[Dict] = None) -> Dict:
+        """Counts, rates, lead times and reminder totals over every task, computed on the columns.
+
+        `archived` adds the totals of archived tasks (TaskArchive.stats()) without reading
+        them; the lead-time median and p90 then still cover only the tasks in the columns.
+        """
+        self.refresh()
+        now = now if now is not None else datetime.now().timestamp()
+        with self._lock:
+            live = self.live[:self._size]
+            status = self.status[:self._size][live]
+            priority = self.priority[:self._size][live]
+            category = self.category[:self._size][live]
+            due = self.due[:self._size][live]
+            created = self.created[:self._size][live]
+            completed_at = self.completed[:self._size][live]
+            reminders = self.reminders[:self._size][live]
+            manual_sent = self.manual_sent[:self._size][live]
+            recurring = self.recurring[:self._size][live]
+            occurrences_done = self.occurrences_done[:self._size][live]
+            occurrences_missed = self.occurrences_missed[:self._size][live]
+            priority_names = self._names('priority')
+            category_names = self._names('category')
+
+        pending = status == STATUS_CODES[PENDING]
+        completed = status == STATUS_CODES[COMPLETED]
+        pending_count = int(pending.sum())
+        completed_count = int(completed.sum())
+
+        overdue = int((pending & (due < now)).sum())
+        finished = completed & ~np.isnan(completed_at)
+        on_time = int((finished & (completed_at <= due)).sum())
+        finished_count = int(finished.sum())
+        lead_hours = (completed_at - created)[finished & ~np.isnan(created)] / 3600
+        lead_count, lead_total = int(lead_hours.size), float(lead_hours.sum())
+        by_priority = _count_codes(priority, priority_names)
+        by_category = _count_codes(category, category_names)
+        report_archived = 0
+        totals = {
+            'auto_sent': int(reminders.sum()),
+            'manual_sent': int(manual_sent.sum()),
+            'tasks_reminded': int(((reminders > 0) | manual_sent).sum()),
+            'series': int(recurring.sum()),
+            'completed_occurrences': int(occurrences_done.sum()),
+            'missed_occurrences': int(occurrences_missed.sum()),
+        }
+        if archived and archived.get('count'):
+            report_archived = archived['count']
+            completed_count += report_archived
+            on_time += archived['on_time']
+            finished_count += archived['finished']
+            lead_count += archived['lead_count']
+            lead_total += archived['lead_seconds'] / 3600
+            for counts, extra in ((by_priority, archived['by_priority']), (by_category, archived['by_category'])):
+                for name, count in extra.items():
+                    counts[name] = counts.get(name, 0) + count
+            for key in totals:
+                totals[key] += archived[key]
+
+        return {
+            'generated_at': datetime.fromtimestamp(now).isoformat(),
+            'total': int(status.size) + report_archived,
+            'archived': report_archived,
+            'by_status': {PENDING: pending_count, COMPLETED: completed_count},
+            'by_priority': by_priority,
+            'by_category': by_category,
+            'overdue': overdue,
+            'overdue_rate': overdue / pending_count if pending_count else None,
+            'completed_on_time': on_time,
+            'on_time_rate': on_time / finished_count if finished_count else None,
+            'lead_time_hours': {
+                'mean': lead_total / lead_count if lead_count else None,
+                'median': float(np.median(lead_hours)) if lead_hours.size else None,
+                'p90': float(np.percentile(lead_hours, 90)) if lead_hours.size else None,
+            },
+            'reminders': {
+                'auto_sent': totals['auto_sent'],
+                'manual_sent': totals['manual_sent'],
+                'tasks_reminded': totals['tasks_reminded'],
+            },
+            'series': {
+                'count': totals['series'],
+                'completed_occurrences': totals['completed_occurrences'],
+                'missed_occurrences': totals['missed_occurrences'],
+            },
+        }
+
+    def frames(self, chunk_rows: int = EXPORT_CHUNK_ROWS,
+               extra_records: Optional[Iterable[Dict]] = None) -> Iterator[pd.DataFrame]:
+        """The tasks as report DataFrames of at most `chunk_rows` rows each, times as ISO strings.
+
+        `extra_records` (e.g. archived tasks) follow, one chunk of columns at a time.
+        """
+        yield from self._frames(chunk_rows)
+        if extra_records is not None:
+            for chunk in _chunks(extra_records, chunk_rows):
+                yield from TaskColumns.from_records(chunk)._frames(chunk_rows)
+
+    def _frames(self, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        self.refresh()
+        with self._lock:
+            rows = np.flatnonzero(self.live[:self._size])
+            columns = {name: getattr(self, name)[rows] for name in
+                       ('ids', 'titles', 'status', 'priority', 'category', 'due', 'created',
+                        'completed', 'reminders', 'manual_sent')}
+            priority_names = np.array(self._names('priority'), dtype=object)
+            category_names = np.array(self._names('category'), dtype=object)
+        status_names = np.array(STATUSES, dtype=object)
+
+        for start in range(0, rows.size, chunk_rows):
+            part = slice(start, start + chunk_rows)
+            due, completed_at = columns['due'][part], columns['completed'][part]
+            yield pd.DataFrame({
+                'id': columns['ids'][part],
+                'title': columns['titles'][part],
+                'status': status_names[columns['status'][part]],
+                'priority': priority_names[columns['priority'][part]],
+                'category': category_names[columns['category'][part]],
+                'due_date': _local_times(due),
+                'created_at': _local_times(columns['created'][part]),
+                'completed_at': _local_times(completed_at),
+                'reminders_sent': columns['reminders'][part],
+                'manual_reminder_sent': columns['manual_sent'][part],
+                'completed_on_time': ~np.isnan(completed_at) & (completed_at <= due),
+            })
+
+    def export(self, target: Union[str, TextIO], fmt: Optional[str] = None,
+               chunk_rows: int = EXPORT_CHUNK_ROWS, extra_records: Optional[Iterable[Dict]] = None) -> int:
+        """Stream every task, then any `extra_records`, to a .csv, .json (array) or .jsonl file.
+
+        `target` is a path or an open text file; `fmt` defaults to the path's extension
+        and is required for a file. Returns the row count.
+        """
+        if not fmt:
+            if not isinstance(target, str):
+                raise ValueError("Pass fmt ('.csv', '.json' or '.jsonl') when exporting to an open file")
+            fmt = os.path.splitext(target)[1].lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt!r} (use .csv, .json or .jsonl)")
+        if isinstance(target, str):
+            with open(target, 'w', newline='', encoding='utf-8') as f:
+                return self._export(f, fmt, chunk_rows, extra_records)
+        return self._export(target, fmt, chunk_rows, extra_records)
+
+    def export_summary(self, path: str) -> Dict:
+        report = self.summary()
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def _export(self, f: TextIO, fmt: str, chunk_rows: int, extra_records: Optional[Iterable[Dict]]) -> int:
+        written = 0
+        if fmt == '.json':
+            f.write("[")
+        for frame in self.frames(chunk_rows, extra_records):
+            if fmt == '.csv':
+                frame.to_csv(f, header=written == 0, index=False)
+            elif fmt == '.jsonl':
+                f.write(frame.to_json(orient='records', lines=True))
+            else:
+                if written:
+                    f.write(",")
+                f.write(frame.to_json(orient='records')[1:-1])
+            written += len(frame)
+        if fmt == '.json':
+            f.write("]\n")
+        return written
+
+    # Column storage; the helpers below expect self._lock to be held
+
+    def _allocate(self, capacity: int):
+        self.ids = np.empty(capacity, dtype=object)
+        self.titles = np.empty(capacity, dtype=object)
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.priority = np.zeros(capacity, dtype=np.int16)
+        self.category = np.zeros(capacity, dtype=np.int16)
+        self.due = np.full(capacity, np.nan)
+        self.created = np.full(capacity, np.nan)
+        self.completed = np.full(capacity, np.nan)
+        self.manual = np.full(capacity, np.nan)
+        self.reminders = np.zeros(capacity, dtype=np.int32)
+        self.manual_sent = np.zeros(capacity, dtype=bool)
+        self.recurring = np.zeros(capacity, dtype=bool)
+        self.occurrences_done = np.zeros(capacity, dtype=np.int32)
+        self.occurrences_missed = np.zeros(capacity, dtype=np.int32)
+        self.live = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, capacity: int):
+        old = {name: getattr(self, name) for name in
+               ('ids', 'titles', 'status', 'priority', 'category', 'due', 'created',
+                'completed', 'manual', 'reminders', 'manual_sent', 'recurring',
+                'occurrences_done', 'occurrences_missed', 'live')}
+        self._allocate(capacity)
+        for name, column in old.items():
+            getattr(self, name)[:self._size] = column[:self._size]
+
+    def _rebuild(self):
+        # Built tasks are read as they are; deferred completed records are parsed here
+        # without handing the store a Task for each. Changes landing in between are
+        # applied again by the next refresh; rewriting a row is harmless.
+        version = self.store.version
+        tasks, records = self.store.contents()
+        self._free = []
+        self._rows = {}
+        self._size = 0
+        self._allocate(max(len(tasks) + len(records), 1024))
+        for start in range(0, len(tasks), EXPORT_CHUNK_ROWS):
+            self._append(tasks[start:start + EXPORT_CHUNK_ROWS])
+        for chunk in _chunks(records, EXPORT_CHUNK_ROWS):
+            self._append([Task.from_dict(record) for record in chunk])
+        self.version = version
+
+    def _append(self, tasks: List[Task]):
+        """Write tasks into new rows at the end, a column at a time"""
+        start, count = self._size, len(tasks)
+        end = start + count
+        if end > len(self.live):
+            self._grow(max(end, 2 * len(self.live)))
+        rows = slice(start, end)
+
+        def column(attribute: str) -> list:
+            return list(map(attrgetter(attribute), tasks))
+
+        self.ids[rows] = ids = column('id')
+        self._rows.update(zip(ids, range(start, end)))
+        self.titles[rows] = column('title')
+        self.status[rows] = [_status_code(status) for status in column('status')]
+        self.priority[rows] = _encode(self._codes['priority'], column('priority'), count)
+        self.category[rows] = _encode(self._codes['category'], column('category'), count)
+        # np.array turns None into NaN for float columns
+        self.due[rows] = np.array(column('due_ts'), dtype=float)
+        self.created[rows] = np.array(column('created_ts'), dtype=float)
+        self.completed[rows] = np.array(column('completed_ts'), dtype=float)
+        self.manual[rows] = np.array(column('manual_reminder_ts'), dtype=float)
+        self.reminders[rows] = column('reminders_sent')
+        self.manual_sent[rows] = column('manual_reminder_sent')
+        self.recurring[rows] = [rule is not None for rule in column('recurrence')]
+        self.occurrences_done[rows] = column('completed_occurrences')
+        self.occurrences_missed[rows] = column('missed_occurrences')
+        self.live[rows] = True
+        self._size = end
+
+    def _row_for(self, task_id: str) -> int:
+        row = self._rows.get(task_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == len(self.live):
+                    self._grow(2 * self._size)
+                row = self._size
+                self._size += 1
+            self._rows[task_id] = row
+        return row
+
+    def _write(self, row: int, task: Task):
+        self.ids[row] = task.id
+        self.titles[row] = task.title
+        self.status[row] = _status_code(task.status)
+        self.priority[row] = _code(self._codes['priority'], task.priority)
+        self.category[row] = _code(self._codes['category'], task.category)
+        self.due[row] = _nan(task.due_ts)
+        self.created[row] = _nan(task.created_ts)
+        self.completed[row] = _nan(task.completed_ts)
+        self.manual[row] = _nan(task.manual_reminder_ts)
+        self.reminders[row] = task.reminders_sent
+        self.manual_sent[row] = task.manual_reminder_sent
+        self.recurring[row] = task.recurrence is not None
+        self.occurrences_done[row] = task.completed_occurrences
+        self.occurrences_missed[row] = task.missed_occurrences
+        self.live[row] = True
+
+    def _drop(self, task_id: str):
+        row = self._rows.pop(task_id, None)
+        if row is not None:
+            self.live[row] = False
+            self.ids[row] = self.titles[row] = None
+            self._free.append(row)
+
+    def _names(self, field: str) -> List[str]:
+        return list(self._codes[field])
+
+
+def _chunks(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _status_code(status: str) -> int:
+    # Unlike priorities and categories, statuses are a closed set the reports count by name
+    code = STATUS_CODES.get(status)
+    if code is None:
+        raise ValueError(f"Unknown task status: {status!r}")
+    return code
+
+
+def _code(codes: Dict[str, int], value: str) -> int:
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(codes)
+    return code
+
+
+def _encode(codes: Dict[str, int], values: list, count: int) -> np.ndarray:
+    for value in set(values).difference(codes):
+        _code(codes, value)
+    return np.fromiter(map(codes.__getitem__, values), dtype=np.int16, count=count)
+
+
+def _count_codes(codes: np.ndarray, names: List[str]) -> Dict[str, int]:
+    counts = np.bincount(codes, minlength=len(names)) if codes.size else np.zeros(len(names), dtype=int)
+    return {name: int(count) for name, count in zip(names, counts)}
+
+
+def _local_times(ts: np.ndarray) -> np.ndarray:
+    """Epoch seconds as local ISO strings like tasks.json uses (None where missing).
+
+    The UTC offset is looked up once per distinct hour, which keeps DST right without
+    a per-row datetime conversion.
+    """
+    missing = np.isnan(ts)
+    seconds = np.where(missing, 0, ts).astype(np.int64)
+    hours, inverse = np.unique(seconds // 3600, return_inverse=True)
+    offsets = np.array([datetime.fromtimestamp(hour * 3600).astimezone().utcoffset().total_seconds()
+                        for hour in hours.tolist()], dtype=np.int64)
+    strings = np.datetime_as_string((seconds + offsets[inverse]).astype('datetime64[s]')).astype(object)
+    strings[missing] = None
+    return strings
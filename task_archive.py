@@ -0,0 +1,221 @@
+"""Cold storage for completed tasks: gzip-compressed JSON-lines segments plus a small index.
+
+    <tasks>_archive/
+        index.json                       one entry per segment: file, row count, first and
+                                         last completion time, and aggregate figures
+        segment-000001.jsonl.gz          task records ordered by completion time
+        ...
+
+Segments are written once and never changed. Queries by completion-time range or by page
+open only the segments they need; counts and report totals come from the index alone.
+"""
+import gzip
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from task_coordination import FileLock, file_token
+from task_model import PRIORITIES
+from task_storage import write_json_atomic
+
+# Records per segment, so a page or a narrow date range decompresses little
+SEGMENT_ROWS = 10_000
+INDEX_NAME = "index.json"
+
+
+def completed_ts(record: Dict) -> float:
+    """Completion time of a task record as epoch seconds (0 if it has none)"""
+    value = record.get('completed_at')
+    return datetime.fromisoformat(value).timestamp() if value else 0.0
+
+
+def _ts(value: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def segment_stats(records: List[Dict]) -> Dict:
+    """The figures the task report needs from a segment, so reports never have to open it"""
+    by_priority = Counter(record.get('priority', PRIORITIES[1]) for record in records)
+    by_category = Counter(record.get('category', "General") for record in records)
+    finished = on_time = lead_count = 0
+    lead_seconds = 0.0
+    for record in records:
+        done = _ts(record.get('completed_at'))
+        due, created = _ts(record.get('due_date')), _ts(record.get('created_at'))
+        if done is None:
+            continue
+        finished += 1
+        if due is not None and done <= due:
+            on_time += 1
+        if created is not None:
+            lead_count += 1
+            lead_seconds += done - created
+    return {
+        'by_priority': dict(by_priority),
+        'by_category': dict(by_category),
+        'finished': finished,
+        'on_time': on_time,
+        'lead_count': lead_count,
+        'lead_seconds': lead_seconds,
+        'auto_sent': sum(record.get('reminders_sent', 0) for record in records),
+        'manual_sent': sum(1 for record in records if record.get('manual_reminder_sent')),
+        'tasks_reminded': sum(1 for record in records
+                              if record.get('reminders_sent', 0) or record.get('manual_reminder_sent')),
+        'series': sum(1 for record in records if record.get('recurrence')),
+        'completed_occurrences': sum(record.get('completed_occurrences', 0) for record in records),
+        'missed_occurrences': sum(record.get('missed_occurrences', 0) for record in records),
+    }
+
+
+def merge_stats(parts: Iterable[Dict]) -> Dict:
+    """Sum segment figures into one set"""
+    total: Dict = {'by_priority': Counter(), 'by_category': Counter()}
+    for part in parts:
+        for key, value in part.items():
+            if isinstance(value, dict):
+                total[key].update(value)
+            else:
+                total[key] = total.get(key, 0) + value
+    total['by_priority'] = dict(total['by_priority'])
+    total['by_category'] = dict(total['by_category'])
+    return total
+
+
+class TaskArchive:
+    """Append-only archive of completed task records, queried lazily by time range or page"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self._lock = threading.Lock()
+        self._segments: List[Dict] = []
+        self._token = None
+        self._refresh_index()
+
+    def __len__(self) -> int:
+        return self.count()
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever segments are added; callers can key caches on it"""
+        with self._lock:
+            self._refresh_index()
+            return len(self._segments)
+
+    def append(self, records: List[Dict]) -> int:
+        """Write records as new segments and add them to the index; returns how many were archived"""
+        if not records:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        records = sorted(records, key=completed_ts)
+        # Other instances archive into the same directory; one writer at a time
+        with self._lock, FileLock(self.index_path + ".lock"):
+            self._refresh_index()
+            number = int(self._segments[-1]['file'][8:14]) if self._segments else 0
+            for start in range(0, len(records), SEGMENT_ROWS):
+                chunk = records[start:start + SEGMENT_ROWS]
+                number += 1
+                name = f"segment-{number:06d}.jsonl.gz"
+                path = os.path.join(self.directory, name)
+                with gzip.open(f"{path}.tmp", 'wt', encoding='utf-8') as f:
+                    for record in chunk:
+                        f.write(json.dumps(record, separators=(',', ':')) + "\n")
+                os.replace(f"{path}.tmp", path)
+                self._segments.append({
+                    'file': name,
+                    'count': len(chunk),
+                    'first': completed_ts(chunk[0]),
+                    'last': completed_ts(chunk[-1]),
+                    'stats': segment_stats(chunk),
+                })
+            write_json_atomic(self.index_path, {'segments': self._segments}, indent=1)
+            self._token = file_token(self.index_path)
+        return len(records)
+
+    def count(self, since: Optional[float] = None, until: Optional[float] = None) -> int:
+        """Archived tasks completed in [since, until]; only segments straddling a bound are opened"""
+        total = 0
+        for segment in self._overlapping(since, until):
+            if self._inside(segment, since, until):
+                total += segment['count']
+            else:
+                total += sum(1 for _ in self._read(segment, since, until))
+        return total
+
+    def records(self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict]:
+        """Archived records completed in [since, until], oldest first, one segment in memory at a time"""
+        for segment in self._overlapping(since, until):
+            yield from self._read(segment, since, until)
+
+    def page(self, offset: int, limit: int, since: Optional[float] = None,
+             until: Optional[float] = None) -> List[Dict]:
+        """Records `offset`..`offset + limit` of the range, newest first.
+
+        Whole segments before the page are skipped by their index counts, unopened.
+        """
+        rows: List[Dict] = []
+        for segment in reversed(self._overlapping(since, until)):
+            if len(rows) >= limit:
+                break
+            if offset >= segment['count'] and self._inside(segment, since, until):
+                offset -= segment['count']
+                continue
+            matching = list(self._read(segment, since, until))
+            matching.reverse()
+            if offset >= len(matching):
+                offset -= len(matching)
+                continue
+            rows.extend(matching[offset:offset + limit - len(rows)])
+            offset = 0
+        return rows
+
+    def last_completed(self) -> Optional[float]:
+        """Completion time of the newest archived record, or None when the archive is empty"""
+        segments = self._overlapping(None, None)
+        return max((segment['last'] for segment in segments), default=None)
+
+    def stats(self) -> Dict:
+        """Report figures over the whole archive, from the index"""
+        segments = self._overlapping(None, None)
+        total = merge_stats(segment['stats'] for segment in segments)
+        total['count'] = sum(segment['count'] for segment in segments)
+        return total
+
+    def _overlapping(self, since: Optional[float], until: Optional[float]) -> List[Dict]:
+        with self._lock:
+            self._refresh_index()
+            return [segment for segment in self._segments
+                    if (since is None or segment['last'] >= since) and (until is None or segment['first'] <= until)]
+
+    @staticmethod
+    def _inside(segment: Dict, since: Optional[float], until: Optional[float]) -> bool:
+        return (since is None or segment['first'] >= since) and (until is None or segment['last'] <= until)
+
+    def _read(self, segment: Dict, since: Optional[float], until: Optional[float]) -> Iterator[Dict]:
+        inside = self._inside(segment, since, until)
+        with gzip.open(os.path.join(self.directory, segment['file']), 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if inside:
+                    yield record
+                    continue
+                done = completed_ts(record)
+                if until is not None and done > until:
+                    return
+                if since is None or done >= since:
+                    yield record
+
+    def _refresh_index(self):
+        # Called with self._lock held; another instance may have added segments
+        token = file_token(self.index_path)
+        if token == self._token:
+            return
+        self._token = token
+        if token is None:
+            self._segments = []
+            return
+        with open(self.index_path) as f:
+            self._segments = json.load(f)['segments']
@@ -0,0 +1,209 @@
+"""Command line for the task engine: a headless reminder daemon and task subcommands.
+
+    python -m task_scheduler daemon
+    python -m task_scheduler add "Write report" --in 45 --priority High --remind-before 10
+    python -m task_scheduler add "Standup" --due 2026-10-19T09:30 --repeat "weekly mon-fri 09:30"
+    python -m task_scheduler list --status all
+    python -m task_scheduler complete task_3_1760680000
+    python -m task_scheduler import tasks.csv
+    python -m task_scheduler archive --older-than 7
+    python -m task_scheduler list --archived --limit 20
+    python -m task_scheduler search "quarterly rep"
+
+Nothing here imports Streamlit, pandas or NumPy.
+"""
+import argparse
+import json
+import os
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import task_metrics
+from notifications import sinks_from_env
+from task_engine import ARCHIVE_AFTER_DAYS, TaskManagerAgent
+from task_model import COMPLETED, PENDING, PRIORITIES, Task
+
+
+def open_agent(args, notification_sinks: List, write_behind_interval: Optional[float] = None) -> TaskManagerAgent:
+    return TaskManagerAgent(args.tasks_file, storage_mode=args.storage,
+                            write_behind_interval=write_behind_interval,
+                            notification_sinks=notification_sinks,
+                            multi_instance=args.multi_instance,
+                            archive_after_days=args.archive_days)
+
+
+def run_daemon(args) -> int:
+    """Run the reminder worker until SIGINT/SIGTERM, writing changes behind as the UI does"""
+    task_metrics.start_from_env()
+    agent = open_agent(args, sinks_from_env(), write_behind_interval=1.0)
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    agent.start_reminder_service()
+    role = " (leads when no other instance does)" if args.multi_instance else ""
+    print(f"🤖 Reminder daemon running on {args.tasks_file} ({agent.store.count(PENDING)} pending tasks){role}")
+    while not stop.wait(1):
+        pass
+    agent.close()
+    return 0
+
+
+def run_add(args) -> int:
+    if args.due:
+        due_date = datetime.fromisoformat(args.due)
+    else:
+        due_date = datetime.now() + timedelta(minutes=args.in_minutes)
+    agent = open_agent(args, [])
+    try:
+        agent.create_task(args.title, args.description, due_date, priority=args.priority,
+                          category=args.category, manual_reminder_minutes=args.remind_before,
+                          recurrence_rule=args.repeat)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        agent.close()
+    return 0
+
+
+def run_list(args) -> int:
+    agent = open_agent(args, [])
+    try:
+        tasks = []
+        if args.archived:
+            # Newest first, reading only the segments the page touches
+            tasks = [Task.from_dict(record) for record in agent.archive.page(0, args.limit or len(agent.archive))]
+        elif args.status in (PENDING, "all"):
+            tasks.extend(agent.get_pending_tasks())
+        if args.status in (COMPLETED, "all") and not args.archived:
+            tasks.extend(agent.get_completed_tasks())
+        if args.limit:
+            tasks = tasks[:args.limit]
+        print_tasks(tasks, args.json)
+    finally:
+        agent.close()
+    return 0
+
+
+def run_search(args) -> int:
+    agent = open_agent(args, [])
+    try:
+        status = None if args.status == "all" else args.status
+        tasks = agent.search_tasks(" ".join(args.query), limit=args.limit, status=status)
+        print_tasks(tasks, args.json)
+    finally:
+        agent.close()
+    return 0 if tasks else 1
+
+
+def print_tasks(tasks: List[Task], as_json: bool):
+    for task in tasks:
+        if as_json:
+            print(json.dumps(task.to_dict()))
+            continue
+        due = task.due_date.strftime('%Y-%m-%d %H:%M') if task.due_date else "-"
+        mark = "✅" if task.status == COMPLETED else "🔁" if task.recurrence else "📌"
+        repeats = f"  ({task.recurrence})" if task.recurrence else ""
+        print(f"{mark} {task.id:<28} {due}  {task.priority:<6} {task.category:<9} {task.title}{repeats}")
+
+
+def run_complete(args) -> int:
+    agent = open_agent(args, [])
+    missing = 0
+    try:
+        for task_id in args.task_ids:
+            if not agent.mark_task_completed(task_id):
+                print(f"❌ No task with id {task_id}")
+                missing += 1
+    finally:
+        agent.close()
+    return 1 if missing else 0
+
+
+def run_archive(args) -> int:
+    agent = open_agent(args, [])
+    try:
+        moved = agent.archive_completed(args.older_than)
+        print(f"🗄️ {len(agent.archive)} tasks in the archive ({moved} just moved)")
+    finally:
+        agent.close()
+    return 0
+
+
+def run_import(args) -> int:
+    agent = open_agent(args, [])
+    try:
+        result = agent.import_tasks(args.path, batch_size=args.batch_size)
+    finally:
+        agent.close()
+    for error in result['errors']:
+        print(f"  {error}")
+    return 1 if result['failed'] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m task_scheduler",
+                                     description="Task Manager Agent without the web UI")
+    parser.add_argument("--tasks-file", default="tasks.json")
+    parser.add_argument("--storage", default=os.environ.get("TASK_STORAGE_MODE", "json"),
+                        choices=("json", "journal", "sqlite"))
+    parser.add_argument("--multi-instance", action="store_true",
+                        default=os.environ.get("TASK_MULTI_INSTANCE") == "1",
+                        help="share the task files safely with other running instances (TASK_MULTI_INSTANCE=1)")
+    parser.add_argument("--archive-days", type=float,
+                        default=float(os.environ.get("TASK_ARCHIVE_DAYS", ARCHIVE_AFTER_DAYS)),
+                        help="archive tasks completed this many days ago; 0 turns archiving off (TASK_ARCHIVE_DAYS)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    daemon = commands.add_parser("daemon", help="run the reminder service until interrupted")
+    daemon.set_defaults(handler=run_daemon)
+
+    add = commands.add_parser("add", help="create a task")
+    add.add_argument("title")
+    add.add_argument("--description", default="")
+    due = add.add_mutually_exclusive_group()
+    due.add_argument("--due", help="due date and time, ISO format (e.g. 2026-10-19T09:30)")
+    due.add_argument("--in", dest="in_minutes", type=int, default=30, help="due in this many minutes (default 30)")
+    add.add_argument("--priority", default="Medium", choices=PRIORITIES)
+    add.add_argument("--category", default="General")
+    add.add_argument("--remind-before", type=int, default=0, metavar="MINUTES",
+                     help="manual reminder this many minutes before the due time")
+    add.add_argument("--repeat", metavar="RULE",
+                     help="recurrence rule, e.g. 'daily 09:00' or 'every 2h' (see recurrence.py)")
+    add.set_defaults(handler=run_add)
+
+    listing = commands.add_parser("list", help="list tasks")
+    listing.add_argument("--status", default=PENDING, choices=(PENDING, COMPLETED, "all"))
+    listing.add_argument("--limit", type=int, default=0)
+    listing.add_argument("--json", action="store_true", help="one JSON record per line")
+    listing.add_argument("--archived", action="store_true", help="list archived tasks instead, newest first")
+    listing.set_defaults(handler=run_list)
+
+    search = commands.add_parser("search", help="find tasks by words in their title, description or category")
+    search.add_argument("query", nargs="+", help="words, or beginnings of words, that must all match")
+    search.add_argument("--status", default="all", choices=(PENDING, COMPLETED, "all"))
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--json", action="store_true", help="one JSON record per line")
+    search.set_defaults(handler=run_search)
+
+    complete = commands.add_parser("complete", help="mark tasks (or a series' current occurrence) done")
+    complete.add_argument("task_ids", nargs="+")
+    complete.set_defaults(handler=run_complete)
+
+    importing = commands.add_parser("import", help="import tasks from a .csv or .jsonl file")
+    importing.add_argument("path")
+    importing.add_argument("--batch-size", type=int, default=1000)
+    importing.set_defaults(handler=run_import)
+
+    archive = commands.add_parser("archive", help="move old completed tasks to the archive now")
+    archive.add_argument("--older-than", type=float, metavar="DAYS",
+                         help="completed at least this many days ago (default --archive-days)")
+    archive.set_defaults(handler=run_archive)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,278 @@
+"""Coordination between several processes sharing one task file.
+
+    LeaderLease   one instance at a time holds an exclusive lock on <tasks file>.leader and
+                  runs the reminder worker; the OS drops the lock when the holder exits or
+                  dies, so the next instance takes over without any expiry timer
+    FileLock      serializes writes to the shared files across processes
+    FileWatcher   calls back when the task files change on disk, using inotify where
+                  available (Linux, through ctypes) and stat polling elsewhere
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import socket
+import struct
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Tags this process's journal lines so it can skip its own writes when tailing
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _lock(fd: int, blocking: bool) -> bool:
+    """Take an exclusive lock on an open file; False if it is held elsewhere and blocking is off"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except (BlockingIOError, PermissionError):
+        return False
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileLock:
+    """Reentrant exclusive lock shared by every thread in this process and across processes"""
+
+    _instances: Dict[str, "FileLock"] = {}
+    _instances_lock = threading.Lock()
+
+    def __new__(cls, path: str):
+        # One object per path: two descriptors on the same file would lock each other out
+        path = os.path.abspath(path)
+        with cls._instances_lock:
+            lock = cls._instances.get(path)
+            if lock is None:
+                lock = cls._instances[path] = super().__new__(cls)
+                lock.path = path
+                lock._thread_lock = threading.RLock()
+                lock._depth = 0
+                lock._fd = None
+            return lock
+
+    def __enter__(self) -> "FileLock":
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                _lock(self._fd, blocking=True)
+            except Exception:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                _unlock(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+
+class LeaderLease:
+    """Keeps trying to become leader in the background and calls `on_acquired` once it is"""
+
+    def __init__(self, path: str, on_acquired: Callable[[], None], retry_interval: float = 1.0):
+        self.path = path
+        self.on_acquired = on_acquired
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self._fd: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="leader-lease", daemon=True)
+        self._thread.start()
+
+    def release(self):
+        """Stop campaigning and give up leadership if held"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._fd is not None:
+            self.is_leader = False
+            _unlock(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def holder(self) -> str:
+        """Who last took the lease, as written into the lease file"""
+        try:
+            with open(self.path) as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def _run(self):
+        while not self._stop.is_set():
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if _lock(fd, blocking=False):
+                os.ftruncate(fd, 0)
+                os.write(fd, f"{INSTANCE_ID} since {time.strftime('%Y-%m-%d %H:%M:%S')}\n".encode())
+                self._fd = fd
+                self.is_leader = True
+                try:
+                    self.on_acquired()
+                except Exception as e:
+                    print(f"Error taking over as leader: {e}")
+                return
+            os.close(fd)
+            self._stop.wait(self.retry_interval)
+
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _inotify():
+    """libc with inotify_init1/inotify_add_watch, or None where inotify isn't available"""
+    name = ctypes.util.find_library("c")
+    if not name:
+        return None
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """Calls `callback(changed_names)` shortly after any of `paths` is written, replaced or removed.
+
+    Watches the containing directories with inotify, so atomic rename-over writes are seen.
+    Falls back to polling each file's inode, size and mtime every `poll_interval` seconds.
+    Events within `debounce` seconds are delivered together.
+    """
+
+    def __init__(self, paths: Iterable[str], callback: Callable[[Set[str]], None],
+                 poll_interval: float = 0.5, debounce: float = 0.05):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.backend = "stat"
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        libc = _inotify()
+        target = self._run_stat
+        if libc is not None:
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+                directories = {os.path.dirname(path) for path in self.paths}
+                if all(libc.inotify_add_watch(fd, directory.encode(), mask) >= 0 for directory in directories):
+                    self.backend = "inotify"
+                    target = lambda: self._run_inotify(fd)  # noqa: E731
+                else:
+                    os.close(fd)
+        self._thread = threading.Thread(target=target, name=f"file-watcher-{self.backend}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        os.write(self._wake_w, b"x")
+        if self._thread is not None:
+            self._thread.join()
+
+    def _deliver(self, names: Set[str]):
+        try:
+            self.callback(names)
+        except Exception as e:
+            print(f"Error handling task file change: {e}")
+
+    def _run_inotify(self, fd: int):
+        watched = {os.path.basename(path) for path in self.paths}
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd, self._wake_r], [], [])
+                if self._wake_r in ready:
+                    return
+                # Let a burst of writes settle, then read everything queued so far
+                time.sleep(self.debounce)
+                names = {name for name in self._read_events(fd) if name in watched}
+                if names:
+                    self._deliver(names)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_events(fd: int) -> List[str]:
+        names = []
+        while True:
+            try:
+                data = os.read(fd, 1 << 16)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                names.append(data[offset:offset + length].rstrip(b"\0").decode(errors="replace"))
+                offset += length
+
+    def _run_stat(self):
+        states = {path: self._stat(path) for path in self.paths}
+        while not self._stop.wait(self.poll_interval):
+            names = set()
+            for path in self.paths:
+                state = self._stat(path)
+                if state != states[path]:
+                    states[path] = state
+                    names.add(os.path.basename(path))
+            if names:
+                self._deliver(names)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def file_token(path: str) -> Optional[Tuple[int, int, int]]:
+    """Identity of a file's current contents (inode, size, mtime), None if it doesn't exist"""
+    return FileWatcher._stat(path)
@@ -0,0 +1,797 @@
+"""The task engine: store, storage, reminder worker and notifications, with no UI.
+
+Used by the Streamlit app (task_ui), the headless daemon and the CLI (task_cli).
+Neither Streamlit nor pandas is imported here; reports load task_analytics on first use.
+"""
+import time
+import threading
+import itertools
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterable, Optional, Set, Tuple
+import os
+
+import recurrence
+from reminder_bus import ReminderBus, ReminderDigester, notification_reminders
+from reminder_queue import ReminderQueue
+from task_archive import TaskArchive, completed_ts
+from task_search import SearchIndex
+from task_store import StoreSnapshot, TaskStore
+from task_model import COMPLETED, PENDING, Task
+from task_storage import StaleWriteError, open_storage
+from task_coordination import INSTANCE_ID, FileWatcher, LeaderLease
+from sqlite_store import SqliteTaskStore
+import task_import
+from notifications import ConsoleSink, NotificationDispatcher
+from task_metrics import (LOAD_BYTES, LOAD_SECONDS, METRICS, REMINDER_LAG, REMINDERS_SENT,
+                          WORKER_LOOP_SECONDS, log_event, profiled, record_error)
+
+# Auto-reminders start this long before the due time and repeat at most every REPEAT minutes
+AUTO_REMINDER_MINUTES = 30
+AUTO_REMINDER_REPEAT_MINUTES = 10
+# Reminder events kept on the bus for sessions and the digester to read
+REMINDER_BUS_CAPACITY = 1000
+# Reminders a UI session lists
+RECENT_REMINDER_LIMIT = 10
+# Completed tasks move to the archive once they are this many days old; the leader checks hourly
+ARCHIVE_AFTER_DAYS = 30
+ARCHIVE_INTERVAL_SECONDS = 3600
+# How long stopping the service waits for reminders already fired to be delivered
+SETTLE_TIMEOUT_SECONDS = 10
+# Reminder-queue id of the periodic archive run
+ARCHIVE_JOB = "__archive__"
+# Occurrences a rollover steps through one at a time before jumping to the upcoming one
+ROLLOVER_CATCH_UP = 1000
+
+class TaskManagerAgent:
+    def __init__(self, tasks_file: str = "tasks.json", storage_mode: str = "json",
+                 write_behind_interval: Optional[float] = 1.0, notification_sinks: Optional[List] = None,
+                 multi_instance: bool = False, archive_after_days: Optional[float] = ARCHIVE_AFTER_DAYS):
+        self.tasks_file = tasks_file
+        self.storage_mode = storage_mode
+        # Several processes share the task files: one leads and fires reminders, all merge their writes
+        self.multi_instance = multi_instance
+        self.dispatcher = NotificationDispatcher(
+            notification_sinks if notification_sinks is not None else [ConsoleSink()],
+            dead_letter_path=os.path.splitext(tasks_file)[0] + "_dead_letter.jsonl",
+            on_settled=self._confirm_reminders,
+        )
+        # (task_id, reminder type) -> fire time of reminders published but not yet delivered;
+        # guarded by the store lock. They are recorded as sent only once the sinks are done
+        # with them, so a leader that dies first leaves them for the next one to send.
+        self._in_flight: Dict[Tuple[str, str], float] = {}
+        self._settled = threading.Condition()
+        if storage_mode == "sqlite":
+            # The database is both the store and the storage; tasks.json is imported on first use
+            db_path = os.path.splitext(tasks_file)[0] + ".db"
+            self.store = self.storage = SqliteTaskStore(db_path, migrate_from=tasks_file)
+        else:
+            # Mutations are queued and written by a background writer unless the interval is None
+            self.storage = open_storage(tasks_file, storage_mode, write_behind_interval, shared=multi_instance)
+            self.store = TaskStore()
+            self.load_tasks()
+        # Old completed tasks live in gzip segments next to the task file, read only when asked for
+        self.archive = TaskArchive(os.path.splitext(tasks_file)[0] + "_archive")
+        self.archive_after_days = archive_after_days
+        self._next_archive_ts = time.time()
+        self._id_sequence = itertools.count(len(self.store) + 1)
+        self._id_suffix = ""
+        self._analytics = None
+        self._search_index = None
+        self.reminder_thread = None
+        self.running = False
+        self.reminder_queue = ReminderQueue()
+        # The worker publishes reminders here; sessions read them and the digester hands them to the sinks
+        self.reminder_bus = ReminderBus(REMINDER_BUS_CAPACITY)
+        self.digester = ReminderDigester(self.reminder_bus, self.dispatcher.submit, self.dispatcher.backlog)
+        self.digester.start()
+        for task in self.store.pending():
+            self._schedule_reminders(task)
+        self._register_metrics()
+        self.lease = self.watcher = None
+        if multi_instance:
+            # Instances can create tasks in the same second, so ids carry an instance suffix
+            self._id_suffix = "_" + INSTANCE_ID.rsplit(":", 1)[1]
+            self.lease = LeaderLease(f"{tasks_file}.leader", self._lead)
+            watched = [self.tasks_file, f"{tasks_file}.journal"]
+            if self.store is self.storage:
+                watched = [self.store.db_path, f"{self.store.db_path}-wal"]
+            self.watcher = FileWatcher(watched, lambda names: self.sync_external())
+            self.watcher.start()
+        
+    def _register_metrics(self):
+        """Point the scrape-time gauges at this agent"""
+        METRICS.gauge("task_reminder_queue_depth", "Auto and manual reminders waiting in the queue",
+                      self.reminder_queue.reminder_count)
+        METRICS.gauge("task_next_reminder_timestamp", "Epoch time of the next auto or manual reminder",
+                      self.reminder_queue.next_reminder_time)
+        METRICS.gauge("task_pending", "Pending tasks", lambda: self.store.count(PENDING))
+        METRICS.gauge("task_completed", "Completed tasks", lambda: self.store.count(COMPLETED))
+        METRICS.gauge("task_overdue", "Pending tasks past their due date",
+                      lambda: self.store.count_due_between(datetime.fromtimestamp(0), datetime.now()))
+        
+    @profiled
+    def load_tasks(self):
+        """Load tasks from storage into the store; completed ones are kept as raw records until needed"""
+        start = time.perf_counter()
+        tasks, deferred = [], []
+        try:
+            for record in self.storage.load():
+                if record.get('status') == COMPLETED:
+                    deferred.append(record)
+                else:
+                    tasks.append(Task.from_dict(record))
+        except Exception as e:
+            record_error("load", e)
+            print(f"Error loading tasks: {e}")
+        # One bulk load sorts each index once instead of inserting task by task
+        self.store.load(tasks, deferred)
+        seconds = time.perf_counter() - start
+        nbytes = sum(os.path.getsize(path) for path in
+                     (self.tasks_file, f"{self.tasks_file}.journal", f"{self.tasks_file}.journal.1")
+                     if os.path.exists(path))
+        LOAD_SECONDS.observe(seconds, mode=self.storage_mode)
+        LOAD_BYTES.inc(nbytes, mode=self.storage_mode)
+        log_event("load", mode=self.storage_mode, seconds=round(seconds, 6), bytes=nbytes, tasks=len(self.store))
+    
+    @profiled
+    def save_tasks(self):
+        """Save a full snapshot of all tasks to storage"""
+        try:
+            try:
+                self.storage.save(self._task_records())
+            except StaleWriteError:
+                # Another instance wrote first: merge its changes in, then save the result
+                with self.store.batch():
+                    self.sync_external()
+                    self.storage.save(self._task_records())
+        except Exception as e:
+            record_error("save", e)
+            print(f"Error saving tasks: {e}")
+    
+    def flush(self):
+        """Block until every queued mutation has been written to storage"""
+        try:
+            self.storage.flush()
+        except Exception as e:
+            record_error("save", e)
+            print(f"Error saving tasks: {e}")
+    
+    def _task_records(self) -> List[Dict]:
+        return list(self.store.records())
+    
+    def _persist(self, op: str, task: Task):
+        """Persist a single mutation (create, complete, delete, reminder or rollover).
+
+        Callers hold the store lock so mutations reach storage in the order they were applied.
+        """
+        try:
+            self.storage.append(op, task.to_dict(), self._task_records)
+        except Exception as e:
+            record_error("persist", e)
+            print(f"Error saving tasks: {e}")
+    
+    def _persist_many(self, entries: List[Tuple[str, Task]]):
+        """Persist a batch of mutations in a single storage step"""
+        try:
+            self.storage.append_many([(op, task.to_dict()) for op, task in entries], self._task_records)
+        except Exception as e:
+            record_error("persist", e)
+            print(f"Error saving tasks: {e}")
+    
+    def _new_task_id(self) -> str:
+        """Generate a task_<n>_<epoch> id that no existing task uses"""
+        while True:
+            task_id = f"task_{next(self._id_sequence)}_{int(time.time())}{self._id_suffix}"
+            if task_id not in self.store:
+                return task_id
+    
+    def _build_task(self, title: str, description: str, due_date: datetime,
+                    priority: str = "Medium", category: str = "General",
+                    manual_reminder_minutes: int = 0, recurrence_rule: Optional[str] = None) -> Task:
+        # Calculate manual reminder time if specified
+        manual_reminder_time = None
+        if manual_reminder_minutes > 0:
+            manual_reminder_time = due_date - timedelta(minutes=manual_reminder_minutes)
+        
+        # Reject a malformed rule now rather than when the first occurrence is done
+        if recurrence_rule:
+            recurrence_rule = recurrence_rule.strip()
+            recurrence.parse(recurrence_rule)
+        
+        task = Task(
+            id=self._new_task_id(),
+            title=title,
+            description=description,
+            due_date=due_date,
+            priority=priority,
+            category=category,
+            status=PENDING,
+            created_at=datetime.now(),
+            manual_reminder_time=manual_reminder_time,
+            recurrence=recurrence_rule or None,
+        )
+        if task.recurrence:
+            # Computed before the task is stored, so a series that cannot roll over is never saved
+            try:
+                self._rollover_at(task)
+            except (OverflowError, OSError) as e:
+                raise ValueError(f"Invalid recurrence {task.recurrence!r}: no occurrence after {due_date}: {e}")
+        return task
+    
+    @profiled
+    def create_task(self, title: str, description: str, due_date: datetime, 
+                   priority: str = "Medium", category: str = "General",
+                   manual_reminder_minutes: int = 0, recurrence_rule: Optional[str] = None) -> str:
+        """Create a new task; with a recurrence rule it is a series whose first occurrence is due_date"""
+        task = self._build_task(title, description, due_date, priority, category, manual_reminder_minutes,
+                                recurrence_rule)
+        
+        with self.store.batch():
+            self.store.add(task)
+            self._persist("create", task)
+            self._schedule_reminders(task)
+        repeats = f", repeats {task.recurrence}" if task.recurrence else ""
+        print(f"✅ Task created: {title} (ID: {task.id}{repeats})")
+        return task.id
+    
+    @profiled
+    def create_tasks(self, tasks: Iterable[Dict]) -> List[str]:
+        """Create many tasks from dicts of create_task arguments, persisting them in one step"""
+        created = [self._build_task(**fields) for fields in tasks]
+        with self.store.batch():
+            for task in created:
+                self.store.add(task)
+            self._persist_many([("create", task) for task in created])
+            for task in created:
+                self._schedule_reminders(task)
+        print(f"✅ {len(created)} tasks created")
+        return [task.id for task in created]
+    
+    
+    @profiled
+    def mark_task_completed(self, task_id: str):
+        """Mark a task as completed; for a series, complete its current occurrence"""
+        with self.store.batch():
+            task = self.store.get(task_id)
+            if task is None:
+                return False
+            task = self._complete(task, time.time())
+            self._persist("complete", task)
+            self._schedule_reminders(task)
+        if task.status == PENDING:
+            print(f"🔁 Occurrence completed: {task.title}, next due {task.due_date.strftime('%Y-%m-%d %H:%M')}")
+        else:
+            print(f"✅ Task completed: {task.title}")
+        return True
+    
+    def _complete(self, task: Task, now: float) -> Task:
+        """Complete a task, or move a series on to its next occurrence; the store lock is held"""
+        if task.recurrence and task.status == PENDING:
+            changes = self._next_occurrence(task, now) or {'status': COMPLETED}
+            changes.update(completed_ts=now, completed_occurrences=task.completed_occurrences + 1)
+            return self.store.modify(task.id, **changes)
+        return self.store.modify(task.id, status=COMPLETED, completed_ts=now)
+    
+    def _next_occurrence(self, task: Task, now: float) -> Optional[Dict]:
+        """Changes that move a series to its first occurrence after now, or None once it has none left"""
+        next_due = recurrence.next_occurrence(task.recurrence, task.due_ts, now)
+        if next_due is None:
+            return None
+        return self._move_to(task, next_due)
+    
+    def _move_to(self, task: Task, next_due: float) -> Dict:
+        """Changes that move a series to the occurrence due at `next_due`"""
+        changes = {'due_ts': next_due, 'manual_reminder_sent': False}
+        if task.manual_reminder_ts is not None:
+            # The manual reminder keeps its lead time before each occurrence
+            changes['manual_reminder_ts'] = task.manual_reminder_ts + (next_due - task.due_ts)
+        return changes
+    
+    def _rollover_at(self, task: Task) -> Optional[float]:
+        """When the occurrence after the current one starts; until then the current one can
+        still be completed, and is overdue once past its due time"""
+        return recurrence.next_occurrence(task.recurrence, task.due_ts, task.due_ts)
+    
+    def _roll_over(self, task_id: str):
+        """Move a series whose occurrence went by without being completed on to the one now current"""
+        now = time.time()
+        with self.store.batch():
+            task = self.store.get(task_id)
+            if task is None or task.status != PENDING or not task.recurrence:
+                return
+            next_due = self._rollover_at(task)
+            if next_due is None or next_due > now:
+                # Completed or edited since the rollover was queued
+                self._schedule_reminders(task)
+                return
+            # Every occurrence that started since counts as missed, up to the latest one
+            missed, due = 1, next_due
+            while missed < ROLLOVER_CATCH_UP:
+                following = recurrence.next_occurrence(task.recurrence, due, due)
+                if following is None or following > now:
+                    break
+                due, missed = following, missed + 1
+            else:
+                # Too far behind to step through; jump to the upcoming occurrence
+                due = recurrence.next_occurrence(task.recurrence, due, now) or due
+            changes = self._move_to(task, due)
+            changes['missed_occurrences'] = task.missed_occurrences + missed
+            updated = self.store.modify(task_id, **changes)
+            self._persist("rollover", updated)
+            self._schedule_reminders(updated)
+        log_event("occurrence_missed", task_id=task_id, due=task.due_ts)
+        if updated.status == PENDING:
+            print(f"🔁 Missed occurrence of {task.title}, next due {updated.due_date.strftime('%Y-%m-%d %H:%M')}")
+    
+    @profiled
+    def delete_task(self, task_id: str):
+        """Delete a task"""
+        with self.store.batch():
+            task = self.store.remove(task_id)
+            if task is not None:
+                self._persist("delete", task)
+            self.reminder_queue.cancel(task_id)
+        print(f"🗑️ Task deleted: {task_id}")
+    
+    def complete_tasks(self, task_ids: Iterable[str]) -> int:
+        """Mark many tasks as completed, persisting them in one step; returns how many changed"""
+        completed = []
+        now = time.time()
+        with self.store.batch():
+            for task_id in task_ids:
+                task = self.store.get(task_id)
+                if task is None or task.status == COMPLETED:
+                    continue
+                completed.append(self._complete(task, now))
+            self._persist_many([("complete", task) for task in completed])
+            for task in completed:
+                self._schedule_reminders(task)
+        print(f"✅ {len(completed)} tasks completed")
+        return len(completed)
+    
+    def delete_tasks(self, task_ids: Iterable[str]) -> int:
+        """Delete many tasks, persisting them in one step; returns how many were deleted"""
+        deleted = []
+        with self.store.batch():
+            for task_id in task_ids:
+                task = self.store.remove(task_id)
+                if task is not None:
+                    deleted.append(task)
+            self._persist_many([("delete", task) for task in deleted])
+            for task in deleted:
+                self.reminder_queue.cancel(task.id)
+        print(f"🗑️ {len(deleted)} tasks deleted")
+        return len(deleted)
+    
+    def import_tasks(self, path: str, batch_size: int = 1000) -> Dict:
+        """Import tasks from a CSV or JSONL file in constant memory (see task_import)"""
+        return task_import.import_tasks(self, path, batch_size=batch_size)
+    
+    def get_snapshot(self) -> StoreSnapshot:
+        """Pending and completed tasks at one store version, safe to read while reminders fire"""
+        return self.store.snapshot()
+    
+    def get_categories(self) -> Set[str]:
+        """Categories of every stored task, without building deferred completed tasks"""
+        return self.store.categories()
+    
+    def get_pending_tasks(self) -> List[Task]:
+        """Get all pending tasks, sorted by due date"""
+        return self.store.pending()
+    
+    def get_completed_tasks(self) -> List[Task]:
+        """Get all completed tasks"""
+        return self.store.completed()
+    
+    @profiled
+    def get_tasks_due_soon(self, minutes_before: int = 30) -> List[Task]:
+        """Get tasks that are due within the specified minutes"""
+        now = datetime.now()
+        return self.store.due_between(now, now + timedelta(minutes=minutes_before))
+    
+    def get_manual_reminders_due(self) -> List[Task]:
+        """Get tasks with manual reminders that are due"""
+        return self.store.manual_reminders_before(datetime.now())
+    
+    def get_task_stats(self, minutes_before: int = 30) -> Dict[str, int]:
+        """Get pending, completed, archived, due-soon and overdue counts for the statistics panel"""
+        now = datetime.now()
+        return {
+            'pending': self.store.count(PENDING),
+            'completed': self.store.count(COMPLETED),
+            'archived': len(self.archive),
+            'due_soon': self.store.count_due_between(now, now + timedelta(minutes=minutes_before)),
+            'overdue': self.store.count_due_between(datetime.fromtimestamp(0), now),
+        }
+    
+    @property
+    def analytics(self):
+        """Columnar copy of the store for reports, built on first use so NumPy/pandas load only then"""
+        if self._analytics is None:
+            from task_analytics import TaskColumns
+            self._analytics = TaskColumns(self.store)
+        return self._analytics
+    
+    @property
+    def search_index(self) -> SearchIndex:
+        """Full-text index of the store, built on the first search and then kept current from its changes"""
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+        return self._search_index
+    
+    @profiled
+    def search_tasks(self, query: str, limit: int = 20, status: Optional[str] = None) -> List[Task]:
+        """Tasks whose title, description or category contain every word of `query` (or a word
+        starting with it), best match first; `status` restricts them to pending or completed"""
+        index = self.search_index
+        index.refresh(self.store)
+        tasks = []
+        for task_id, _ in index.search(query, limit, status):
+            task = self.store.get(task_id)
+            # Deleted between the search and now
+            if task is not None:
+                tasks.append(task)
+        return tasks
+    
+    def get_report(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Dict:
+        """Counts by status/priority/category, overdue and on-time rates, lead times and reminder totals.
+
+        Without a range the report covers every task, archived ones included through the
+        archive index. With a range it covers the tasks completed in it, hot and archived.
+        """
+        if since is None and until is None:
+            return self.analytics.summary(archived=self.archive.stats())
+        from task_analytics import TaskColumns
+        return TaskColumns.from_records(self._completed_records(since, until)).summary()
+    
+    def export_report(self, target, fmt: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None) -> int:
+        """Stream tasks to a .csv, .json or .jsonl report (a path or an open text file).
+
+        Without a range every task is exported, archived ones last; with a range, the tasks
+        completed in it.
+        """
+        from task_analytics import TaskColumns
+        if since is None and until is None:
+            return self.analytics.export(target, fmt, extra_records=self._archived_records(None, None))
+        return TaskColumns(None).export(target, fmt, extra_records=self._completed_records(since, until))
+    
+    def _completed_records(self, since: Optional[datetime], until: Optional[datetime]) -> Iterable[Dict]:
+        """Records of hot and archived tasks completed in [since, until]"""
+        start = since.timestamp() if since else None
+        end = until.timestamp() if until else None
+        for task in self.store.completed():
+            if (task.completed_ts is not None and (start is None or task.completed_ts >= start)
+                    and (end is None or task.completed_ts <= end)):
+                yield task.to_dict()
+        yield from self._archived_records(start, end)
+    
+    def _archived_records(self, start: Optional[float], end: Optional[float]) -> Iterable[Dict]:
+        # A crash between archiving and deleting can leave a task in both places; the store wins
+        for record in self.archive.records(start, end):
+            if record['id'] not in self.store:
+                yield record
+    
+    @profiled
+    def archive_completed(self, older_than_days: Optional[float] = None) -> int:
+        """Move tasks completed more than `older_than_days` (default: archive_after_days) ago to the
+        archive; returns how many were moved"""
+        days = self.archive_after_days if older_than_days is None else older_than_days
+        if days is None or (older_than_days is None and not days):
+            # Archiving is turned off
+            return 0
+        cutoff = time.time() - days * 86400
+        try:
+            records = self.store.completed_before(cutoff)
+            if not records:
+                return 0
+            # Segments are written before the tasks are deleted, so a crash in between
+            # leaves tasks in both places; skip any a previous run already archived
+            newest = self.archive.last_completed()
+            fresh = records
+            if newest is not None and any(completed_ts(record) <= newest for record in records):
+                oldest = min(completed_ts(record) for record in records)
+                archived = {record['id'] for record in self.archive.records(oldest, newest)}
+                fresh = [record for record in records if record['id'] not in archived]
+            # Compressing happens outside the store lock; completed tasks only change by deletion
+            self.archive.append(fresh)
+            with self.store.batch():
+                removed = [task for task in (self.store.remove(record['id']) for record in records)
+                           if task is not None]
+                self._persist_many([("delete", task) for task in removed])
+        except Exception as e:
+            record_error("archive", e)
+            print(f"Error archiving tasks: {e}")
+            return 0
+        log_event("archive", tasks=len(removed), cutoff=round(cutoff, 3), archived_total=len(self.archive))
+        print(f"🗄️ {len(removed)} completed tasks archived")
+        return len(removed)
+    
+    @profiled
+    def send_reminder(self, task: Task, reminder_type: str = "auto"):
+        """Send reminder for a task with sound"""
+        try:
+            # Create reminder message
+            time_left = task.due_date - datetime.now()
+            minutes_left = max(0, int(time_left.total_seconds() / 60))
+            
+            if reminder_type == "manual":
+                reminder_msg = f"🔔 MANUAL REMINDER: '{task.title}'"
+            else:
+                reminder_msg = f"🔔 REMINDER: '{task.title}' is due in {minutes_left} minutes!"
+            
+            with self.store.batch():
+                # Checked against the stored task, not the possibly stale one passed in
+                current = self.store.get(task.id)
+                if current is None or (task.id, reminder_type) in self._in_flight:
+                    return False
+                if reminder_type == "manual" and current.manual_reminder_sent:
+                    return False
+                self._in_flight[(task.id, reminder_type)] = time.time()
+            
+            # Sessions pick the event up on their next run; the digester hands it to the
+            # sinks (console, webhook, email, ...), folding bursts into one digest
+            self.reminder_bus.publish({
+                'task_id': task.id,
+                'title': task.title,
+                'description': task.description,
+                'message': reminder_msg,
+                'due_at': task.due_date.strftime('%Y-%m-%d %H:%M'),
+                'type': reminder_type,
+                'sent_at': datetime.now().isoformat(),
+            })
+            
+            REMINDERS_SENT.inc(kind=reminder_type)
+            return True
+        except Exception as e:
+            record_error("reminder", e)
+            print(f"Error sending reminder: {e}")
+            return False
+    
+    def _confirm_reminders(self, notification: Dict):
+        """Record the reminders in a notification as sent, once every sink has delivered it or given up"""
+        with self.store.batch():
+            for task_id, reminder_type in notification_reminders(notification):
+                fired_at = self._in_flight.pop((task_id, reminder_type), None)
+                if fired_at is None:
+                    continue
+                # Update reminder tracking on a fresh copy; readers may still hold the old task
+                current = self.store.get(task_id)
+                if current is None:
+                    continue
+                if reminder_type == "manual":
+                    changes = {'manual_reminder_sent': True}
+                else:
+                    changes = {'last_reminder_ts': fired_at, 'reminders_sent': current.reminders_sent + 1}
+                updated = self.store.modify(task_id, **changes)
+                self._persist("reminder", updated)
+                self._schedule_reminders(updated)
+        if self.multi_instance:
+            # Other instances, and a leader taking over, must see the reminder as sent
+            self.flush()
+        with self._settled:
+            self._settled.notify_all()
+    
+    def _wait_settled(self, timeout: float) -> bool:
+        """Wait until every fired reminder has been delivered and recorded; False on timeout"""
+        with self._settled:
+            return self._settled.wait_for(lambda: not self._in_flight, timeout)
+    
+    def send_manual_reminder_now(self, task_id: str):
+        """Send immediate manual reminder for a task"""
+        task = self.store.get(task_id)
+        if task is None or task.status != PENDING:
+            return False
+        self.send_reminder(task, "manual")
+        print(f"✅ Manual reminder sent for: {task.title}")
+        return True
+    
+    def start_reminder_service(self):
+        """Start the background reminder service; with several instances, only once this one leads"""
+        if self.lease is not None:
+            self.lease.start()
+            return
+        self._start_worker()
+    
+    def _start_worker(self):
+        if not self.running:
+            # A worker still finishing its last batch would otherwise miss the close and
+            # keep running next to the new one once the queue is reopened
+            self._join_worker()
+            self.running = True
+            self.reminder_queue.reopen()
+            self._schedule_archive()
+            self.reminder_thread = threading.Thread(target=self._reminder_worker, daemon=True)
+            self.reminder_thread.start()
+            print("🔔 Reminder service started!")
+    
+    def _lead(self):
+        """Called once this instance holds the leader lease: catch up, then run the worker"""
+        self.sync_external()
+        with self.store.batch():
+            self._reschedule_all()
+        print(f"👑 Leading reminders for {self.tasks_file} as {INSTANCE_ID}")
+        self._start_worker()
+    
+    def stop_reminder_service(self):
+        """Stop the reminder service"""
+        self.running = False
+        self.reminder_queue.close()
+        self._join_worker()
+        if self.lease is not None:
+            # Hand over only once fired reminders are recorded, or the next leader sends them again
+            if not self._wait_settled(self.digester.window + SETTLE_TIMEOUT_SECONDS):
+                print("⚠️ Stepping down with reminders still being delivered")
+            # Let another instance take over
+            self.lease.release()
+        self.flush()
+        print("🛑 Reminder service stopped")
+    
+    def _join_worker(self):
+        """Wait for the previous worker thread to exit, unless that is the calling thread"""
+        thread = self.reminder_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self.reminder_thread = None
+    
+    def close(self):
+        """Stop everything this agent runs and flush its writes"""
+        if self.running:
+            self.stop_reminder_service()
+        elif self.lease is not None:
+            # Still campaigning: stop without announcing a service that never ran
+            self.lease.release()
+        if self.watcher is not None:
+            self.watcher.stop()
+        # Deliver what the digester holds first: delivered reminders are written as sent
+        self.digester.stop()
+        self.dispatcher.close()
+        self.flush()
+        self.storage.close()
+    
+    def sync_external(self) -> bool:
+        """Pick up changes other instances wrote to the shared task files"""
+        with self.store.batch():
+            changed = self.storage.sync_external(self._apply_external, self._reload_external)
+            if changed and self.store is self.storage:
+                # SQLite rows are already current; only the reminder queue has to catch up
+                self._reschedule_all()
+        if changed:
+            log_event("external_sync", store_version=self.store.version)
+        return changed
+    
+    def _apply_external(self, entries: List[Tuple[str, Dict]]):
+        for op, record in entries:
+            if op == 'delete':
+                self.store.remove(record['id'])
+                self.reminder_queue.cancel(record['id'])
+            else:
+                task = Task.from_dict(record)
+                self.store.add(task)
+                self._schedule_reminders(task)
+    
+    def _reload_external(self, records: Iterable[Dict]):
+        """Bring the store in line with a full set of records, touching only tasks that differ"""
+        incoming = {record['id']: record for record in records}
+        current = {record['id']: record for record in self.store.records()}
+        for task_id in current.keys() - incoming.keys():
+            self.store.remove(task_id)
+            self.reminder_queue.cancel(task_id)
+        for task_id, record in incoming.items():
+            if current.get(task_id) == record:
+                continue
+            if task_id not in current and record.get('status') == COMPLETED:
+                self.store.defer(record)
+            else:
+                self._apply_external([("update", record)])
+    
+    def _reschedule_all(self):
+        self.reminder_queue.clear()
+        for task in self.store.pending():
+            self._schedule_reminders(task)
+        if self.running:
+            self._schedule_archive()
+    
+    def _schedule_archive(self):
+        # Only the worker archives, so with several instances only the leader does
+        if self.archive_after_days:
+            self.reminder_queue.schedule(ARCHIVE_JOB, "archive", self._next_archive_ts)
+    
+    def _next_auto_reminder(self, task: Task) -> Optional[float]:
+        """Epoch time the next auto-reminder for a task should fire, or None if it gets no more"""
+        if task.due_ts is None or task.due_ts < time.time():
+            return None
+        fire_at = task.due_ts - AUTO_REMINDER_MINUTES * 60
+        if task.last_reminder_ts is not None:
+            fire_at = max(fire_at, task.last_reminder_ts + AUTO_REMINDER_REPEAT_MINUTES * 60)
+        if fire_at > task.due_ts:
+            return None
+        return fire_at
+    
+    def _schedule_reminders(self, task: Task):
+        """(Re)schedule the auto and manual reminders of a task in the reminder queue"""
+        if task.status != PENDING:
+            self.reminder_queue.cancel(task.id)
+            return
+        
+        # A reminder on its way to the sinks is rescheduled once it has been recorded as sent
+        if (task.id, "auto") not in self._in_flight:
+            next_auto = self._next_auto_reminder(task)
+            if next_auto is not None:
+                self.reminder_queue.schedule(task.id, "auto", next_auto)
+            else:
+                self.reminder_queue.cancel(task.id, "auto")
+        
+        if (task.id, "manual") not in self._in_flight:
+            if task.manual_reminder_ts is not None and not task.manual_reminder_sent:
+                self.reminder_queue.schedule(task.id, "manual", task.manual_reminder_ts)
+            else:
+                self.reminder_queue.cancel(task.id, "manual")
+        
+        # A series moves on by itself once its next occurrence starts
+        rollover_at = None
+        if task.recurrence:
+            try:
+                rollover_at = self._rollover_at(task)
+            except Exception as e:
+                # A rule saved before it was validated must not stop the service from starting
+                record_error("recurrence", e)
+                print(f"Error scheduling the next occurrence of {task.title}: {e}")
+        if rollover_at is not None:
+            self.reminder_queue.schedule(task.id, "rollover", rollover_at)
+        else:
+            self.reminder_queue.cancel(task.id, "rollover")
+    
+    @profiled
+    def _fire_reminder(self, task_id: str, kind: str, fire_at: Optional[float] = None):
+        """Send a reminder popped from the queue if the task still qualifies for it"""
+        if kind == "archive":
+            self.archive_completed()
+            self._next_archive_ts = time.time() + ARCHIVE_INTERVAL_SECONDS
+            self._schedule_archive()
+            return
+        
+        task = self.store.get(task_id)
+        if task is None or task.status != PENDING:
+            return
+        
+        if kind == "rollover":
+            self._roll_over(task_id)
+            return
+        
+        if kind == "manual":
+            if not task.manual_reminder_sent and self.send_reminder(task, "manual"):
+                self._record_lag(task_id, kind, fire_at)
+            return
+        
+        # The deadline may have been missed while the service was stopped
+        seconds_until_due = task.due_ts - time.time()
+        if 0 <= seconds_until_due <= AUTO_REMINDER_MINUTES * 60:
+            if self.send_reminder(task, "auto"):
+                self._record_lag(task_id, kind, fire_at)
+        else:
+            self._schedule_reminders(task)
+    
+    def _record_lag(self, task_id: str, kind: str, fire_at: Optional[float]):
+        if fire_at is None:
+            return
+        lag = max(0.0, time.time() - fire_at)
+        REMINDER_LAG.observe(lag, kind=kind)
+        log_event("reminder_fired", task_id=task_id, kind=kind, lag_seconds=round(lag, 6))
+    
+    def _reminder_worker(self):
+        """Background worker that sleeps until the next reminder deadline and sends it"""
+        while self.running:
+            try:
+                due = self.reminder_queue.wait_due()
+                start = time.perf_counter()
+                for task_id, kind, fire_at in due:
+                    if not self.running:
+                        break
+                    self._fire_reminder(task_id, kind, fire_at)
+                if due:
+                    WORKER_LOOP_SECONDS.observe(time.perf_counter() - start)
+                
+            except Exception as e:
+                record_error("worker", e)
+                print(f"Error in reminder worker: {e}")
@@ -0,0 +1,135 @@
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, Tuple
+
+import recurrence
+from task_model import PRIORITIES
+
+# Keep only this many error messages; the failed count covers the rest
+MAX_REPORTED_ERRORS = 100
+
+
+def iter_rows(path: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line_number, row) from a .csv or .jsonl file one row at a time.
+
+    A malformed JSONL line is yielded as its decode error so it gets reported like any other bad row.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    # utf-8-sig drops the byte-order mark Excel puts before the header
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        if extension == '.csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        elif extension in ('.jsonl', '.ndjson'):
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = e
+                yield line_number, row
+        else:
+            raise ValueError(f"Unsupported import format: {extension!r} (use .csv or .jsonl)")
+
+
+def _text(row: Dict, field: str, default: str = '') -> str:
+    """A text field of a row, stripped; `default` when it is missing or empty"""
+    value = row.get(field)
+    if value is None or value == '':
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"{field} {value!r} is not text")
+    return value.strip() or default
+
+
+def _whole_number(row: Dict, field: str) -> int:
+    """A non-negative whole-number field of a row, 0 when missing"""
+    value = row.get(field)
+    if value is None or value == '':
+        return 0
+    number = None
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        number = int(value)
+    elif isinstance(value, float) and value.is_integer():
+        number = int(value)
+    elif isinstance(value, int) and not isinstance(value, bool):
+        number = value
+    if number is None:
+        # 1.5 is rejected rather than truncated
+        raise ValueError(f"{field} {value!r} is not a whole number")
+    if number < 0:
+        raise ValueError(f"{field} cannot be negative")
+    return number
+
+
+def validate_row(row) -> Dict:
+    """Turn an import row into create_task arguments, raising ValueError if it is invalid"""
+    if isinstance(row, Exception):
+        raise ValueError(f"invalid JSON: {row}")
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+
+    # JSONL values can be of any type; each field is checked before it is used
+    title = _text(row, 'title')
+    if not title:
+        raise ValueError("title is required")
+
+    due_value = _text(row, 'due_date')
+    if not due_value:
+        raise ValueError("due_date is required")
+    try:
+        due_date = datetime.fromisoformat(due_value)
+    except ValueError:
+        raise ValueError(f"due_date {due_value!r} is not an ISO date/time")
+
+    priority = _text(row, 'priority', 'Medium')
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority {priority!r} is not one of {', '.join(PRIORITIES)}")
+
+    manual_reminder_minutes = _whole_number(row, 'manual_reminder_minutes')
+
+    recurrence_rule = _text(row, 'recurrence') or None
+    if recurrence_rule:
+        recurrence.parse(recurrence_rule)
+
+    return {
+        'title': title,
+        'description': _text(row, 'description'),
+        'due_date': due_date,
+        'priority': priority,
+        'category': _text(row, 'category', 'General'),
+        'manual_reminder_minutes': manual_reminder_minutes,
+        'recurrence_rule': recurrence_rule,
+    }
+
+
+def import_tasks(agent, path: str, batch_size: int = 1000) -> Dict:
+    """Stream tasks from a CSV/JSONL file into `agent`, validating each row and creating them in batches.
+
+    Only one batch is held in memory at a time. Invalid rows are skipped and reported.
+    Columns/keys: title, due_date (ISO), and optionally description, priority,
+    category, manual_reminder_minutes and recurrence (see recurrence.py).
+    """
+    imported = failed = 0
+    errors = []
+    batch = []
+    for line_number, row in iter_rows(path):
+        try:
+            batch.append(validate_row(row))
+        except ValueError as e:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"line {line_number}: {e}")
+            continue
+        if len(batch) >= batch_size:
+            imported += len(agent.create_tasks(batch))
+            batch = []
+    if batch:
+        imported += len(agent.create_tasks(batch))
+
+    print(f"📥 Imported {imported} tasks from {path} ({failed} rows rejected)")
+    return {'imported': imported, 'failed': failed, 'errors': errors}
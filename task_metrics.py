@@ -0,0 +1,305 @@
+"""In-process metrics for the reminder service, served in the Prometheus text format.
+
+    TASK_METRICS_PORT=9464   serve http://127.0.0.1:9464/metrics
+    TASK_EVENT_LOG=events.jsonl   write structured JSON events ("-" for stderr)
+    TASK_PROFILE=1   time every @profiled function into task_function_seconds
+"""
+import bisect
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+DURATION_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labels), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """A value that is either set directly or read from a callback at scrape time"""
+
+    def __init__(self, name: str, help: str, function: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help
+        self.function = function
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = value
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        self.function = function
+
+    def value(self) -> float:
+        if self.function is None:
+            return self._value
+        try:
+            value = self.function()
+        except Exception:
+            return float("nan")
+        return float("nan") if value is None else value
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge",
+                f"{self.name} {_format_value(self.value())}"]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DURATION_BUCKETS,
+                 labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.labels = tuple(labels)
+        # label values -> (per-bucket counts with a final +Inf slot, sum, count)
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(str(labels.get(name, "")) for name in self.labels))
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = 'le="' + _format_value(bound) + '"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms, rendered together for a scrape"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(name, lambda: Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, function: Optional[Callable[[], float]] = None) -> Gauge:
+        gauge = self._register(name, lambda: Gauge(name, help))
+        if function is not None:
+            gauge.set_function(function)
+        return gauge
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = DURATION_BUCKETS,
+                  labels: Sequence[str] = ()) -> Histogram:
+        return self._register(name, lambda: Histogram(name, help, buckets, labels))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+
+METRICS = MetricsRegistry()
+
+REMINDER_LAG = METRICS.histogram(
+    "task_reminder_lag_seconds", "Delay between a reminder's scheduled time and when it fired",
+    LATENCY_BUCKETS, labels=("kind",))
+REMINDERS_SENT = METRICS.counter("task_reminders_sent_total", "Reminders sent", labels=("kind",))
+SAVE_SECONDS = METRICS.histogram(
+    "task_save_seconds", "Time spent writing tasks to storage", labels=("mode",))
+SAVE_BYTES = METRICS.counter("task_save_bytes_total", "Bytes written to task storage", labels=("mode",))
+LOAD_SECONDS = METRICS.histogram("task_load_seconds", "Time spent loading tasks at startup", labels=("mode",))
+LOAD_BYTES = METRICS.counter("task_load_bytes_total", "Bytes of task storage read at startup", labels=("mode",))
+WORKER_LOOP_SECONDS = METRICS.histogram(
+    "task_worker_loop_seconds", "Time the reminder worker spent handling one batch of due reminders")
+ERRORS = METRICS.counter("task_errors_total", "Errors caught by the task service", labels=("where",))
+FUNCTION_SECONDS = METRICS.histogram(
+    "task_function_seconds", "Call durations of @profiled functions (TASK_PROFILE=1)", labels=("function",))
+
+
+def observe_save(mode: str, seconds: float, nbytes: int):
+    SAVE_SECONDS.observe(seconds, mode=mode)
+    SAVE_BYTES.inc(nbytes, mode=mode)
+    log_event("save", mode=mode, seconds=round(seconds, 6), bytes=nbytes)
+
+
+def record_error(where: str, error: BaseException):
+    ERRORS.inc(where=where)
+    log_event("error", where=where, error=repr(error))
+
+
+# Structured event log
+
+EVENT_LOGGER = logging.getLogger("task_scheduler.events")
+EVENT_LOGGER.addHandler(logging.NullHandler())
+EVENT_LOGGER.propagate = False
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {'ts': round(record.created, 6), 'event': record.getMessage()}
+        entry.update(getattr(record, 'fields', {}))
+        return json.dumps(entry, default=str)
+
+
+def log_event(event: str, **fields):
+    """Emit one structured event; free when no event log is configured"""
+    if EVENT_LOGGER.isEnabledFor(logging.INFO):
+        EVENT_LOGGER.info(event, extra={'fields': fields})
+
+
+def configure_event_log(path: Optional[str]):
+    """Write events as JSON lines to `path` ("-" for stderr); None leaves the log off"""
+    if not path:
+        return
+    handler = logging.StreamHandler(sys.stderr) if path == "-" else logging.FileHandler(path)
+    handler.setFormatter(JsonLineFormatter())
+    EVENT_LOGGER.addHandler(handler)
+    EVENT_LOGGER.setLevel(logging.INFO)
+
+
+# Profiling hooks
+
+_profiling = os.environ.get("TASK_PROFILE") == "1"
+
+
+def enable_profiling(enabled: bool = True):
+    global _profiling
+    _profiling = enabled
+
+
+def profiled(func):
+    """Record the wrapped function's call durations in task_function_seconds while profiling is on"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _profiling:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            FUNCTION_SECONDS.observe(time.perf_counter() - start, function=name)
+    return wrapper
+
+
+# HTTP endpoint
+
+class MetricsServer:
+    """Serves METRICS at /metrics over HTTP, on localhost by default"""
+
+    def __init__(self, port: int = 9464, host: str = "127.0.0.1", registry: MetricsRegistry = METRICS):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._httpd.server_address[1]
+        self.url = f"http://{host}:{self.port}/metrics"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True)
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def start_from_env() -> Optional[MetricsServer]:
+    """Configure the event log and start the metrics endpoint as TASK_EVENT_LOG/TASK_METRICS_PORT ask"""
+    configure_event_log(os.environ.get("TASK_EVENT_LOG"))
+    port = os.environ.get("TASK_METRICS_PORT")
+    if not port:
+        return None
+    try:
+        server = MetricsServer(int(port)).start()
+    except Exception as e:
+        print(f"Could not start metrics endpoint: {e}")
+        return None
+    print(f"📈 Metrics at {server.url}")
+    return server
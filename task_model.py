@@ -0,0 +1,193 @@
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+PENDING = 'pending'
+COMPLETED = 'completed'
+PRIORITIES = ('Low', 'Medium', 'High', 'Urgent')
+CATEGORIES = ('Work', 'Personal', 'Study', 'Health', 'Other')
+
+
+def _to_ts(value) -> Optional[float]:
+    if value is None or isinstance(value, float):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp() if value else None
+    return float(value)
+
+
+def _to_datetime(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts) if ts is not None else None
+
+
+def _to_iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+
+def _iso(value) -> Optional[str]:
+    # Lazily parsed fields may still hold the ISO string they were loaded with
+    return value if value.__class__ is str else _to_iso(value)
+
+
+class Task:
+    """A task with slotted fields, interned enum-like strings and epoch-second timestamps.
+
+    The `*_ts` attributes hold the timestamps; the datetime properties (due_date, created_at, ...)
+    convert on access and match the field names of the JSON format. Tasks loaded with
+    from_dict() keep created/completed/last-reminder times as ISO strings until first read,
+    since most of them are never looked at.
+
+    A task with a `recurrence` rule is a whole series: it stays pending, due_date is its
+    current occurrence, and completing or missing that occurrence moves it to the next one.
+    """
+
+    __slots__ = ('id', 'title', 'description', 'priority', 'category', 'status',
+                 'due_ts', 'manual_reminder_ts', '_created', '_completed', '_last_reminder',
+                 'reminders_sent', 'manual_reminder_sent',
+                 'recurrence', 'completed_occurrences', 'missed_occurrences')
+
+    def __init__(self, id: str, title: str, description: str = "", due_date=None,
+                 priority: str = "Medium", category: str = "General", status: str = PENDING,
+                 created_at=None, completed_at=None, reminders_sent: int = 0,
+                 last_reminder_sent=None, manual_reminder_time=None,
+                 manual_reminder_sent: bool = False, recurrence: Optional[str] = None,
+                 completed_occurrences: int = 0, missed_occurrences: int = 0):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.priority = sys.intern(priority)
+        self.category = sys.intern(category)
+        self.status = sys.intern(status)
+        self.due_ts = _to_ts(due_date)
+        self.created_ts = _to_ts(created_at)
+        self.completed_ts = _to_ts(completed_at)
+        self.last_reminder_ts = _to_ts(last_reminder_sent)
+        self.manual_reminder_ts = _to_ts(manual_reminder_time)
+        self.reminders_sent = reminders_sent
+        self.manual_reminder_sent = manual_reminder_sent
+        self.recurrence = recurrence
+        self.completed_occurrences = completed_occurrences
+        self.missed_occurrences = missed_occurrences
+
+    def copy(self) -> "Task":
+        clone = Task.__new__(Task)
+        for slot in Task.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, title={self.title!r}, status={self.status!r})"
+
+    @property
+    def created_ts(self) -> Optional[float]:
+        value = self._created
+        if value.__class__ is str:
+            value = self._created = _to_ts(value)
+        return value
+
+    @created_ts.setter
+    def created_ts(self, value):
+        self._created = value
+
+    @property
+    def completed_ts(self) -> Optional[float]:
+        value = self._completed
+        if value.__class__ is str:
+            value = self._completed = _to_ts(value)
+        return value
+
+    @completed_ts.setter
+    def completed_ts(self, value):
+        self._completed = value
+
+    @property
+    def last_reminder_ts(self) -> Optional[float]:
+        value = self._last_reminder
+        if value.__class__ is str:
+            value = self._last_reminder = _to_ts(value)
+        return value
+
+    @last_reminder_ts.setter
+    def last_reminder_ts(self, value):
+        self._last_reminder = value
+
+    @property
+    def due_date(self) -> Optional[datetime]:
+        return _to_datetime(self.due_ts)
+
+    @due_date.setter
+    def due_date(self, value):
+        self.due_ts = _to_ts(value)
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return _to_datetime(self.created_ts)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        return _to_datetime(self.completed_ts)
+
+    @completed_at.setter
+    def completed_at(self, value):
+        self.completed_ts = _to_ts(value)
+
+    @property
+    def last_reminder_sent(self) -> Optional[datetime]:
+        return _to_datetime(self.last_reminder_ts)
+
+    @last_reminder_sent.setter
+    def last_reminder_sent(self, value):
+        self.last_reminder_ts = _to_ts(value)
+
+    @property
+    def manual_reminder_time(self) -> Optional[datetime]:
+        return _to_datetime(self.manual_reminder_ts)
+
+    def to_dict(self) -> Dict:
+        """JSON record in the tasks.json format (timestamps as ISO strings)"""
+        record = {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'due_date': _to_iso(self.due_ts),
+            'priority': self.priority,
+            'category': self.category,
+            'status': self.status,
+            'created_at': _iso(self._created),
+            'completed_at': _iso(self._completed),
+            'reminders_sent': self.reminders_sent,
+            'last_reminder_sent': _iso(self._last_reminder),
+            'manual_reminder_time': _to_iso(self.manual_reminder_ts),
+            'manual_reminder_sent': self.manual_reminder_sent,
+        }
+        # Series fields are left out of one-shot records, which keep their original shape
+        if self.recurrence:
+            record['recurrence'] = self.recurrence
+            record['completed_occurrences'] = self.completed_occurrences
+            record['missed_occurrences'] = self.missed_occurrences
+        return record
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> "Task":
+        """Build a task from a tasks.json record"""
+        task = cls.__new__(cls)
+        task.id = record['id']
+        task.title = record['title']
+        task.description = record.get('description') or ""
+        task.priority = sys.intern(record.get('priority', "Medium"))
+        task.category = sys.intern(record.get('category', "General"))
+        task.status = sys.intern(record.get('status', PENDING))
+        # Due and manual reminder times feed the indexes and the scheduler, so parse them now
+        task.due_ts = _to_ts(record.get('due_date'))
+        task.manual_reminder_ts = _to_ts(record.get('manual_reminder_time'))
+        task._created = record.get('created_at') or None
+        task._completed = record.get('completed_at') or None
+        task._last_reminder = record.get('last_reminder_sent') or None
+        task.reminders_sent = record.get('reminders_sent', 0)
+        task.manual_reminder_sent = record.get('manual_reminder_sent', False)
+        task.recurrence = record.get('recurrence') or None
+        task.completed_occurrences = record.get('completed_occurrences', 0)
+        task.missed_occurrences = record.get('missed_occurrences', 0)
+        return task
@@ -0,0 +1,183 @@
+"""In-memory full-text index over task titles, descriptions and categories.
+
+Each word maps to the tasks containing it and a field weight (a word in the title counts
+for more than one in the description). The sorted vocabulary turns a prefix into a bisect
+range, so "rep" finds "report" and "repair" without scanning tasks. The index follows the
+store's change log like LiveTaskList: a query first applies what changed since the last
+one, and only rebuilds when the log no longer reaches back.
+"""
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from task_model import PENDING
+
+WORD = re.compile(r"\w+")
+# A word in the title counts three times one in the description
+TITLE_WEIGHT, CATEGORY_WEIGHT, DESCRIPTION_WEIGHT = 3.0, 2.0, 1.0
+# A prefix match scores this fraction of an exact one; shorter query terms only match exactly
+PREFIX_FACTOR = 0.5
+MIN_PREFIX = 2
+# Checking a candidate's own words costs about this many posting entries
+CANDIDATE_COST = 8
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of `text`"""
+    return WORD.findall(text.casefold()) if text else []
+
+
+def _weights(title: str, category: str, description: str) -> Dict[str, float]:
+    """Word -> summed field weight for one task"""
+    weights: Dict[str, float] = {}
+    for text, weight in ((title, TITLE_WEIGHT), (category, CATEGORY_WEIGHT), (description, DESCRIPTION_WEIGHT)):
+        for word in tokenize(text):
+            weights[word] = weights.get(word, 0.0) + weight
+    return weights
+
+
+class SearchIndex:
+    """Inverted index of the store's tasks, answering ranked prefix queries"""
+
+    def __init__(self):
+        self.version = -1
+        self._lock = threading.Lock()
+        # word -> {task_id: weight}, the vocabulary kept sorted for prefix ranges,
+        # and each task's status and word weights, for scoring candidates and removal
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._docs: Dict[str, Tuple[str, Dict[str, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def refresh(self, store) -> bool:
+        """Catch up with the store; returns True if anything was reindexed"""
+        with self._lock:
+            delta = store.delta_since(self.version) if self.version >= 0 else None
+            if delta is None:
+                self._rebuild(store)
+                return True
+            for task_id in delta.deleted:
+                self._remove(task_id)
+            for task in delta.created + delta.updated:
+                self._remove(task.id)
+                self._add(task.id, task.status, _weights(task.title, task.category, task.description))
+            self.version = delta.version
+            return bool(delta.created or delta.updated or delta.deleted)
+
+    def search(self, query: str, limit: int = 20, status: Optional[str] = None) -> List[Tuple[str, float]]:
+        """(task_id, score) of the best `limit` tasks containing every query term, best first.
+
+        Each term matches words equal to it or, from MIN_PREFIX characters on, starting
+        with it. Scores add up term weight times inverse document frequency per term.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            expanded = [self._expand(term) for term in terms]
+            if not all(expanded):
+                return []
+            # Start from the rarest term; each further term either walks its postings or,
+            # when fewer candidates are left than that, checks the candidates' own words
+            sized = sorted(((sum(len(self._postings[word]) for word in factors), factors) for factors in expanded),
+                           key=itemgetter(0))
+            scores = self._score_postings(sized[0][1], status)
+            for size, factors in sized[1:]:
+                if len(scores) * CANDIDATE_COST < size:
+                    scores = self._score_candidates(scores, factors)
+                else:
+                    extra = self._score_postings(factors, None, scores)
+                    scores = {task_id: score + scores[task_id] for task_id, score in extra.items()}
+                if not scores:
+                    return []
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Indexed words matching a query term, each with the factor its weight is scored by"""
+        total = len(self._docs)
+        words = [term] if term in self._postings else []
+        if len(term) >= MIN_PREFIX:
+            vocabulary = self._vocabulary
+            index = bisect_left(vocabulary, term)
+            while index < len(vocabulary) and vocabulary[index].startswith(term):
+                if vocabulary[index] != term:
+                    words.append(vocabulary[index])
+                index += 1
+        # Rare words weigh more (inverse document frequency); prefix matches weigh less
+        return {word: math.log(1 + total / len(self._postings[word])) * (1.0 if word == term else PREFIX_FACTOR)
+                for word in words}
+
+    def _score_postings(self, factors: Dict[str, float], status: Optional[str],
+                        among: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Best score per task for one expanded term, read from the postings (of `among` only, if given)"""
+        if len(factors) == 1:
+            # One matching word: no per-task maximum to keep, so a comprehension will do
+            word, factor = next(iter(factors.items()))
+            scores = {task_id: weight * factor for task_id, weight in self._postings[word].items()
+                      if among is None or task_id in among}
+        else:
+            scores = self._best_scores(factors, among)
+        if status is not None:
+            docs = self._docs
+            scores = {task_id: score for task_id, score in scores.items() if docs[task_id][0] == status}
+        return scores
+
+    def _best_scores(self, factors: Dict[str, float], among: Optional[Dict[str, float]]) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        for word, factor in factors.items():
+            for task_id, weight in self._postings[word].items():
+                score = weight * factor
+                if score > scores.get(task_id, 0.0) and (among is None or task_id in among):
+                    scores[task_id] = score
+        return scores
+
+    def _score_candidates(self, scores: Dict[str, float], factors: Dict[str, float]) -> Dict[str, float]:
+        """Add one more term's score to the candidates that contain it and drop the rest"""
+        matched: Dict[str, float] = {}
+        for task_id, score in scores.items():
+            best = 0.0
+            for word, weight in self._docs[task_id][1].items():
+                factor = factors.get(word)
+                if factor is not None and weight * factor > best:
+                    best = weight * factor
+            if best:
+                matched[task_id] = score + best
+        return matched
+
+    def _rebuild(self, store):
+        # Changes landing while records are read are applied again on the next refresh;
+        # re-adding a task is harmless
+        version = store.version
+        self._postings, self._docs = {}, {}
+        for record in store.records():
+            weights = _weights(record.get('title', ""), record.get('category', ""), record.get('description', ""))
+            self._add(record['id'], record.get('status', PENDING), weights, sort=False)
+        self._vocabulary = sorted(self._postings)
+        self.version = version
+
+    def _add(self, task_id: str, status: str, weights: Dict[str, float], sort: bool = True):
+        self._docs[task_id] = (status, weights)
+        for word, weight in weights.items():
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                if sort:
+                    insort(self._vocabulary, word)
+            postings[task_id] = weight
+
+    def _remove(self, task_id: str):
+        doc = self._docs.pop(task_id, None)
+        if doc is None:
+            return
+        for word in doc[1]:
+            postings = self._postings[word]
+            del postings[task_id]
+            if not postings:
+                del self._postings[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
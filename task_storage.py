@@ -0,0 +1,578 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from task_coordination import INSTANCE_ID, FileLock, file_token
+from task_metrics import observe_save, record_error
+
+Snapshot = Callable[[], Iterable[Dict]]
+# Callbacks for sync_external(): apply (op, record) changes, or replace everything with these records
+ApplyChanges = Callable[[List[Tuple[str, Dict]]], None]
+ReloadAll = Callable[[Iterable[Dict]], None]
+
+
+class StaleWriteError(Exception):
+    """A full save was refused because another instance changed the shared files since our last sync"""
+
+def write_json_atomic(path: str, data, indent: Optional[int] = None) -> int:
+    """Write JSON to a temp file next to `path`, fsync it and rename it over `path`; returns the size"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        if indent is None:
+            json.dump(data, f, separators=(',', ':'))
+        else:
+            json.dump(data, f, indent=indent)
+        f.flush()
+        size = f.tell()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return size
+
+
+class JsonTaskStorage:
+    """The original storage mode: every mutation rewrites the whole tasks file.
+
+    With `shared` set, several processes may use the file. Mutations are merged into the
+    file as it is on disk, under a cross-process lock. A full save() is refused with
+    StaleWriteError when another instance wrote since this one last loaded.
+    """
+
+    def __init__(self, path: str, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(f"{path}.lock") if shared else None
+        # File identity after our last load or write, and whether others wrote in between
+        self._token = None
+        self._stale = False
+        # Left behind when the file was last used in journal mode
+        self._leftover_journals = (f"{path}.journal.1", f"{path}.journal")
+
+    def load(self) -> Iterator[Dict]:
+        """Yield task records, streaming straight from the file unless a journal needs merging"""
+        self._token = file_token(self.path)
+        if not any(os.path.exists(journal_path) for journal_path in self._leftover_journals):
+            if os.path.exists(self.path):
+                yield from iter_json_array(self.path)
+            return
+        tasks = _load_snapshot(self.path)
+        for journal_path in self._leftover_journals:
+            _replay(journal_path, tasks)
+        yield from tasks.values()
+
+    def save(self, records: Iterable[Dict]):
+        records = list(records)
+        with self._lock:
+            if not self.shared:
+                self._write(records)
+                return
+            with self._file_lock:
+                if self._stale or file_token(self.path) != self._token:
+                    raise StaleWriteError(f"{self.path} was changed by another instance")
+                self._write(records)
+
+    def append(self, op: str, record: Dict, snapshot: Snapshot):
+        self.append_many([(op, record)], snapshot)
+
+    def append_many(self, entries: List[Tuple[str, Dict]], snapshot: Snapshot):
+        """Persist mutations; whole-file storage can only do that by saving everything"""
+        if not self.shared:
+            self.save(snapshot())
+            return
+        # Merge into what is on disk now rather than overwrite it with our copy
+        with self._lock, self._file_lock:
+            if file_token(self.path) != self._token:
+                self._stale = True
+            tasks = _load_snapshot(self.path)
+            for journal_path in self._leftover_journals:
+                _replay(journal_path, tasks)
+            _apply(entries, tasks)
+            self._write(list(tasks.values()))
+
+    def sync_external(self, apply: ApplyChanges, reload: ReloadAll) -> bool:
+        """Reload the file if another instance wrote it since our last load or write"""
+        if not self.shared:
+            return False
+        with self._lock:
+            if not self._stale and file_token(self.path) == self._token:
+                return False
+            self._stale = False
+            with self._file_lock:
+                records = list(self.load())
+            reload(records)
+            return True
+
+    def _write(self, records: List[Dict]):
+        start = time.perf_counter()
+        size = write_json_atomic(self.path, records, indent=2)
+        for journal_path in self._leftover_journals:
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+        self._token = file_token(self.path)
+        observe_save("json", time.perf_counter() - start, size)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class JournalTaskStorage:
+    """Snapshot file plus an append-only journal of mutations, compacted in the background.
+
+    Each mutation appends one compact JSON line, either {"op": ..., "task": record} or
+    {"op": "delete", "id": ...}. Once the journal holds more than `compact_threshold`
+    records it is rotated to `<journal>.1`, and a background thread replays the old
+    snapshot plus the rotated journal into a new snapshot written with an atomic rename.
+    The live store is never touched, so compaction needs no coordination with writers.
+
+    With `shared` set, several processes append to the same journal under a cross-process
+    lock, each line tagged with the writer's instance id. sync_external() tails the journal
+    for other instances' lines. Compaction then runs in the writer under the lock, and any
+    instance that finds the snapshot replaced reloads it.
+    """
+
+    def __init__(self, path: str, compact_threshold: int = 1000, fsync: bool = False, shared: bool = False):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.rotated_path = f"{path}.journal.1"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.shared = shared
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(f"{path}.lock") if shared else None
+        self._journal = None
+        self._journal_records = 0
+        self._compactor: Optional[threading.Thread] = None
+        # Shared mode: the snapshot we last loaded, and how far into the journal we have read
+        self._snapshot_token = None
+        self._tail: Tuple[Optional[int], int] = (None, 0)
+
+    def load(self) -> List[Dict]:
+        if not self.shared:
+            return self._load()
+        with self._file_lock:
+            records = self._load()
+            self._snapshot_token = file_token(self.path)
+            journal = file_token(self.journal_path)
+            self._tail = (journal[0], journal[1]) if journal else (None, 0)
+            return records
+
+    def _load(self) -> List[Dict]:
+        tasks = _load_snapshot(self.path)
+        # A rotated journal is only left behind when a compaction was interrupted
+        for journal_path in (self.rotated_path, self.journal_path):
+            count = _replay(journal_path, tasks)
+            if journal_path == self.journal_path:
+                self._journal_records = count
+        return list(tasks.values())
+
+    def save(self, records: Iterable[Dict]):
+        """Write a full snapshot and discard the journal"""
+        if self.shared:
+            with self._lock, self._file_lock:
+                if self._has_unseen_changes():
+                    raise StaleWriteError(f"{self.path} was changed by another instance")
+                self._save(records)
+                self._snapshot_token = file_token(self.path)
+                self._tail = (None, 0)
+            return
+        with self._lock:
+            # Compactions start from append() under this lock, so none can begin between the
+            # wait and the write; both would write the snapshot through the same temp file
+            self._wait_for_compaction()
+            self._save(records)
+
+    def _save(self, records: Iterable[Dict]):
+        with self._lock:
+            start = time.perf_counter()
+            size = write_json_atomic(self.path, list(records))
+            observe_save("journal_snapshot", time.perf_counter() - start, size)
+            self._close_journal()
+            for journal_path in (self.rotated_path, self.journal_path):
+                if os.path.exists(journal_path):
+                    os.remove(journal_path)
+            self._journal_records = 0
+
+    def append(self, op: str, record: Dict, snapshot: Snapshot = None):
+        self.append_many([(op, record)])
+
+    def append_many(self, entries: List[Tuple[str, Dict]], snapshot: Snapshot = None):
+        """Append (op, record) pairs to the journal with a single write"""
+        lines = []
+        for op, record in entries:
+            if op == 'delete':
+                entry = {'op': op, 'id': record['id']}
+            else:
+                entry = {'op': op, 'task': record}
+            if self.shared:
+                entry['w'] = INSTANCE_ID
+            lines.append(json.dumps(entry, separators=(',', ':')))
+        if not lines:
+            return
+        data = '\n'.join(lines) + '\n'
+        if self.shared:
+            self._append_shared(data, len(lines))
+            return
+        with self._lock:
+            start = time.perf_counter()
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a')
+            self._journal.write(data)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            observe_save("journal", time.perf_counter() - start, len(data))
+            self._journal_records += len(lines)
+            if self._journal_records >= self.compact_threshold:
+                self._start_compaction()
+
+    def sync_external(self, apply: ApplyChanges, reload: ReloadAll) -> bool:
+        """Apply journal lines other instances appended since we last looked.
+
+        Falls back to reloading everything when the snapshot was compacted meanwhile.
+        """
+        if not self.shared:
+            return False
+        with self._lock, self._file_lock:
+            if file_token(self.path) != self._snapshot_token:
+                reload(self.load())
+                return True
+            journal = file_token(self.journal_path)
+            inode, offset = self._tail
+            if journal is None or (journal[0], journal[1]) == (inode, offset):
+                return False
+            if journal[0] != inode:
+                offset = 0
+            entries = []
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            for line in data.splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('w') == INSTANCE_ID:
+                    continue
+                if entry['op'] == 'delete':
+                    entries.append(('delete', {'id': entry['id']}))
+                else:
+                    entries.append((entry['op'], entry['task']))
+            self._tail = (journal[0], offset + len(data))
+            if entries:
+                apply(entries)
+            return bool(entries)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            self._wait_for_compaction()
+            self._close_journal()
+
+    def _append_shared(self, data: str, count: int):
+        # Other instances rotate and remove the journal, so it is reopened for every batch
+        with self._lock, self._file_lock:
+            start = time.perf_counter()
+            caught_up = not self._has_unseen_changes()
+            with open(self.journal_path, 'a') as journal:
+                journal.write(data)
+                journal.flush()
+                if self.fsync:
+                    os.fsync(journal.fileno())
+                end = journal.tell()
+            observe_save("journal", time.perf_counter() - start, len(data))
+            if caught_up:
+                # Nothing from other instances lies before our lines, so skip past them
+                self._tail = (os.stat(self.journal_path).st_ino, end)
+            self._journal_records += count
+            if self._journal_records >= self.compact_threshold:
+                self._compact_shared(caught_up)
+
+    def _compact_shared(self, caught_up: bool):
+        """Fold the journal into the snapshot in place; the file lock keeps other writers out"""
+        try:
+            start = time.perf_counter()
+            tasks = _load_snapshot(self.path)
+            for journal_path in (self.rotated_path, self.journal_path):
+                _replay(journal_path, tasks)
+            size = write_json_atomic(self.path, list(tasks.values()))
+            for journal_path in (self.rotated_path, self.journal_path):
+                if os.path.exists(journal_path):
+                    os.remove(journal_path)
+            self._journal_records = 0
+            observe_save("compaction", time.perf_counter() - start, size)
+            if caught_up:
+                self._snapshot_token = file_token(self.path)
+                self._tail = (None, 0)
+            # Otherwise the stale snapshot token makes the next sync reload, picking up
+            # what other instances had appended
+            print(f"🗜️ Compacted task journal into snapshot ({len(tasks)} tasks)")
+        except Exception as e:
+            record_error("compaction", e)
+            print(f"Error compacting task journal: {e}")
+
+    def _has_unseen_changes(self) -> bool:
+        """Whether the shared files hold writes we have not synced; the file lock is held"""
+        if file_token(self.path) != self._snapshot_token:
+            return True
+        journal = file_token(self.journal_path)
+        if journal is None:
+            return False
+        return (journal[0], journal[1]) != self._tail
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _start_compaction(self):
+        # Called with the lock held; one compaction at a time, the next append retries
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if os.path.exists(self.rotated_path):
+            return
+        self._close_journal()
+        os.replace(self.journal_path, self.rotated_path)
+        self._journal_records = 0
+        self._compactor = threading.Thread(target=self._compact, daemon=True)
+        self._compactor.start()
+
+    def _compact(self):
+        try:
+            start = time.perf_counter()
+            tasks = _load_snapshot(self.path)
+            _replay(self.rotated_path, tasks)
+            size = write_json_atomic(self.path, list(tasks.values()))
+            os.remove(self.rotated_path)
+            observe_save("compaction", time.perf_counter() - start, size)
+            print(f"🗜️ Compacted task journal into snapshot ({len(tasks)} tasks)")
+        except Exception as e:
+            record_error("compaction", e)
+            print(f"Error compacting task journal: {e}")
+
+    def _wait_for_compaction(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+
+class WriteBehindStorage:
+    """Buffers mutations and hands them to the wrapped storage from a background writer.
+
+    append() only queues the mutation and returns. The writer flushes at most once every
+    `interval` seconds, or as soon as `max_pending` mutations are queued, passing the whole
+    batch to one append_many() call: one file rewrite in json mode, one write in journal mode.
+    Pending mutations are flushed by flush(), close() and at interpreter exit.
+    """
+
+    def __init__(self, storage, interval: float = 1.0, max_pending: int = 500):
+        self.storage = storage
+        self.interval = interval
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: List[Tuple[str, Dict]] = []
+        self._snapshot: Optional[Snapshot] = None
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def load(self) -> Iterable[Dict]:
+        return self.storage.load()
+
+    def save(self, records: Iterable[Dict]):
+        with self._flush_lock:
+            self.storage.save(records)
+            # Queued mutations may be newer than `records`, so they are written after it rather
+            # than dropped; each carries the task's whole record, so replaying older ones is harmless
+            self._flush_pending()
+
+    def append(self, op: str, record: Dict, snapshot: Snapshot = None):
+        self.append_many([(op, record)], snapshot)
+
+    def append_many(self, entries: List[Tuple[str, Dict]], snapshot: Snapshot = None):
+        with self._cond:
+            self._pending.extend(entries)
+            if snapshot is not None:
+                self._snapshot = snapshot
+            self._cond.notify()
+
+    def sync_external(self, apply: ApplyChanges, reload: ReloadAll) -> bool:
+        """Pick up other instances' writes, then re-apply our own mutations that are still queued"""
+        with self._flush_lock:
+            with self._cond:
+                pending = list(self._pending)
+
+            def apply_then_pending(entries):
+                apply(entries)
+                if pending:
+                    apply(pending)
+
+            def reload_then_pending(records):
+                reload(records)
+                if pending:
+                    apply(pending)
+
+            return self.storage.sync_external(apply_then_pending, reload_then_pending)
+
+    def flush(self):
+        """Write everything queued so far to the wrapped storage before returning"""
+        with self._flush_lock:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        # Called with self._flush_lock held
+        with self._cond:
+            entries, self._pending = self._pending, []
+            snapshot = self._snapshot
+        if entries:
+            try:
+                self.storage.append_many(entries, snapshot)
+            except Exception:
+                with self._cond:
+                    self._pending[:0] = entries
+                raise
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        self.flush()
+        self.storage.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Debounce: let more mutations coalesce until the interval is up or the batch is full
+                deadline = self._last_flush + self.interval
+                while len(self._pending) < self.max_pending and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            try:
+                self.flush()
+            except Exception as e:
+                record_error("write_behind", e)
+                print(f"Error saving tasks: {e}")
+                time.sleep(self.interval)
+
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Yield the elements of a top-level JSON array one at a time, reading the file in chunks"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer:
+            return
+        if buffer[0] != '[':
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos = 1
+        while True:
+            # Skip separators, pulling in more data whenever the buffer runs out
+            while True:
+                pos = _SEPARATORS.match(buffer, pos).end()
+                if pos < len(buffer):
+                    break
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise ValueError(f"Unexpected end of {path}")
+                buffer, pos = chunk, 0
+            if buffer[pos] == ']':
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element straddles the chunk boundary
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield element
+            pos = end
+            if pos >= chunk_size:
+                buffer, pos = buffer[pos:], 0
+
+
+def _load_snapshot(path: str) -> Dict[str, Dict]:
+    if not os.path.exists(path):
+        return {}
+    return {record['id']: record for record in iter_json_array(path)}
+
+
+def _iter_journal(path: str) -> Iterator[Dict]:
+    if not os.path.exists(path):
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A torn last line from a crash mid-append; everything before it is intact
+                print(f"Skipping corrupt journal line in {path}")
+
+
+def _apply(entries: List[Tuple[str, Dict]], tasks: Dict[str, Dict]):
+    for op, record in entries:
+        if op == 'delete':
+            tasks.pop(record['id'], None)
+        else:
+            tasks[record['id']] = record
+
+
+def _replay(path: str, tasks: Dict[str, Dict]) -> int:
+    count = 0
+    for entry in _iter_journal(path):
+        if entry['op'] == 'delete':
+            tasks.pop(entry['id'], None)
+        else:
+            tasks[entry['task']['id']] = entry['task']
+        count += 1
+    return count
+
+
+STORAGE_MODES = {
+    'json': JsonTaskStorage,
+    'journal': JournalTaskStorage,
+}
+
+
+def open_storage(path: str, mode: str = 'json', write_behind_interval: Optional[float] = None,
+                 shared: bool = False):
+    """Create the storage backend for `mode` ('json' or 'journal'), optionally write-behind.
+
+    `shared` makes it safe for several processes to use the same files at once.
+    """
+    try:
+        storage_class = STORAGE_MODES[mode]
+    except KeyError:
+        raise ValueError(f"Unknown storage mode: {mode!r} (expected one of {sorted(STORAGE_MODES)})")
+    storage = storage_class(path, shared=shared)
+    if write_behind_interval is not None:
+        storage = WriteBehindStorage(storage, interval=write_behind_interval)
+    return storage
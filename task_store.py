@@ -0,0 +1,356 @@
+import threading
+from collections import deque
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from task_model import COMPLETED, PENDING, Task
+
+IndexKey = Tuple[float, str]
+
+# How many (version, task_id, existed) changes the store remembers for incremental readers
+CHANGE_LOG_LIMIT = 10000
+
+
+def _ts(value: Optional[float]) -> float:
+    return value if value is not None else float("inf")
+
+
+class StoreSnapshot(NamedTuple):
+    """Immutable view of the store at one version; safe to iterate while writers carry on"""
+    version: int
+    pending: Tuple[Task, ...]
+    completed: Tuple[Task, ...]
+
+
+class StoreDelta(NamedTuple):
+    """What changed between a reader's version and `version`: current tasks and removed ids"""
+    version: int
+    created: Tuple[Task, ...]
+    updated: Tuple[Task, ...]
+    deleted: Tuple[str, ...]
+
+
+def fold_changes(entries: Iterable[Tuple[int, str, bool]], version: int) -> Dict[str, bool]:
+    """For each task changed after `version`, whether it existed before its first change"""
+    existed: Dict[str, bool] = {}
+    for changed, task_id, before in entries:
+        if changed > version and task_id not in existed:
+            existed[task_id] = before
+    return existed
+
+
+def classify_changes(existed: Dict[str, bool], get) -> StoreDelta:
+    """Sort folded changes into created, updated and deleted using each task's current state"""
+    created, updated, deleted = [], [], []
+    for task_id, before in existed.items():
+        task = get(task_id)
+        if task is None:
+            if before:
+                deleted.append(task_id)
+        elif before:
+            updated.append(task)
+        else:
+            created.append(task)
+    return StoreDelta(0, tuple(created), tuple(updated), tuple(deleted))
+
+
+class TaskStore:
+    """In-memory task store with an id map, status partitions and sorted due-date indexes.
+
+    All access goes through one lock. Stored Task objects are never mutated in place:
+    modify() swaps in an edited copy, so a task or snapshot handed to a reader stays
+    consistent while the reminder thread keeps writing.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._lock = threading.RLock()
+        self.version = 0
+        self._by_id: Dict[str, Task] = {}
+        self._by_status: Dict[str, Dict[str, Task]] = {PENDING: {}, COMPLETED: {}}
+        # Pending tasks ordered by due date, and unsent manual reminders ordered by reminder time
+        self._due_index: List[IndexKey] = []
+        self._manual_index: List[IndexKey] = []
+        self._index_keys: Dict[str, Tuple[Optional[IndexKey], Optional[IndexKey]]] = {}
+        # Completed tasks' JSON records, turned into Task objects only when something asks for them
+        self._deferred: Dict[str, Dict] = {}
+        # Snapshot tuples, rebuilt only after their partition changed
+        self._pending_view: Optional[Tuple[Task, ...]] = None
+        self._completed_view: Optional[Tuple[Task, ...]] = None
+        self._changes = deque(maxlen=CHANGE_LOG_LIMIT)
+        self.load(tasks)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_id) + len(self._deferred)
+
+    def __iter__(self) -> Iterator[Task]:
+        with self._lock:
+            self._materialize()
+            return iter(list(self._by_id.values()))
+
+    def __contains__(self, task_id: str) -> bool:
+        with self._lock:
+            return task_id in self._by_id or task_id in self._deferred
+
+    def records(self) -> Iterator[Dict]:
+        """JSON records of every task; deferred tasks are passed through without being built"""
+        with self._lock:
+            tasks = list(self._by_id.values())
+            deferred = list(self._deferred.values())
+        for task in tasks:
+            yield task.to_dict()
+        yield from deferred
+
+    def contents(self) -> Tuple[List[Task], List[Dict]]:
+        """The built tasks and the deferred records, as they stand, without building any"""
+        with self._lock:
+            return list(self._by_id.values()), list(self._deferred.values())
+
+    def snapshot(self) -> StoreSnapshot:
+        """Pending (by due date) and completed tasks as of now, as immutable tuples"""
+        with self._lock:
+            return StoreSnapshot(self.version, self._pending_tuple(), self._completed_tuple())
+
+    def listing(self, status: str) -> Tuple[int, Tuple[Task, ...]]:
+        """One status's tasks and the version they were read at; only COMPLETED builds deferred ones"""
+        with self._lock:
+            tasks = self._pending_tuple() if status == PENDING else self._completed_tuple()
+            return self.version, tasks
+
+    def categories(self) -> Set[str]:
+        """Every category in use, read from deferred records without building them"""
+        with self._lock:
+            used = {task.category for task in self._by_id.values()}
+            used.update(record.get('category', "General") for record in self._deferred.values())
+            return used
+
+    def changes_since(self, version: int) -> Optional[List[str]]:
+        """Ids of tasks added, changed or removed after `version`, oldest first.
+
+        Returns None when the change log no longer reaches back that far; the caller
+        should then rebuild from a snapshot.
+        """
+        with self._lock:
+            if version == self.version:
+                return []
+            if not self._changes or self._changes[0][0] > version + 1:
+                return None
+            return list(dict.fromkeys(task_id for changed, task_id, _ in self._changes if changed > version))
+
+    def delta_since(self, version: int) -> Optional[StoreDelta]:
+        """Tasks created, updated and deleted after `version`, read under one lock.
+
+        None when the change log no longer reaches back that far, as for changes_since().
+        """
+        with self._lock:
+            if version == self.version:
+                return StoreDelta(version, (), (), ())
+            if not self._changes or self._changes[0][0] > version + 1:
+                return None
+            delta = classify_changes(fold_changes(self._changes, version), self.get)
+            return delta._replace(version=self.version)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        with self._lock:
+            task = self._by_id.get(task_id)
+            if task is None and task_id in self._deferred:
+                # Building the Task is not a change: no version bump, nothing in the change log
+                task = Task.from_dict(self._deferred.pop(task_id))
+                self._by_id[task.id] = task
+                self._by_status[COMPLETED][task.id] = task
+                self._index_keys[task.id] = (None, None)
+            return task
+
+    def load(self, tasks: Iterable[Task], deferred: Iterable[Dict] = ()):
+        """Replace the contents with `tasks` and the completed-task records `deferred`.
+
+        The indexes are sorted once instead of taking one insort per task, so loading
+        stays O(n log n). Incremental readers see a single change and rebuild.
+        """
+        with self._lock:
+            self._by_id = {}
+            self._by_status = {PENDING: {}, COMPLETED: {}}
+            self._index_keys = {}
+            self._deferred = {}
+            due_index, manual_index = [], []
+            for task in tasks:
+                self._by_id[task.id] = task
+                self._by_status.setdefault(task.status, {})[task.id] = task
+                due_key = manual_key = None
+                if task.status == PENDING:
+                    due_key = (_ts(task.due_ts), task.id)
+                    due_index.append(due_key)
+                    if task.manual_reminder_ts is not None and not task.manual_reminder_sent:
+                        manual_key = (_ts(task.manual_reminder_ts), task.id)
+                        manual_index.append(manual_key)
+                self._index_keys[task.id] = (due_key, manual_key)
+            for record in deferred:
+                self._deferred[record['id']] = record
+            due_index.sort()
+            manual_index.sort()
+            self._due_index, self._manual_index = due_index, manual_index
+            self._pending_view = self._completed_view = None
+            self.version += 1
+            # Nothing before the load can be replayed on top of it
+            self._changes.clear()
+
+    @contextmanager
+    def batch(self):
+        """Group several mutations so no reader sees the batch half-applied"""
+        with self._lock:
+            yield
+
+    def defer(self, record: Dict):
+        """Hold a completed task's record without building a Task until one is needed"""
+        with self._lock:
+            existed = record['id'] in self._by_id or record['id'] in self._deferred
+            self._deferred[record['id']] = record
+            self._touch(COMPLETED, record['id'], existed)
+
+    def add(self, task: Task):
+        with self._lock:
+            existed = self._deferred.pop(task.id, None) is not None
+            if task.id in self._by_id:
+                self._remove(task.id)
+            self._put(task, existed)
+
+    def update(self, task: Task):
+        """Store `task` in place of the current object with the same id and re-index it"""
+        with self._lock:
+            self._remove(task.id)
+            self._put(task)
+
+    def modify(self, task_id: str, **changes) -> Optional[Task]:
+        """Replace a task with a copy that has `changes` applied; returns the new task"""
+        with self._lock:
+            current = self.get(task_id)
+            if current is None:
+                return None
+            task = current.copy()
+            for attribute, value in changes.items():
+                setattr(task, attribute, value)
+            self.update(task)
+            return task
+
+    def remove(self, task_id: str) -> Optional[Task]:
+        with self._lock:
+            if task_id in self._deferred:
+                self._touch(COMPLETED, task_id, True)
+                return Task.from_dict(self._deferred.pop(task_id))
+            return self._remove(task_id)
+
+    def completed_before(self, cutoff: float) -> List[Dict]:
+        """Records of tasks completed before `cutoff`, without building Tasks for deferred ones"""
+        with self._lock:
+            records = [record for record in self._deferred.values()
+                       if record.get('completed_at')
+                       and datetime.fromisoformat(record['completed_at']).timestamp() < cutoff]
+            records.extend(task.to_dict() for task in self._by_status[COMPLETED].values()
+                           if task.completed_ts is not None and task.completed_ts < cutoff)
+            return records
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            count = len(self._by_status.get(status, ()))
+            if status == COMPLETED:
+                count += len(self._deferred)
+            return count
+
+    def pending(self) -> List[Task]:
+        """Pending tasks sorted by due date"""
+        with self._lock:
+            return list(self._pending_tuple())
+
+    def completed(self) -> List[Task]:
+        """Completed tasks in insertion order"""
+        with self._lock:
+            return list(self._completed_tuple())
+
+    def due_between(self, start: datetime, end: datetime) -> List[Task]:
+        """Pending tasks with start <= due_date <= end"""
+        with self._lock:
+            lo = bisect_left(self._due_index, (start.timestamp(), ""))
+            hi = bisect_right(self._due_index, (end.timestamp(), "\uffff"))
+            return [self._by_id[task_id] for _, task_id in self._due_index[lo:hi]]
+
+    def count_due_between(self, start: datetime, end: datetime) -> int:
+        with self._lock:
+            lo = bisect_left(self._due_index, (start.timestamp(), ""))
+            hi = bisect_right(self._due_index, (end.timestamp(), "\uffff"))
+            return max(0, hi - lo)
+
+    def manual_reminders_before(self, when: datetime) -> List[Task]:
+        """Pending tasks whose unsent manual reminder time is at or before `when`"""
+        with self._lock:
+            hi = bisect_right(self._manual_index, (when.timestamp(), "\uffff"))
+            return [self._by_id[task_id] for _, task_id in self._manual_index[:hi]]
+
+    # The helpers below expect the lock to be held
+
+    def _put(self, task: Task, existed: bool = False):
+        self._by_id[task.id] = task
+        self._by_status.setdefault(task.status, {})[task.id] = task
+        self._index(task)
+        self._touch(task.status, task.id, existed)
+
+    def _remove(self, task_id: str) -> Optional[Task]:
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            self._by_status.get(task.status, {}).pop(task_id, None)
+            self._unindex(task_id)
+            self._touch(task.status, task_id, True)
+        return task
+
+    def _pending_tuple(self) -> Tuple[Task, ...]:
+        if self._pending_view is None:
+            self._pending_view = tuple(self._by_id[task_id] for _, task_id in self._due_index)
+        return self._pending_view
+
+    def _completed_tuple(self) -> Tuple[Task, ...]:
+        if self._completed_view is None:
+            self._materialize()
+            self._completed_view = tuple(self._by_status[COMPLETED].values())
+        return self._completed_view
+
+    def _touch(self, status: str, task_id: str, existed: bool):
+        """Record a change; `existed` says whether the task was in the store just before it"""
+        self.version += 1
+        self._changes.append((self.version, task_id, existed))
+        if status == PENDING:
+            self._pending_view = None
+        elif status == COMPLETED:
+            self._completed_view = None
+
+    def _materialize(self):
+        if not self._deferred:
+            return
+        deferred, self._deferred = self._deferred, {}
+        # Loaded tasks predate anything completed in this session, so they go first
+        completed = self._by_status[COMPLETED]
+        self._by_status[COMPLETED] = {}
+        for record in deferred.values():
+            task = Task.from_dict(record)
+            self._by_id[task.id] = task
+            self._by_status[COMPLETED][task.id] = task
+            self._index_keys[task.id] = (None, None)
+        self._by_status[COMPLETED].update(completed)
+        self._completed_view = None
+
+    def _index(self, task: Task):
+        due_key = manual_key = None
+        if task.status == PENDING:
+            due_key = (_ts(task.due_ts), task.id)
+            insort(self._due_index, due_key)
+            if task.manual_reminder_ts is not None and not task.manual_reminder_sent:
+                manual_key = (_ts(task.manual_reminder_ts), task.id)
+                insort(self._manual_index, manual_key)
+        self._index_keys[task.id] = (due_key, manual_key)
+
+    def _unindex(self, task_id: str):
+        due_key, manual_key = self._index_keys.pop(task_id, (None, None))
+        if due_key is not None:
+            del self._due_index[bisect_left(self._due_index, due_key)]
+        if manual_key is not None:
+            del self._manual_index[bisect_left(self._manual_index, manual_key)]
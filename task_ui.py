@@ -0,0 +1,602 @@
+"""Streamlit UI for the task engine; run it with `streamlit run task_scheduler.py`."""
+import streamlit as st
+import pandas as pd
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import io
+import os
+
+from task_engine import ARCHIVE_AFTER_DAYS, RECENT_REMINDER_LIMIT, TaskManagerAgent
+from task_model import CATEGORIES, COMPLETED, PENDING, PRIORITIES, Task
+from task_view import LiveTaskList
+from notifications import sinks_from_env
+from reminder_bus import make_digest
+import task_metrics
+
+@st.cache_resource
+def get_engine() -> TaskManagerAgent:
+    """The agent shared by every browser session: one store, one reminder worker, one writer"""
+    task_metrics.start_from_env()
+    agent = TaskManagerAgent(
+        storage_mode=os.environ.get("TASK_STORAGE_MODE", "json"),
+        notification_sinks=sinks_from_env(),
+        multi_instance=os.environ.get("TASK_MULTI_INSTANCE") == "1",
+        archive_after_days=float(os.environ.get("TASK_ARCHIVE_DAYS", ARCHIVE_AFTER_DAYS)),
+    )
+    agent.start_reminder_service()
+    return agent
+
+def play_reminder_sound():
+    """Ask this session's page to play the reminder sound on its next render"""
+    st.session_state.play_sound = True
+    print("🔊 Sound trigger set")
+
+def sync_reminders(task_manager: TaskManagerAgent):
+    """Read reminder events fired since this session last looked off the bus into its recent list.
+
+    Everything that fired between two runs of the page becomes one entry and one sound.
+    """
+    first_run = 'reminder_cursor' not in st.session_state
+    # A new page starts with the last few reminders rather than the whole bus
+    bus = task_manager.reminder_bus
+    cursor = st.session_state.get('reminder_cursor', max(0, bus.cursor - RECENT_REMINDER_LIMIT))
+    events, st.session_state.reminder_cursor, _ = bus.read(cursor)
+    if not events:
+        return
+    entries = events if first_run else [make_digest(events)]
+    recent = st.session_state.get('recent_reminders', []) + entries
+    st.session_state.recent_reminders = recent[-RECENT_REMINDER_LIMIT:]
+    # A newly opened page lists earlier reminders but doesn't replay their sound
+    if not first_run:
+        play_reminder_sound()
+
+def play_sound_component():
+    """Component to play sound when triggered"""
+    if st.session_state.get('play_sound', False):
+        # Use online sound URL that works in browsers
+        sound_url = "https://assets.mixkit.co/active_storage/sfx/257/257-preview.mp3"
+        
+        audio_html = f"""
+        <audio autoplay>
+        <source src="{sound_url}" type="audio/mp3">
+        Your browser does not support the audio element.
+        </audio>
+        <script>
+            console.log("Playing reminder sound...");
+        </script>
+        """
+        st.components.v1.html(audio_html, height=0)
+        
+        # Reset the sound trigger
+        st.session_state.play_sound = False
+
+PAGE_SIZES = (10, 25, 50, 100)
+# Task lists and the reminder panel refresh in place this often; the countdown every second
+LIST_REFRESH_SECONDS = 2
+COUNTDOWN_REFRESH_SECONDS = 1
+DUE_WINDOWS = ("Any time", "Overdue", "Next hour", "Today", "Next 7 days")
+REPEAT_OPTIONS = ("Does not repeat", "Daily", "Weekdays", "Weekly", "Custom rule")
+# Ranked matches shown for a search, and tasks offered by the Quick Actions picker
+SEARCH_RESULTS = 50
+PICKER_OPTIONS = 20
+
+def recurrence_rule(repeat: str, due: datetime, custom: str = "") -> Optional[str]:
+    """The recurrence rule for a Repeat choice, anchored on the first due time"""
+    at = due.strftime('%H:%M')
+    if repeat == "Daily":
+        return f"daily {at}"
+    if repeat == "Weekdays":
+        return f"weekly mon-fri {at}"
+    if repeat == "Weekly":
+        return f"weekly {due.strftime('%a').lower()} {at}"
+    if repeat == "Custom rule":
+        return custom.strip() or None
+    return None
+
+def live_tasks(task_manager: TaskManagerAgent, key: str, status: str,
+               priorities: Tuple[str, ...] = (), categories: Tuple[str, ...] = ()) -> LiveTaskList:
+    """This session's filtered list for a tab, brought up to date with only the changes since last run"""
+    live = st.session_state.get(f"{key}_live")
+    if live is None or live.filters != (priorities, categories):
+        live = st.session_state[f"{key}_live"] = LiveTaskList(status, priorities, categories)
+    live.refresh(task_manager.store)
+    return live
+
+def task_table(key: str, live: LiveTaskList) -> pd.DataFrame:
+    """The list as a DataFrame, rebuilt only when the list has moved to a new version"""
+    cached = st.session_state.get(f"{key}_table_cache")
+    if cached is not None and cached[0] == (live.version, live.filters):
+        return cached[1]
+    tasks = live.tasks
+    if live.status == PENDING:
+        rows = [(task.title, task.due_date, task.priority, task.category,
+                 task.reminders_sent, task.manual_reminder_time, task.recurrence) for task in tasks]
+        columns = ["Title", "Due", "Priority", "Category", "Reminders sent", "Manual reminder", "Repeats"]
+    else:
+        rows = [(task.title, task.completed_at, task.due_date, task.priority, task.category)
+                for task in tasks]
+        columns = ["Title", "Completed", "Was due", "Priority", "Category"]
+    table = pd.DataFrame.from_records(rows, columns=columns)
+    st.session_state[f"{key}_table_cache"] = ((live.version, live.filters), table)
+    return table
+
+@st.cache_data(max_entries=4)
+def task_categories(_task_manager: TaskManagerAgent, version: int) -> List[str]:
+    """Every category in use, for the filter picker"""
+    used = _task_manager.get_categories()
+    return list(CATEGORIES) + sorted(used - set(CATEGORIES))
+
+def due_window_slice(live: LiveTaskList, window: str) -> Tuple[int, int]:
+    """Index range of the due-sorted list that falls in the named due window"""
+    now = datetime.now()
+    if window == "Overdue":
+        return 0, live.position(now.timestamp())
+    if window == "Any time":
+        return 0, len(live)
+    end = {
+        "Next hour": now + timedelta(hours=1),
+        "Today": datetime.combine(now.date(), datetime.max.time()),
+        "Next 7 days": now + timedelta(days=7),
+    }[window]
+    return live.position(now.timestamp()), live.position(end.timestamp() + 1e-6)
+
+def format_countdown(seconds: float) -> str:
+    """Time left as [Nd ]HH:MM:SS"""
+    seconds = max(0, int(seconds))
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    clock = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{days}d {clock}" if days else clock
+
+def filter_controls(key: str, task_manager: TaskManagerAgent, with_due_window: bool) -> Tuple[Tuple[str, ...], Tuple[str, ...], str, bool]:
+    """Filter pickers for a task tab; returns (priorities, categories, due window, table view)"""
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+    with col1:
+        priorities = st.multiselect("Priority", PRIORITIES, key=f"{key}_priorities", placeholder="All")
+    with col2:
+        categories = st.multiselect("Category", task_categories(task_manager, task_manager.store.version),
+                                    key=f"{key}_categories", placeholder="All")
+    window = "Any time"
+    if with_due_window:
+        with col3:
+            window = st.selectbox("Due", DUE_WINDOWS, key=f"{key}_window")
+    with col4:
+        as_table = st.toggle("Table", key=f"{key}_table")
+    return tuple(priorities), tuple(categories), window, as_table
+
+def paginate(key: str, total: int) -> Tuple[int, int]:
+    """Page pickers for `total` items; returns the [start, end) range of the current page"""
+    if total == 0:
+        st.info("No tasks match these filters.")
+        return 0, 0
+    col1, col2, col3 = st.columns([1, 1, 3])
+    with col1:
+        size = st.selectbox("Per page", PAGE_SIZES, key=f"{key}_page_size")
+    pages = (total + size - 1) // size
+    # Keep the page in range when filters or deletions shrink the list
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    start = (page - 1) * size
+    end = min(start + size, total)
+    with col3:
+        st.caption(f"Showing {start + 1}–{end} of {total} (page {page} of {pages})")
+    return start, end
+
+def report_csv(task_manager: TaskManagerAgent) -> str:
+    """Task report as CSV text, built only when the download is clicked"""
+    buffer = io.StringIO()
+    task_manager.export_report(buffer, ".csv")
+    return buffer.getvalue()
+
+def render_pending_task(task_manager: TaskManagerAgent, task: Task):
+    """One pending task as an expander with its actions"""
+    icon = "🔁" if task.recurrence else "📌"
+    with st.expander(f"{icon} {task.title} - Due: {task.due_date.strftime('%H:%M')}", expanded=True):
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            # Task details
+            if task.description:
+                st.write(f"**Description:** {task.description}")
+
+            # Task metadata
+            col_meta1, col_meta2, col_meta3 = st.columns(3)
+            with col_meta1:
+                st.write(f"**Due:** {task.due_date.strftime('%Y-%m-%d %H:%M')}")
+            with col_meta2:
+                priority_color = {
+                    "Low": "blue", "Medium": "orange", 
+                    "High": "red", "Urgent": "darkred"
+                }[task.priority]
+                st.markdown(f"**Priority:** <span style='color:{priority_color}'>{task.priority}</span>", 
+                          unsafe_allow_html=True)
+            with col_meta3:
+                st.write(f"**Category:** {task.category}")
+
+            # Time calculation
+            time_left = task.due_date - datetime.now()
+            if time_left.total_seconds() > 0:
+                minutes_left = int(time_left.total_seconds() / 60)
+                hours_left = int(time_left.total_seconds() / 3600)
+
+                if minutes_left < 60:
+                    st.error(f"⏰ Due in {minutes_left} minutes!")
+                elif hours_left < 24:
+                    st.warning(f"⏰ Due in {hours_left} hours")
+                else:
+                    st.info(f"⏰ Due in {time_left.days} days")
+            else:
+                st.error("🚨 OVERDUE!")
+
+            # Reminder info
+            if task.reminders_sent > 0:
+                st.write(f"🔔 Auto-reminders sent: {task.reminders_sent}")
+            if task.manual_reminder_time:
+                status = "✅ Sent" if task.manual_reminder_sent else "⏰ Pending"
+                st.write(f"🔔 Manual reminder: {status}")
+            if task.recurrence:
+                st.write(f"🔁 Repeats `{task.recurrence}` · {task.completed_occurrences} done, "
+                         f"{task.missed_occurrences} missed")
+
+        with col2:
+            # Action buttons
+            if st.button("✅ Mark Done", key=f"done_{task.id}", use_container_width=True):
+                task_manager.mark_task_completed(task.id)
+                st.rerun()
+
+            if st.button("🔔 Remind Now", key=f"remind_{task.id}", use_container_width=True):
+                task_manager.send_manual_reminder_now(task.id)
+                st.success("Reminder sent with sound!")
+                st.rerun()
+
+            if st.button("🗑️ Delete", key=f"delete_{task.id}", use_container_width=True):
+                task_manager.delete_task(task.id)
+                st.rerun()
+
+def render_completed_task(task_manager: TaskManagerAgent, task: Task):
+    """One completed task with its delete action"""
+    with st.container():
+        st.write(f"### ✅ {task.title}")
+        if task.description:
+            st.write(f"**Description:** {task.description}")
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"**Completed:** {task.completed_at.strftime('%Y-%m-%d %H:%M')}")
+            st.write(f"**Was due:** {task.due_date.strftime('%Y-%m-%d %H:%M')}")
+        with col2:
+            if st.button("🗑️ Delete", key=f"del_{task.id}", use_container_width=True):
+                task_manager.delete_task(task.id)
+                st.rerun()
+        st.markdown("---")
+
+@st.fragment(run_every=LIST_REFRESH_SECONDS)
+def reminder_panel(task_manager: TaskManagerAgent):
+    """Recent reminders, picked up off the bus between full reruns; plays the sound for new ones"""
+    sync_reminders(task_manager)
+    play_sound_component()
+    st.header("🔔 Recent Reminders")
+    if st.session_state.get('recent_reminders'):
+        for reminder in reversed(st.session_state.recent_reminders[-3:]):
+            with st.container():
+                emoji = {'manual': "🔔", 'digest': "📬"}.get(reminder['type'], "⏰")
+                st.info(f"{emoji} **{reminder['title']}**\n{reminder['message']}")
+    else:
+        st.write("No recent reminders")
+
+@st.fragment(run_every=LIST_REFRESH_SECONDS)
+def pending_tab(task_manager: TaskManagerAgent):
+    """Pending tasks, filtered and paged; reruns on its own timer and moves only changed tasks"""
+    st.subheader("📋 All Pending Tasks")
+    if not task_manager.store.count(PENDING):
+        st.info("🎉 No pending tasks! Create a new task to get started.")
+        return
+    query = st.text_input("🔍 Search", key="pending_search", placeholder="Words or beginnings of words, e.g. \"rep budg\"")
+    if query.strip():
+        # Ranked matches from the search index instead of the filtered list
+        results = task_manager.search_tasks(query, limit=SEARCH_RESULTS, status=PENDING)
+        if not results:
+            st.info("No pending tasks match this search.")
+        else:
+            st.caption(f"Best {len(results)} matches" if len(results) == SEARCH_RESULTS else f"{len(results)} matches")
+        for task in results:
+            render_pending_task(task_manager, task)
+        return
+    priorities, categories, window, as_table = filter_controls("pending", task_manager, with_due_window=True)
+    live = live_tasks(task_manager, "pending", PENDING, priorities, categories)
+    lo, hi = due_window_slice(live, window)
+    if as_table:
+        st.dataframe(task_table("pending", live).iloc[lo:hi], use_container_width=True, hide_index=True)
+    else:
+        start, end = paginate("pending", hi - lo)
+        for task in live.tasks[lo + start:lo + end]:
+            render_pending_task(task_manager, task)
+
+@st.fragment(run_every=LIST_REFRESH_SECONDS)
+def completed_tab(task_manager: TaskManagerAgent):
+    """Completed tasks, filtered and paged, refreshed like the pending tab"""
+    st.subheader("✅ Completed Tasks")
+    if not task_manager.store.count(COMPLETED):
+        st.info("No completed tasks yet. Complete some tasks to see them here!")
+        return
+    priorities, categories, _, as_table = filter_controls("completed", task_manager, with_due_window=False)
+    live = live_tasks(task_manager, "completed", COMPLETED, priorities, categories)
+    if as_table:
+        st.dataframe(task_table("completed", live), use_container_width=True, hide_index=True)
+    else:
+        start, end = paginate("completed", len(live))
+        for task in live.tasks[start:end]:
+            render_completed_task(task_manager, task)
+
+def archived_page(task_manager: TaskManagerAgent, offset: int, limit: int,
+                  since: Optional[float], until: Optional[float]) -> List[Dict]:
+    """One page of archived records, cached per session until the archive gains segments"""
+    key = (task_manager.archive.generation, offset, limit, since, until)
+    cache = st.session_state.setdefault('archived_pages', {})
+    if key not in cache:
+        if len(cache) > 20:
+            cache.clear()
+        cache[key] = task_manager.archive.page(offset, limit, since, until)
+    return cache[key]
+
+@st.fragment
+def archived_section(task_manager: TaskManagerAgent):
+    """Archived tasks, read a page at a time from the archive segments only when opened"""
+    total = len(task_manager.archive)
+    if not total:
+        return
+    st.markdown("---")
+    if not st.toggle(f"🗄️ Show archived tasks ({total})", key="archived_open"):
+        return
+    dates = st.date_input("Completed between", value=(), key="archived_range")
+    since = until = None
+    if len(dates) >= 1:
+        since = datetime.combine(dates[0], datetime.min.time()).timestamp()
+    if len(dates) == 2:
+        until = datetime.combine(dates[1], datetime.max.time()).timestamp()
+    count_key = (task_manager.archive.generation, since, until)
+    if st.session_state.get('archived_count', (None, 0))[0] != count_key:
+        st.session_state.archived_count = (count_key, task_manager.archive.count(since, until))
+    start, end = paginate("archived", st.session_state.archived_count[1])
+    records = archived_page(task_manager, start, end - start, since, until)
+    if records:
+        st.dataframe(pd.DataFrame([
+            (record['title'], record['completed_at'], record['due_date'], record['priority'], record['category'])
+            for record in records
+        ], columns=["Title", "Completed", "Due", "Priority", "Category"]), use_container_width=True, hide_index=True)
+
+@st.fragment(run_every=COUNTDOWN_REFRESH_SECONDS)
+def countdown_tab(task_manager: TaskManagerAgent):
+    """Live countdown to the next due tasks; only the rows shown are formatted each second"""
+    st.subheader("⏱️ Due Next")
+    live = live_tasks(task_manager, "countdown", PENDING)
+    now = time.time()
+    first = live.position(now)
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        rows = st.selectbox("Show", PAGE_SIZES, key="countdown_rows")
+    with col2:
+        if first:
+            st.error(f"🚨 {first} overdue")
+    upcoming = live.tasks[first:first + rows]
+    if not upcoming:
+        st.info("Nothing coming up.")
+        return
+    st.dataframe(pd.DataFrame.from_records(
+        [(format_countdown(task.due_ts - now), task.title, task.due_date.strftime('%Y-%m-%d %H:%M'),
+          task.priority, task.category) for task in upcoming],
+        columns=["Time left", "Title", "Due", "Priority", "Category"]),
+        use_container_width=True, hide_index=True)
+
+def main():
+    st.set_page_config(
+        page_title="Task Manager Agent",
+        page_icon="✅",
+        layout="wide"
+    )
+    
+    st.title("🤖 Task Manager Agent")
+    st.markdown("""
+    ### Smart Task Management with Sound Reminders!
+    
+    **Features:**
+    - 🔔 Auto-reminders 30 minutes before due time
+    - ⏰ Manual reminders anytime
+    - 🔊 Sound notifications (click buttons to test)
+    - ✅ Mark tasks as done to stop reminders
+    """)
+    
+    # Shared task manager; this session only follows its reminder events
+    task_manager = get_engine()
+    
+    # Initialize sound trigger
+    if 'play_sound' not in st.session_state:
+        st.session_state.play_sound = False
+    
+    # Sidebar
+    with st.sidebar:
+        st.header("➕ Create New Task")
+        
+        task_title = st.text_input("Task Title*", placeholder="What needs to be done?")
+        task_description = st.text_area("Description", placeholder="Add details...")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            task_due_date = st.date_input("Due Date*", value=datetime.now().date())
+        with col2:
+            default_time = (datetime.now() + timedelta(minutes=30)).time()
+            task_due_time = st.time_input("Due Time*", value=default_time)
+        
+        task_due_datetime = datetime.combine(task_due_date, task_due_time)
+        
+        col3, col4 = st.columns(2)
+        with col3:
+            task_priority = st.selectbox("Priority", PRIORITIES)
+        with col4:
+            task_category = st.selectbox("Category", CATEGORIES)
+        
+        # Recurrence: the task is stored once and moves to its next occurrence when done or missed
+        repeat = st.selectbox("Repeat", REPEAT_OPTIONS)
+        custom_rule = ""
+        if repeat == "Custom rule":
+            custom_rule = st.text_input("Rule", placeholder="every 2h · daily 09:00 · weekly mon,thu 18:30 · cron 0 9 * * 1-5")
+        task_recurrence = recurrence_rule(repeat, task_due_datetime, custom_rule)
+        
+        # Manual reminder
+        manual_reminder = st.checkbox("Add manual reminder", value=True)
+        manual_minutes = 15
+        if manual_reminder:
+            manual_minutes = st.slider(
+                "Remind me before (minutes):", 
+                min_value=1, 
+                max_value=1440,
+                value=15
+            )
+        
+        # Create task button
+        if st.button("🚀 Create Task", type="primary", use_container_width=True):
+            if task_title.strip():
+                if task_due_datetime > datetime.now():
+                    try:
+                        task_id = task_manager.create_task(
+                            title=task_title.strip(),
+                            description=task_description.strip(),
+                            due_date=task_due_datetime,
+                            priority=task_priority,
+                            category=task_category,
+                            manual_reminder_minutes=manual_minutes if manual_reminder else 0,
+                            recurrence_rule=task_recurrence,
+                        )
+                        st.success(f"✅ Task '{task_title}' created successfully!")
+                        
+                        if manual_reminder:
+                            reminder_time = task_due_datetime - timedelta(minutes=manual_minutes)
+                            st.info(f"🔔 Manual reminder set for: {reminder_time.strftime('%H:%M')}")
+                        
+                        st.rerun()
+                        
+                    except Exception as e:
+                        st.error(f"❌ Error creating task: {e}")
+                else:
+                    st.error("❌ Due time must be in the future!")
+            else:
+                st.error("❌ Please enter a task title!")
+        
+        st.markdown("---")
+        st.header("⚙️ Controls")
+        
+        # Reminder service controls
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🔔 Start Service", type="primary", use_container_width=True):
+                task_manager.start_reminder_service()
+                st.success("Reminder service started!")
+        with col2:
+            if st.button("🛑 Stop Service", use_container_width=True):
+                task_manager.stop_reminder_service()
+                st.info("Reminder service stopped!")
+        
+        # Test sound button
+        if st.button("🔊 Test Sound", use_container_width=True):
+            play_reminder_sound()
+            st.success("Sound test triggered! You should hear a notification sound.")
+            st.rerun()
+        
+        # Show statistics
+        st.markdown("---")
+        st.header("📊 Statistics")
+        
+        stats = task_manager.get_task_stats()
+        
+        st.metric("Pending Tasks", stats['pending'])
+        st.metric("Completed Tasks", stats['completed'] + stats['archived'])
+        st.metric("Due Soon", stats['due_soon'])
+        
+        st.metric("Overdue", stats['overdue'])
+        # The report loads NumPy/pandas and columns over every task, so only on request
+        if st.toggle("📈 Show report", key="show_report"):
+            report = task_manager.get_report()
+            if report['on_time_rate'] is not None:
+                st.metric("Completed On Time", f"{report['on_time_rate']:.0%}")
+        st.download_button("📤 Export Report (CSV)", data=lambda: report_csv(task_manager),
+                           file_name="task_report.csv", mime="text/csv", use_container_width=True)
+        
+        # Show recent reminders
+        st.markdown("---")
+        reminder_panel(task_manager)
+    
+    # Main content area - each list tab refreshes itself in place from the store's changes
+    tab1, tab2, tab3, tab4 = st.tabs(["📋 All Tasks", "✅ Completed", "⏱️ Countdown", "🎛️ Quick Actions"])
+    
+    with tab1:
+        pending_tab(task_manager)
+    
+    with tab2:
+        completed_tab(task_manager)
+        archived_section(task_manager)
+    
+    with tab3:
+        countdown_tab(task_manager)
+    
+    with tab4:
+        st.subheader("🎛️ Quick Actions")
+        
+        # Quick task creation
+        st.write("### 🚀 Quick Create Task")
+        with st.form("quick_task"):
+            quick_title = st.text_input("Quick Task Title", placeholder="Quick task...")
+            quick_minutes = st.slider("Due in (minutes):", 1, 120, 30)
+            submitted = st.form_submit_button("Create Quick Task")
+            
+            if submitted and quick_title.strip():
+                due_time = datetime.now() + timedelta(minutes=quick_minutes)
+                task_id = task_manager.create_task(
+                    title=quick_title.strip(),
+                    description="Quick task",
+                    due_date=due_time,
+                    priority="Medium",
+                    category="Quick",
+                    manual_reminder_minutes=5
+                )
+                st.success(f"✅ Quick task '{quick_title}' created! Due in {quick_minutes} minutes.")
+                st.rerun()
+        
+        # Manual reminders for existing tasks: the picker offers search matches, or the
+        # next tasks due, rather than an option for every pending task
+        st.write("### 🔔 Manual Reminders")
+        query = st.text_input("Find task:", key="quick_search", placeholder="Search pending tasks...")
+        if query.strip():
+            pending_tasks = task_manager.search_tasks(query, limit=PICKER_OPTIONS, status=PENDING)
+        else:
+            pending_tasks = live_tasks(task_manager, "countdown", PENDING).tasks[:PICKER_OPTIONS]
+        if pending_tasks:
+            task_options = {f"{task.title} (Due: {task.due_date.strftime('%H:%M')})": task.id for task in pending_tasks}
+            selected_task = st.selectbox("Select task:", list(task_options.keys()))
+            
+            if st.button("🔊 Send Reminder Now", type="primary", use_container_width=True):
+                task_id = task_options[selected_task]
+                task_manager.send_manual_reminder_now(task_id)
+                st.success("Reminder sent with sound!")
+                st.rerun()
+        elif query.strip():
+            st.info("No pending tasks match this search")
+        else:
+            st.info("No pending tasks for reminders")
+        
+        # Service status
+        st.write("### 📊 Service Status")
+        if task_manager.running:
+            st.success("✅ **Service Running** - Auto-reminders active")
+            next_fire = task_manager.reminder_queue.next_reminder_time()
+            if next_fire is not None:
+                st.write(f"Next reminder: {datetime.fromtimestamp(next_fire).strftime('%Y-%m-%d %H:%M:%S')}")
+            else:
+                st.write("Next reminder: none scheduled")
+        elif task_manager.lease is not None and task_manager.lease.holder():
+            st.info(f"👥 **Following** - reminders are sent by {task_manager.lease.holder()}")
+        else:
+            st.warning("❌ **Service Stopped** - Click 'Start Service'")
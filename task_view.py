@@ -0,0 +1,95 @@
+"""Task lists that follow the store through its change log instead of re-reading it.
+
+A LiveTaskList holds the tasks of one status that pass a priority/category filter, sorted
+the way the UI shows them. refresh() asks the store for what changed since the list's
+version and moves only those tasks, so a list over thousands of tasks can be refreshed
+every second; it rebuilds from the store's listing only when the change log no longer reaches back.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from task_model import PENDING, Task
+
+SortKey = Tuple[float, str]
+
+
+def _sort_key(task: Task) -> SortKey:
+    # Pending tasks by due date, completed ones by when they were done
+    if task.status == PENDING:
+        value = task.due_ts
+    else:
+        value = task.completed_ts
+    return (value if value is not None else float("inf"), task.id)
+
+
+class LiveTaskList:
+    """Filtered tasks of one status, kept in order by applying store deltas"""
+
+    def __init__(self, status: str, priorities: Tuple[str, ...] = (), categories: Tuple[str, ...] = ()):
+        self.status = status
+        self.filters = (priorities, categories)
+        self.version = -1
+        self.tasks: List[Task] = []
+        # Parallel to tasks: the sort keys, and just their times for due-window bisects
+        self._keys: List[SortKey] = []
+        self.times: List[float] = []
+        self._key_of: Dict[str, SortKey] = {}
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def matches(self, task: Task) -> bool:
+        priorities, categories = self.filters
+        return (task.status == self.status
+                and (not priorities or task.priority in priorities)
+                and (not categories or task.category in categories))
+
+    def refresh(self, store) -> bool:
+        """Catch up with the store; returns True if the list changed"""
+        delta = store.delta_since(self.version) if self.version >= 0 else None
+        if delta is None:
+            self._rebuild(store)
+            return True
+        changed = False
+        for task_id in delta.deleted:
+            changed |= self._discard(task_id)
+        for task in delta.updated:
+            changed |= self._discard(task.id)
+        for task in delta.created + delta.updated:
+            if self.matches(task):
+                self._insert(task)
+                changed = True
+        self.version = delta.version
+        return changed
+
+    def position(self, when: float) -> int:
+        """Index of the first task whose sort time is at or after `when`"""
+        return bisect_left(self.times, when)
+
+    def _rebuild(self, store):
+        # Only a completed list makes the store build its deferred records
+        version, tasks = store.listing(self.status)
+        tasks = sorted((task for task in tasks if self.matches(task)), key=_sort_key)
+        self.tasks = tasks
+        self._keys = [_sort_key(task) for task in tasks]
+        self.times = [key[0] for key in self._keys]
+        self._key_of = {task.id: key for task, key in zip(tasks, self._keys)}
+        self.version = version
+
+    def _insert(self, task: Task):
+        key = _sort_key(task)
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self.times.insert(index, key[0])
+        self.tasks.insert(index, task)
+        self._key_of[task.id] = key
+
+    def _discard(self, task_id: str) -> bool:
+        key: Optional[SortKey] = self._key_of.pop(task_id, None)
+        if key is None:
+            return False
+        index = bisect_left(self._keys, key)
+        del self._keys[index]
+        del self.times[index]
+        del self.tasks[index]
+        return True
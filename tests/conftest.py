@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# The modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_model import COMPLETED, PENDING, Task  # noqa: E402
+
+NOW = datetime(2030, 1, 15, 12, 0)
+
+
+def make_task(task_id: str, hours: float = 1, status: str = PENDING, **fields) -> Task:
+    """A task due `hours` after NOW"""
+    fields.setdefault('title', f"Task {task_id}")
+    if status == COMPLETED:
+        fields.setdefault('completed_at', NOW + timedelta(hours=hours - 1))
+    return Task(task_id, due_date=NOW + timedelta(hours=hours), status=status,
+                created_at=NOW - timedelta(days=1), **fields)
+
+
+@pytest.fixture
+def agent(tmp_path):
+    """A synchronous-write agent over an empty tasks.json that sends no notifications"""
+    from task_engine import TaskManagerAgent
+
+    agent = TaskManagerAgent(str(tmp_path / "tasks.json"), write_behind_interval=None,
+                             notification_sinks=[], archive_after_days=None)
+    yield agent
+    agent.close()
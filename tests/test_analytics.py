@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import NOW, make_task
+from task_analytics import TaskColumns
+from task_engine import TaskManagerAgent
+from task_model import COMPLETED, PENDING
+from task_store import TaskStore
+
+
+def fill(agent):
+    """Two overdue tasks, two due later, and three completed, two of them late"""
+    now = datetime.now()
+    for hours in (-3, -1, 2, 30):
+        agent.create_task(f"Due in {hours}h", "", now + timedelta(hours=hours), category="Work")
+    for hours in (-5, -4, 10):
+        task_id = agent.create_task(f"Done {hours}h", "", now + timedelta(hours=hours), priority="High")
+        agent.mark_task_completed(task_id)
+    agent.flush()
+
+
+def test_report_agrees_with_the_statistics_panel(agent):
+    fill(agent)
+    report, stats = agent.get_report(), agent.get_task_stats()
+
+    assert report['by_status'] == {PENDING: stats['pending'], COMPLETED: stats['completed'] + stats['archived']}
+    assert report['total'] == stats['pending'] + stats['completed'] + stats['archived']
+    assert report['overdue'] == stats['overdue'] == 2
+    assert report['overdue_rate'] == 0.5
+    assert report['by_priority']['High'] == 3 and report['by_category']['Work'] == 4
+    assert report['completed_on_time'] == 1
+
+
+def test_a_reloaded_store_is_reported_without_building_its_records(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    agent = TaskManagerAgent(path, write_behind_interval=None, notification_sinks=[], archive_after_days=None)
+    fill(agent)
+    before = agent.get_report()
+    agent.close()
+
+    agent = TaskManagerAgent(path, write_behind_interval=None, notification_sinks=[], archive_after_days=None)
+    try:
+        deferred = len(agent.store._deferred)
+        after = agent.get_report()
+        assert deferred == 3 and len(agent.store._deferred) == 3
+        assert {key: after[key] for key in ('by_status', 'by_priority', 'by_category', 'completed_on_time')} == \
+               {key: before[key] for key in ('by_status', 'by_priority', 'by_category', 'completed_on_time')}
+    finally:
+        agent.close()
+
+
+def test_refresh_rewrites_only_changed_rows():
+    store = TaskStore([make_task("a"), make_task("b", category="Shopping")])
+    columns = TaskColumns(store)
+    assert columns.summary(now=NOW.timestamp())['by_status'] == {PENDING: 2, COMPLETED: 0}
+
+    store.modify("a", status=COMPLETED, completed_ts=NOW.timestamp())
+    store.remove("b")
+    store.add(make_task("c", priority="Low"))
+    report = columns.summary(now=NOW.timestamp())
+
+    assert len(columns) == 2
+    assert report['by_status'] == {PENDING: 1, COMPLETED: 1}
+    assert report['by_priority']['Low'] == 1
+    assert report['by_category']['Shopping'] == 0
+
+
+def test_unknown_statuses_are_rejected_not_added():
+    store = TaskStore([make_task("a", status="snoozed")])
+    with pytest.raises(ValueError, match="snoozed"):
+        TaskColumns(store).refresh()
+    assert TaskColumns.from_records([make_task("b").to_dict()]).summary()['by_status'] == {PENDING: 1, COMPLETED: 0}
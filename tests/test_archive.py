@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+
+import task_archive
+from conftest import NOW, make_task
+from task_archive import TaskArchive
+from task_model import COMPLETED
+
+
+def records(count: int, priority: str = "Medium"):
+    """Completed records finishing an hour apart, all due with the second; the first two are on time"""
+    return [make_task(f"t{i}", hours=-count + 1, status=COMPLETED, priority=priority,
+                      completed_at=NOW - timedelta(hours=count - i)).to_dict()
+            for i in range(count)]
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    # Small segments so ranges and pages cross segment boundaries
+    monkeypatch.setattr(task_archive, "SEGMENT_ROWS", 4)
+    return TaskArchive(str(tmp_path / "archive"))
+
+
+def test_empty_archive(archive):
+    assert len(archive) == 0
+    assert list(archive.records()) == []
+    assert archive.last_completed() is None
+    assert archive.append([]) == 0
+
+
+def test_append_sorts_by_completion_and_splits_into_segments(archive):
+    batch = records(10)
+    assert archive.append(list(reversed(batch))) == 10
+
+    assert len(archive) == 10
+    assert archive.generation == 3
+    assert [record['id'] for record in archive.records()] == [f"t{i}" for i in range(10)]
+    assert archive.last_completed() == task_archive.completed_ts(batch[-1])
+
+
+def test_range_queries_open_only_overlapping_segments(archive):
+    batch = records(10)
+    archive.append(batch)
+    since, until = task_archive.completed_ts(batch[3]), task_archive.completed_ts(batch[6])
+
+    assert archive.count(since, until) == 4
+    assert [record['id'] for record in archive.records(since, until)] == ["t3", "t4", "t5", "t6"]
+    assert archive.count(until=since) == 4
+
+
+def test_pages_are_newest_first(archive):
+    archive.append(records(10))
+    assert [record['id'] for record in archive.page(0, 3)] == ["t9", "t8", "t7"]
+    assert [record['id'] for record in archive.page(3, 3)] == ["t6", "t5", "t4"]
+    assert [record['id'] for record in archive.page(8, 5)] == ["t1", "t0"]
+    assert archive.page(10, 5) == []
+
+
+def test_stats_come_from_the_index(archive, tmp_path):
+    archive.append(records(3))
+    archive.append(records(2, priority="High"))
+
+    # A second archive over the same directory reads the index written by the first
+    stats = TaskArchive(str(tmp_path / "archive")).stats()
+    assert stats['count'] == 5
+    assert stats['by_priority'] == {'Medium': 3, 'High': 2}
+    assert stats['finished'] == 5
+    assert stats['on_time'] == 4
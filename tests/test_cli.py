@@ -0,0 +1,91 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from task_cli import main
+from task_model import COMPLETED
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def cli(tmp_path, capsys):
+    """Run the CLI on a tasks file in tmp_path; returns (exit code, stdout)"""
+    tasks_file = str(tmp_path / "tasks.json")
+
+    def run(*argv):
+        capsys.readouterr()
+        code = main(["--tasks-file", tasks_file, *argv])
+        return code, capsys.readouterr().out
+
+    return run
+
+
+def listed(cli, *options):
+    code, out = cli("list", "--json", *options)
+    assert code == 0
+    return [json.loads(line) for line in out.splitlines() if line.startswith("{")]
+
+
+def test_add_list_and_complete(cli):
+    assert cli("add", "Write report", "--in", "45", "--priority", "High", "--remind-before", "10")[0] == 0
+    assert cli("add", "Standup", "--due", "2030-01-14T09:30", "--repeat", "weekly mon-fri 09:30")[0] == 0
+
+    tasks = listed(cli)
+    assert [task['title'] for task in tasks] == ["Write report", "Standup"]
+    assert tasks[0]['priority'] == "High" and tasks[0]['manual_reminder_time'] is not None
+    assert tasks[1]['recurrence'] == "weekly mon-fri 09:30"
+
+    report = tasks[0]['id']
+    assert cli("complete", report)[0] == 0
+    assert [task['id'] for task in listed(cli, "--status", COMPLETED)] == [report]
+    assert len(listed(cli, "--status", "all")) == 2
+
+
+def test_errors_exit_non_zero(cli):
+    code, out = cli("add", "Broken", "--repeat", "every 2x")
+    assert code == 1 and "Invalid recurrence" in out
+    code, out = cli("complete", "task_missing")
+    assert code == 1 and "No task with id task_missing" in out
+    assert listed(cli) == []
+
+
+def test_search_and_import(cli, tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,due_date,priority\nQuarterly report,2030-02-01T09:00,High\n"
+                    "Fix bike,2030-02-02T09:00,Low\nNo date,,Low\n")
+    code, out = cli("import", str(path))
+    assert code == 1 and "due_date is required" in out
+
+    code, out = cli("search", "quart", "--json")
+    assert code == 0 and json.loads(out.splitlines()[-1])['title'] == "Quarterly report"
+    assert cli("search", "nothing")[0] == 1
+
+
+def test_the_cli_does_not_import_the_ui_stack():
+    script = "import sys, task_cli; print(sorted({'streamlit', 'pandas', 'numpy'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_the_daemon_stops_cleanly_on_sigterm(tmp_path):
+    env = {**os.environ, 'TASK_METRICS_PORT': "", 'PYTHONUNBUFFERED': "1"}
+    daemon = subprocess.Popen([sys.executable, "-m", "task_scheduler", "--tasks-file", str(tmp_path / "tasks.json"),
+                               "daemon"], cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    try:
+        deadline = time.time() + 10
+        line = ""
+        while "Reminder daemon running" not in line and time.time() < deadline:
+            line = daemon.stdout.readline()
+        assert "Reminder daemon running" in line
+        daemon.send_signal(signal.SIGTERM)
+        assert daemon.wait(10) == 0
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+        daemon.stdout.close()
@@ -0,0 +1,71 @@
+import random
+import threading
+from datetime import datetime, timedelta
+
+from conftest import make_task
+from task_model import COMPLETED, PENDING
+from task_store import TaskStore
+
+
+def test_snapshots_stay_fixed_while_writers_carry_on():
+    store = TaskStore([make_task("a"), make_task("b", hours=2)])
+    snapshot = store.snapshot()
+    task = store.get("a")
+
+    store.modify("a", title="Renamed")
+    store.add(make_task("c", hours=3))
+    store.remove("b")
+
+    assert [each.id for each in snapshot.pending] == ["a", "b"]
+    assert task.title == "Task a" and store.get("a").title == "Renamed"
+    assert store.snapshot().version > snapshot.version
+
+
+def test_creators_completers_and_the_worker_run_together(agent):
+    agent.start_reminder_service()
+    stop = threading.Event()
+    errors = []
+
+    def guarded(work):
+        def run():
+            rng = random.Random(threading.get_ident())
+            try:
+                while not stop.is_set():
+                    work(rng)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        return threading.Thread(target=run)
+
+    def create(rng):
+        # Due soon enough that both reminders fire while the test runs
+        due = datetime.now() + timedelta(minutes=30, seconds=rng.uniform(0, 0.5))
+        agent.create_task("Stress", "", due, manual_reminder_minutes=30)
+
+    def complete(rng):
+        pending = agent.get_snapshot().pending
+        if pending:
+            agent.mark_task_completed(rng.choice(pending).id)
+
+    def read(rng):
+        snapshot = agent.get_snapshot()
+        assert all(task.status == PENDING for task in snapshot.pending)
+        assert all(task.status == COMPLETED for task in snapshot.completed)
+        due = [task.due_ts for task in snapshot.pending]
+        assert due == sorted(due)
+
+    threads = [guarded(work) for work in (create, create, complete, read, read)]
+    for thread in threads:
+        thread.start()
+    stop.wait(1.5)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    agent.stop_reminder_service()
+
+    assert errors == []
+    assert agent.reminder_bus.cursor > 0
+    snapshot = agent.get_snapshot()
+    assert len(snapshot.pending) + len(snapshot.completed) == len(agent.store)
+    assert agent.store.count(PENDING) == len(snapshot.pending)
+    assert [task.id for task in agent.get_pending_tasks()] == [task.id for task in snapshot.pending]
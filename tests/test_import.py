@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from task_import import import_tasks, iter_rows, validate_row
+
+VALID = {'title': "Pay rent", 'due_date': "2030-02-01T09:00"}
+
+
+def test_validate_row_fills_defaults():
+    assert validate_row(dict(VALID)) == {
+        'title': "Pay rent",
+        'description': "",
+        'due_date': datetime(2030, 2, 1, 9, 0),
+        'priority': "Medium",
+        'category': "General",
+        'manual_reminder_minutes': 0,
+        'recurrence_rule': None,
+    }
+
+
+def test_validate_row_strips_and_keeps_given_fields():
+    row = validate_row({**VALID, 'title': "  Pay rent ", 'priority': "High", 'category': "Personal",
+                        'description': "Landlord", 'manual_reminder_minutes': "15",
+                        'recurrence': "cron 0 9 1 * *"})
+    assert row['title'] == "Pay rent"
+    assert row['priority'] == "High" and row['category'] == "Personal"
+    assert row['manual_reminder_minutes'] == 15
+    assert row['recurrence_rule'] == "cron 0 9 1 * *"
+
+
+@pytest.mark.parametrize("value, expected", [("", 0), (None, 0), ("30", 30), (30, 30), (30.0, 30)])
+def test_validate_row_accepts_whole_minutes(value, expected):
+    assert validate_row({**VALID, 'manual_reminder_minutes': value})['manual_reminder_minutes'] == expected
+
+
+@pytest.mark.parametrize("changes, message", [
+    ({'title': ""}, "title is required"),
+    ({'title': 42}, "is not text"),
+    ({'due_date': None}, "due_date is required"),
+    ({'due_date': "next week"}, "not an ISO date"),
+    ({'due_date': 20300201}, "is not text"),
+    ({'priority': "Critical"}, "priority 'Critical'"),
+    ({'manual_reminder_minutes': 1.5}, "is not a whole number"),
+    ({'manual_reminder_minutes': "1.5"}, "is not a whole number"),
+    ({'manual_reminder_minutes': True}, "is not a whole number"),
+    ({'manual_reminder_minutes': "-5"}, "cannot be negative"),
+    ({'recurrence': "every 2x"}, "Invalid recurrence"),
+])
+def test_validate_row_rejects_bad_fields(changes, message):
+    with pytest.raises(ValueError, match=message):
+        validate_row({**VALID, **changes})
+
+
+def test_validate_row_rejects_non_objects():
+    with pytest.raises(ValueError, match="not an object"):
+        validate_row(["Pay rent"])
+    with pytest.raises(ValueError, match="invalid JSON"):
+        validate_row(json.JSONDecodeError("Expecting value", "{", 1))
+
+
+def test_iter_rows_drops_the_excel_byte_order_mark(tmp_path):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,due_date\nPay rent,2030-02-01T09:00\n", encoding="utf-8-sig")
+    assert [row for _, row in iter_rows(str(path))] == [VALID]
+
+
+def test_iter_rows_rejects_unknown_formats(tmp_path):
+    path = tmp_path / "tasks.xlsx"
+    path.write_text("")
+    with pytest.raises(ValueError, match="Unsupported import format"):
+        list(iter_rows(str(path)))
+
+
+def test_import_tasks_skips_and_reports_bad_rows(agent, tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    lines = [
+        json.dumps(VALID),
+        "{not json",
+        "",
+        json.dumps({'title': "No date"}),
+        json.dumps({**VALID, 'title': "Weekly review", 'recurrence': "weekly fri 16:00"}),
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+    result = import_tasks(agent, str(path), batch_size=1)
+
+    assert result['imported'] == 2 and result['failed'] == 2
+    assert result['errors'][0].startswith("line 2: invalid JSON")
+    assert result['errors'][1] == "line 4: due_date is required"
+    titles = sorted(task.title for task in agent.get_pending_tasks())
+    assert titles == ["Pay rent", "Weekly review"]
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+
+from conftest import make_task
+from task_storage import JournalTaskStorage
+
+
+def record(task_id: str, **fields) -> dict:
+    return make_task(task_id, **fields).to_dict()
+
+
+def reopened(path: str) -> dict:
+    storage = JournalTaskStorage(path)
+    try:
+        return {item['id']: item for item in storage.load()}
+    finally:
+        storage.close()
+
+
+def test_mutations_replay_on_the_next_load(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = JournalTaskStorage(path)
+    storage.save([record("a"), record("b")])
+    storage.append("update", record("a", title="Renamed"))
+    storage.append_many([("create", record("c")), ("delete", {'id': "b"})])
+    storage.close()
+
+    tasks = reopened(path)
+    assert sorted(tasks) == ["a", "c"]
+    assert tasks["a"]['title'] == "Renamed"
+
+
+def test_a_torn_last_line_is_skipped(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = JournalTaskStorage(path)
+    storage.append("create", record("a"))
+    storage.close()
+    with open(f"{path}.journal", 'a') as f:
+        f.write('{"op":"create","task":{"id":"b"')
+
+    assert sorted(reopened(path)) == ["a"]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = JournalTaskStorage(path, compact_threshold=5)
+    for i in range(12):
+        storage.append("create", record(f"t{i}"))
+    storage.append("delete", {'id': "t0"})
+    storage.close()
+
+    assert not os.path.exists(f"{path}.journal.1")
+    with open(path) as f:
+        assert len(json.load(f)) >= 5
+    assert sorted(reopened(path)) == sorted(f"t{i}" for i in range(1, 12))
+
+
+def test_an_interrupted_compaction_is_replayed(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    with open(f"{path}.journal.1", 'w') as f:
+        f.write(json.dumps({'op': "create", 'task': record("a")}) + "\n")
+    with open(f"{path}.journal", 'w') as f:
+        f.write(json.dumps({'op': "update", 'task': record("a", title="Later")}) + "\n")
+
+    assert reopened(path)["a"]['title'] == "Later"
+
+
+def test_saves_do_not_race_background_compactions(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    storage = JournalTaskStorage(path, compact_threshold=3)
+    saved = [record(f"s{i}") for i in range(50)]
+
+    def append():
+        for i in range(300):
+            storage.append("create", record(f"a{i}"))
+
+    writer = threading.Thread(target=append)
+    writer.start()
+    for _ in range(30):
+        storage.save(saved)
+    writer.join()
+    storage.save(saved)
+    storage.close()
+
+    assert not os.path.exists(f"{path}.tmp")
+    assert sorted(reopened(path)) == sorted(item['id'] for item in saved)
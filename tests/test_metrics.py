@@ -0,0 +1,107 @@
+import json
+import logging
+import time
+import urllib.request
+from datetime import datetime, timedelta
+
+import pytest
+
+import task_metrics
+from task_metrics import METRICS, REMINDER_LAG, REMINDERS_SENT, MetricsRegistry, MetricsServer
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_counters_and_histograms_render_as_prometheus_text(registry):
+    counter = registry.counter("demo_total", "Demo events", labels=("kind",))
+    counter.inc(kind="a")
+    counter.inc(2, kind='b"q')
+    histogram = registry.histogram("demo_seconds", "Demo durations", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE demo_total counter" in lines
+    assert 'demo_total{kind="a"} 1' in lines
+    assert 'demo_total{kind="b\\"q"} 2' in lines
+    assert 'demo_seconds_bucket{le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in lines
+    assert "demo_seconds_sum 5.55" in lines and "demo_seconds_count 3" in lines
+
+
+def test_gauges_read_their_callback_at_scrape_time(registry):
+    values = [3]
+    gauge = registry.gauge("demo_depth", "Demo depth", lambda: values[0])
+    assert gauge.value() == 3
+    values[0] = 5
+    assert "demo_depth 5" in registry.render()
+    # The same name returns the same gauge, pointed at the new callback
+    registry.gauge("demo_depth", "Demo depth", lambda: None)
+    assert "demo_depth NaN" in registry.render()
+
+
+def test_the_agent_reports_queue_depth_and_task_gauges(agent):
+    now = datetime.now()
+    agent.create_task("Overdue", "", now - timedelta(hours=1))
+    agent.create_task("Later", "", now + timedelta(hours=2), manual_reminder_minutes=30)
+
+    scrape = METRICS.render().splitlines()
+    assert "task_pending 2" in scrape
+    assert "task_overdue 1" in scrape
+    # Overdue tasks get no more auto reminders; the other task has an auto and a manual one
+    assert "task_reminder_queue_depth 2" in scrape
+    assert f"task_next_reminder_timestamp {agent.reminder_queue.next_reminder_time()!r}" in scrape
+
+
+def test_fired_reminders_are_counted_and_their_lag_observed(agent):
+    sent, observed = REMINDERS_SENT.value(kind="manual"), REMINDER_LAG.count(kind="manual")
+    agent.start_reminder_service()
+    agent.create_task("Now", "", datetime.now() + timedelta(minutes=60), manual_reminder_minutes=60)
+    deadline = time.time() + 5
+    while REMINDER_LAG.count(kind="manual") == observed and time.time() < deadline:
+        time.sleep(0.01)
+    agent.stop_reminder_service()
+
+    assert REMINDERS_SENT.value(kind="manual") == sent + 1
+    assert REMINDER_LAG.count(kind="manual") == observed + 1
+
+
+def test_the_endpoint_serves_the_registry(registry):
+    registry.counter("demo_total", "Demo events").inc()
+    server = MetricsServer(port=0, registry=registry).start()
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "demo_total 1" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(server.url.replace("/metrics", "/other"), timeout=5)
+    finally:
+        server.stop()
+
+
+def test_events_and_profiled_calls_are_recorded(tmp_path, monkeypatch):
+    log_path = tmp_path / "events.jsonl"
+    monkeypatch.setattr(task_metrics.EVENT_LOGGER, "handlers", list(task_metrics.EVENT_LOGGER.handlers))
+    monkeypatch.setattr(task_metrics.EVENT_LOGGER, "level", logging.NOTSET)
+    task_metrics.configure_event_log(str(log_path))
+    task_metrics.enable_profiling()
+    try:
+        @task_metrics.profiled
+        def work():
+            return 42
+
+        assert work() == 42
+        task_metrics.record_error("demo", ValueError("boom"))
+    finally:
+        task_metrics.enable_profiling(False)
+        for handler in task_metrics.EVENT_LOGGER.handlers:
+            handler.close()
+
+    assert task_metrics.FUNCTION_SECONDS.count(function=work.__qualname__) == 1
+    event = json.loads(log_path.read_text().splitlines()[-1])
+    assert event['event'] == "error" and event['where'] == "demo" and "boom" in event['error']
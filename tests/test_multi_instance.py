@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import make_task
+from sqlite_store import SqliteTaskStore
+from task_engine import TaskManagerAgent
+
+
+class RecordingSink:
+    """Keeps every notification; while `gate` is cleared, deliveries wait for it"""
+
+    timeout = 30.0
+
+    def __init__(self, name: str):
+        self.name = name
+        self.received = []
+        self.gate = threading.Event()
+        self.gate.set()
+
+    async def send(self, notification):
+        await asyncio.to_thread(self.gate.wait)
+        self.received.append(notification)
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def instances(tmp_path):
+    agents = []
+
+    def start(name: str, **options):
+        sink = RecordingSink(name)
+        agent = TaskManagerAgent(str(tmp_path / "tasks.json"), write_behind_interval=0.05, multi_instance=True,
+                                 notification_sinks=[sink], archive_after_days=None, **options)
+        agent.digester.window = 0
+        agent.start_reminder_service()
+        agents.append((agent, sink))
+        return agent, sink
+
+    yield start
+    for agent, sink in agents:
+        sink.gate.set()
+        agent.close()
+
+
+def create_due_reminder(agent) -> str:
+    """A task whose manual reminder is due now"""
+    task_id = agent.create_task("Call back", "", datetime.now() + timedelta(hours=2), manual_reminder_minutes=120)
+    agent.flush()
+    return task_id
+
+
+def test_only_the_leader_sends_reminders(instances):
+    leader, leader_sink = instances("a")
+    assert wait_for(lambda: leader.lease.is_leader)
+    follower, follower_sink = instances("b")
+
+    task_id = create_due_reminder(follower)
+
+    assert wait_for(lambda: len(leader_sink.received) == 1)
+    assert leader_sink.received[0]['task_id'] == task_id
+    # The follower hears about it from the shared file
+    assert wait_for(lambda: follower.store.get(task_id).manual_reminder_sent)
+    time.sleep(0.2)
+    assert follower_sink.received == []
+
+
+def test_a_reminder_is_recorded_as_sent_only_once_delivered(instances):
+    leader, sink = instances("a")
+    assert wait_for(lambda: leader.lease.is_leader)
+    sink.gate.clear()
+
+    task_id = create_due_reminder(leader)
+    assert wait_for(lambda: leader.reminder_bus.cursor == 1)
+    time.sleep(0.1)
+    assert not leader.store.get(task_id).manual_reminder_sent
+
+    sink.gate.set()
+    assert wait_for(lambda: leader.store.get(task_id).manual_reminder_sent)
+    assert len(sink.received) == 1
+
+
+def test_a_new_leader_sends_what_the_old_one_fired_but_never_delivered(instances):
+    old, old_sink = instances("a")
+    assert wait_for(lambda: old.lease.is_leader)
+    new, new_sink = instances("b")
+    old_sink.gate.clear()
+
+    task_id = create_due_reminder(old)
+    assert wait_for(lambda: old.reminder_bus.cursor == 1)
+    # The old leader disappears with the reminder still on its way
+    old.lease.release()
+
+    assert wait_for(lambda: len(new_sink.received) == 1)
+    assert new_sink.received[0]['task_id'] == task_id
+    assert wait_for(lambda: new.store.get(task_id).manual_reminder_sent)
+
+
+def test_sqlite_batches_in_two_processes_wait_for_each_other(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    first, second = SqliteTaskStore(path), SqliteTaskStore(path)
+    try:
+        other = threading.Thread(target=lambda: second.add(make_task("b")))
+        with first.batch():
+            assert first.get("a") is None
+            # The other connection commits between this batch's read and its write
+            other.start()
+            time.sleep(0.2)
+            first.add(make_task("a"))
+        other.join()
+        assert {task.id for task in first} == {"a", "b"}
+    finally:
+        first.close()
+        second.close()
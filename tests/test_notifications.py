@@ -0,0 +1,135 @@
+"""NotificationDispatcher against the stand-in servers from local_servers.py"""
+import json
+import time
+
+import pytest
+
+from local_servers import LocalSmtpServer, LocalWebhookServer
+from notifications import NOTIFICATIONS_THROTTLED, NotificationDispatcher, SmtpSink, TokenBucket, WebhookSink
+
+NOTIFICATION = {
+    'task_id': "task_1",
+    'title': "Pay rent",
+    'description': "Landlord",
+    'message': "🔔 REMINDER: 'Pay rent' is due in 30 minutes!",
+    'due_at': "2030-02-01 09:00",
+    'type': "auto",
+}
+
+
+@pytest.fixture
+def webhook():
+    servers = []
+
+    def start(**options):
+        server = LocalWebhookServer(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def dispatcher(tmp_path):
+    dispatchers = []
+
+    def make(sinks, **options):
+        options.setdefault('backoff', 0.01)
+        dispatcher = NotificationDispatcher(sinks, dead_letter_path=str(tmp_path / "dead_letter.jsonl"), **options)
+        dispatchers.append(dispatcher)
+        return dispatcher
+
+    yield make
+    for dispatcher in dispatchers:
+        dispatcher.close()
+
+
+def dead_letters(tmp_path):
+    path = tmp_path / "dead_letter.jsonl"
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def test_webhook_delivery_is_retried_after_server_errors(webhook, dispatcher, tmp_path):
+    server = webhook(fail_first=2)
+    notifier = dispatcher([WebhookSink(server.url, rate_per_minute=None)], max_retries=3)
+
+    notifier.submit(NOTIFICATION)
+
+    assert notifier.drain(10)
+    assert server.requests == 3
+    assert server.received == [NOTIFICATION]
+    assert notifier.dead_letters == 0 and dead_letters(tmp_path) == []
+
+
+def test_timed_out_delivery_goes_to_the_dead_letter_file(webhook, dispatcher, tmp_path):
+    server = webhook(delay=0.5)
+    sink = WebhookSink(server.url, timeout=0.1, rate_per_minute=None)
+    notifier = dispatcher([sink], max_retries=1)
+
+    notifier.submit(NOTIFICATION)
+
+    assert notifier.drain(10)
+    assert notifier.dead_letters == 1
+    [entry] = dead_letters(tmp_path)
+    assert entry['sink'] == sink.name
+    assert entry['notification'] == NOTIFICATION
+    assert entry['attempts'] == 2
+    assert "TimeoutError" in entry['error']
+
+
+def test_failing_sink_does_not_hold_up_the_others(webhook, dispatcher, tmp_path):
+    good, bad = webhook(), webhook(fail_first=100)
+    notifier = dispatcher([WebhookSink(good.url, rate_per_minute=None),
+                           WebhookSink(bad.url, rate_per_minute=None)], max_retries=1)
+
+    notifier.submit(NOTIFICATION)
+
+    assert notifier.drain(10)
+    assert good.received == [NOTIFICATION]
+    assert [entry['sink'] for entry in dead_letters(tmp_path)] == [f"webhook:127.0.0.1:{bad.port}"]
+
+
+def test_rate_limit_spaces_out_deliveries_beyond_the_burst(webhook, dispatcher):
+    server = webhook()
+    # 10 per second after a burst of 2
+    sink = WebhookSink(server.url, rate_per_minute=600, burst=2)
+    notifier = dispatcher([sink])
+    throttled = NOTIFICATIONS_THROTTLED.value(sink=sink.name)
+
+    start = time.monotonic()
+    for number in range(5):
+        notifier.submit({**NOTIFICATION, 'task_id': f"task_{number}"})
+    assert notifier.drain(10)
+    elapsed = time.monotonic() - start
+
+    assert len(server.received) == 5
+    assert NOTIFICATIONS_THROTTLED.value(sink=sink.name) - throttled == 3
+    assert elapsed >= 0.25
+
+
+def test_token_bucket_reserves_in_arrival_order():
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_smtp_delivery():
+    server = LocalSmtpServer().start()
+    try:
+        notifier = NotificationDispatcher(
+            [SmtpSink("127.0.0.1", server.port, "tasks@example.com", ["you@example.com"], rate_per_minute=None)],
+            dead_letter_path=None)
+        notifier.submit(NOTIFICATION)
+        assert notifier.drain(10)
+        notifier.close()
+    finally:
+        server.stop()
+
+    [message] = server.messages
+    assert message['to'] == ["<you@example.com>"]
+    assert "Subject: Task reminder: Pay rent" in message['data']
+    assert notifier.dead_letters == 0
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+import recurrence
+from recurrence import Cron, Interval
+
+# A Wednesday
+WEDNESDAY = datetime(2030, 1, 16, 10, 0)
+
+
+def ts(*args) -> float:
+    return datetime(*args).timestamp()
+
+
+@pytest.mark.parametrize("rule, seconds", [
+    ("every 90m", 90 * 60),
+    ("every 2h", 2 * 3600),
+    ("Every 3D", 3 * 86400),
+    ("every 1.5w", 1.5 * 7 * 86400),
+])
+def test_parse_intervals(rule, seconds):
+    parsed = recurrence.parse(rule)
+    assert isinstance(parsed, Interval) and parsed.seconds == seconds
+
+
+def test_parse_daily_weekly_and_cron():
+    daily = recurrence.parse("daily 09:30")
+    assert isinstance(daily, Cron)
+    assert (daily.minutes, daily.hours) == ({30}, {9})
+
+    weekly = recurrence.parse("weekly mon,thu 18:00")
+    assert weekly.weekdays == {1, 4} and weekly.any_day
+
+    cron = recurrence.parse("cron */15 9-17 * jan-mar sun,7")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == set(range(9, 18))
+    assert cron.months == {1, 2, 3}
+    assert cron.weekdays == {0}
+
+
+@pytest.mark.parametrize("rule", [
+    "",
+    "hourly",
+    "every 0h",
+    "every 2x",
+    "every h",
+    "every nanm",
+    "every infh",
+    "every 1e-9m",
+    "every 0.5m",
+    "daily 25:00",
+    "weekly 09:00",
+    "cron * * *",
+    "cron 60 * * * *",
+    "cron * * * * funday",
+])
+def test_parse_rejects_malformed_rules(rule):
+    with pytest.raises(ValueError):
+        recurrence.parse(rule)
+
+
+def test_interval_keeps_the_grid_and_skips_missed_periods():
+    previous = ts(2030, 1, 16, 8, 0)
+    assert recurrence.next_occurrence("every 2h", previous, previous) == ts(2030, 1, 16, 10, 0)
+    # Three periods later: the missed 10:00 and 12:00 are skipped, not replayed
+    assert recurrence.next_occurrence("every 2h", previous, ts(2030, 1, 16, 13, 0)) == ts(2030, 1, 16, 14, 0)
+
+
+def test_calendar_rules_find_the_next_matching_minute():
+    now = WEDNESDAY.timestamp()
+    assert recurrence.next_occurrence("daily 09:00", now, now) == ts(2030, 1, 17, 9, 0)
+    assert recurrence.next_occurrence("daily 11:00", now, now) == ts(2030, 1, 16, 11, 0)
+    assert recurrence.next_occurrence("weekly mon,fri 08:00", now, now) == ts(2030, 1, 18, 8, 0)
+    assert recurrence.next_occurrence("cron 0 0 1 * *", now, now) == ts(2030, 2, 1, 0, 0)
+    # A restricted day and weekday match if either does, as in cron
+    assert recurrence.next_occurrence("cron 0 0 20 * thu", now, now) == ts(2030, 1, 17, 0, 0)
+
+
+def test_next_occurrence_is_after_both_previous_and_after():
+    previous = ts(2030, 1, 20, 9, 0)
+    assert recurrence.next_occurrence("daily 09:00", previous, WEDNESDAY.timestamp()) == ts(2030, 1, 21, 9, 0)
+
+
+def test_impossible_cron_date_has_no_next_occurrence():
+    assert recurrence.next_occurrence("cron 0 0 30 feb *", WEDNESDAY.timestamp()) is None
@@ -0,0 +1,94 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from task_engine import TaskManagerAgent
+from task_model import COMPLETED, PENDING
+
+DAY = 86400
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.mark.parametrize("rule", ["every nanm", "every infh", "every 1e-9m", "every 2x"])
+def test_invalid_rules_never_reach_storage(agent, rule):
+    due = datetime.now() + timedelta(hours=1)
+    with pytest.raises(ValueError):
+        agent.create_task("Bad series", "", due, recurrence_rule=rule)
+    with pytest.raises(ValueError):
+        agent.create_tasks([{'title': "Fine", 'description': "", 'due_date': due},
+                            {'title': "Bad", 'description': "", 'due_date': due, 'recurrence_rule': rule}])
+
+    assert len(agent.store) == 0
+    agent.close()
+    reopened = TaskManagerAgent(agent.tasks_file, write_behind_interval=None, notification_sinks=[])
+    try:
+        assert len(reopened.store) == 0
+    finally:
+        reopened.close()
+
+
+def test_a_saved_invalid_rule_does_not_stop_startup(tmp_path):
+    path = tmp_path / "tasks.json"
+    due = (datetime.now() + timedelta(hours=1)).isoformat()
+    path.write_text(json.dumps([
+        {'id': "bad", 'title': "Bad series", 'due_date': due, 'status': PENDING, 'recurrence': "every nanm"},
+        {'id': "good", 'title': "Good series", 'due_date': due, 'status': PENDING, 'recurrence': "every 1d"},
+    ]))
+
+    agent = TaskManagerAgent(str(path), write_behind_interval=None, notification_sinks=[], archive_after_days=None)
+    try:
+        assert [task.id for task in agent.get_pending_tasks()] == ["bad", "good"]
+    finally:
+        agent.close()
+
+
+def test_completing_an_occurrence_moves_the_series_on(agent):
+    due = datetime.now() + timedelta(hours=1)
+    task_id = agent.create_task("Water plants", "", due, manual_reminder_minutes=10, recurrence_rule="every 1d")
+
+    assert agent.mark_task_completed(task_id)
+
+    task = agent.store.get(task_id)
+    assert task.status == PENDING
+    assert task.due_ts == pytest.approx(due.timestamp() + DAY)
+    assert task.manual_reminder_ts == pytest.approx(task.due_ts - 600)
+    assert task.completed_occurrences == 1 and task.missed_occurrences == 0
+
+
+def test_an_overdue_occurrence_stays_current_until_the_next_one_starts(agent):
+    task_id = agent.create_task("Stand-up", "", datetime.now() - timedelta(hours=1), recurrence_rule="every 1d")
+    agent.start_reminder_service()
+    time.sleep(0.2)
+
+    task = agent.store.get(task_id)
+    assert task.missed_occurrences == 0
+    assert agent.get_task_stats()['overdue'] == 1
+
+
+def test_missed_occurrences_roll_over_to_the_current_one(agent):
+    due = time.time() - 2.5 * DAY
+    task_id = agent.create_task("Backup", "", datetime.fromtimestamp(due), recurrence_rule="every 1d")
+    agent.start_reminder_service()
+
+    assert wait_for(lambda: agent.store.get(task_id).missed_occurrences == 2)
+    task = agent.store.get(task_id)
+    # The occurrence that started half a day ago is the current one, overdue but completable
+    assert task.due_ts == pytest.approx(due + 2 * DAY)
+    assert task.status == PENDING
+
+
+def test_a_series_without_further_occurrences_completes(agent):
+    # 29 February only comes round every four years, beyond the cron search window here
+    task_id = agent.create_task("Leap day", "", datetime(2030, 1, 1, 9), recurrence_rule="cron 0 9 30 feb *")
+    agent.mark_task_completed(task_id)
+    assert agent.store.get(task_id).status == COMPLETED
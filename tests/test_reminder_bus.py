@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from reminder_bus import ReminderBus, ReminderDigester, make_digest, notification_reminders, notification_task_ids
+
+
+def event(task_id: str, kind: str = "auto") -> dict:
+    return {'task_id': task_id, 'type': kind, 'title': f"Task {task_id}", 'message': "",
+            'due_at': "2030-01-15T12:00:00", 'sent_at': "2030-01-15T11:30:00"}
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_readers_keep_their_own_cursor_and_learn_what_they_missed():
+    bus = ReminderBus(capacity=3)
+    start = bus.cursor
+    for i in range(5):
+        bus.publish(event(str(i)))
+
+    events, cursor, missed = bus.read(start)
+    assert [item['task_id'] for item in events] == ["2", "3", "4"]
+    assert cursor == 5 and missed == 2
+    assert bus.read(cursor) == ([], 5, 0)
+    events, cursor, missed = bus.read(3, limit=1)
+    assert [item['task_id'] for item in events] == ["3"] and cursor == 4 and missed == 0
+
+
+def test_digests_list_every_reminder_they_stand_for():
+    single = event("a", "manual")
+    assert make_digest([single]) is single
+    assert notification_reminders(single) == [("a", "manual")]
+
+    digest = make_digest([event(str(i)) for i in range(12)] + [event("m", "manual")])
+    assert digest['type'] == 'digest' and digest['count'] == 13
+    assert notification_task_ids(digest)[-1] == "m"
+    assert notification_reminders(digest)[-1] == ("m", "manual")
+    assert digest['description'].endswith("… and 3 more")
+
+
+@pytest.fixture
+def running():
+    bus = ReminderBus()
+    submitted = []
+    backlog = [0]
+    digester = ReminderDigester(bus, submitted.append, lambda: backlog[0], window=0.3, max_backlog=5,
+                                burst=2, max_held=4)
+    digester.start()
+    yield bus, digester, submitted, backlog
+    digester.stop()
+
+
+def test_a_lone_reminder_goes_out_at_once(running):
+    bus, _, submitted, _ = running
+    bus.publish(event("a"))
+    assert wait_for(lambda: submitted, timeout=0.2)
+    assert submitted[0]['task_id'] == "a"
+
+
+def test_a_burst_is_folded_into_one_digest(running):
+    bus, _, submitted, _ = running
+    for i in range(5):
+        bus.publish(event(str(i)))
+
+    assert wait_for(lambda: len(submitted) == 3)
+    assert [item['task_id'] for item in submitted[:2]] == ["0", "1"]
+    assert submitted[2]['type'] == 'digest' and submitted[2]['task_ids'] == ["2", "3", "4"]
+
+
+def test_held_reminders_go_out_once_too_many_pile_up_behind_the_dispatcher(running):
+    bus, digester, submitted, backlog = running
+    backlog[0] = 10
+    for i in range(3):
+        bus.publish(event(str(i)))
+    time.sleep(0.5)
+    # The dispatcher is behind, so nothing goes out while few are held
+    assert submitted == []
+
+    bus.publish(event("3"))
+    assert wait_for(lambda: submitted)
+    assert submitted[0]['task_ids'] == ["0", "1", "2", "3"]
+    assert digester._held == []
+
+
+def test_stop_submits_what_is_held(running):
+    bus, digester, submitted, backlog = running
+    backlog[0] = 10
+    bus.publish(event("a"))
+    assert wait_for(lambda: digester._held)
+    digester.stop()
+    assert submitted == [event("a") | {'seq': 1}]
@@ -0,0 +1,94 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from reminder_queue import ReminderQueue
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_the_queue_pops_only_live_due_entries_in_order():
+    queue = ReminderQueue()
+    now = time.time()
+    queue.schedule("a", "auto", now - 2)
+    queue.schedule("b", "manual", now - 1)
+    queue.schedule("c", "auto", now + 3600)
+    queue.schedule("a", "auto", now - 3)
+    queue.cancel("b")
+
+    assert len(queue) == 2 and queue.reminder_count() == 2
+    assert queue.wait_due() == [("a", "auto", now - 3)]
+    assert queue.next_fire_time() == now + 3600
+
+
+def test_reminder_times_leave_out_bookkeeping_jobs():
+    queue = ReminderQueue()
+    now = time.time()
+    queue.schedule("series", "rollover", now + 10)
+    queue.schedule("__archive__", "archive", now + 20)
+    assert queue.next_fire_time() == now + 10
+    assert queue.next_reminder_time() is None and queue.reminder_count() == 0
+
+    queue.schedule("a", "manual", now + 30)
+    assert queue.next_reminder_time() == now + 30 and queue.reminder_count() == 1
+
+
+def test_an_earlier_deadline_wakes_the_waiting_worker():
+    queue = ReminderQueue()
+    queue.schedule("late", "auto", time.time() + 3600)
+    popped = []
+    worker = threading.Thread(target=lambda: popped.extend(queue.wait_due()))
+    worker.start()
+    time.sleep(0.05)
+
+    queue.schedule("soon", "manual", time.time() + 0.05)
+    worker.join(2)
+    assert [task_id for task_id, _, _ in popped] == ["soon"]
+
+
+def test_closing_releases_the_worker():
+    queue = ReminderQueue()
+    worker = threading.Thread(target=lambda: queue.wait_due())
+    worker.start()
+    queue.close()
+    worker.join(2)
+    assert not worker.is_alive()
+    queue.reopen()
+    queue.schedule("a", "auto", 0)
+    assert queue.wait_due() == [("a", "auto", 0)]
+
+
+def test_a_manual_reminder_fires_within_milliseconds(agent):
+    agent.start_reminder_service()
+    fire_at = datetime.now() + timedelta(seconds=0.3)
+    task_id = agent.create_task("Stand-up", "", fire_at + timedelta(minutes=60), manual_reminder_minutes=60)
+    start = agent.reminder_bus.cursor
+
+    assert wait_for(lambda: agent.reminder_bus.cursor > start)
+    events, _, _ = agent.reminder_bus.read(start)
+    assert events[0]['task_id'] == task_id and events[0]['type'] == "manual"
+    assert time.time() - fire_at.timestamp() < 0.25
+    assert wait_for(lambda: agent.store.get(task_id).manual_reminder_sent)
+    # Only the auto reminder, half an hour before the due time, is left
+    assert agent.reminder_queue.reminder_count() == 1
+
+
+def test_completing_or_deleting_a_task_cancels_its_reminders(agent):
+    due = datetime.now() + timedelta(hours=2)
+    done = agent.create_task("Done early", "", due, manual_reminder_minutes=30)
+    gone = agent.create_task("Not needed", "", due, manual_reminder_minutes=30)
+    kept = agent.create_task("Still on", "", due, manual_reminder_minutes=30)
+    assert agent.reminder_queue.reminder_count() == 6
+
+    agent.mark_task_completed(done)
+    agent.delete_task(gone)
+
+    assert agent.reminder_queue.reminder_count() == 2
+    assert {task_id for task_id, _ in agent.reminder_queue._live} == {kept}
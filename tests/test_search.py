@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import make_task
+from task_model import COMPLETED, PENDING
+from task_search import SearchIndex, tokenize
+from task_store import TaskStore
+
+
+@pytest.fixture
+def store():
+    return TaskStore([
+        make_task("report", title="Quarterly report", description="Numbers for the board", category="Work"),
+        make_task("repair", title="Repair bike", description="Front brake", category="Personal"),
+        make_task("notes", title="Board notes", description="Summarize the quarterly report"),
+        make_task("done", title="Old report", status=COMPLETED),
+    ])
+
+
+def ids(results):
+    return [task_id for task_id, _ in results]
+
+
+def test_tokenize():
+    assert tokenize("Pay the Rent, now!") == ["pay", "the", "rent", "now"]
+    assert tokenize("") == []
+
+
+def test_title_matches_rank_above_description_matches(store):
+    index = SearchIndex()
+    index.refresh(store)
+    ranked = ids(index.search("report"))
+    assert set(ranked[:2]) == {"report", "done"} and ranked[2] == "notes"
+
+
+def test_prefixes_and_every_term_must_match(store):
+    index = SearchIndex()
+    index.refresh(store)
+    assert set(ids(index.search("rep"))) == {"report", "repair", "notes", "done"}
+    assert set(ids(index.search("quart boa"))) == {"report", "notes"}
+    assert ids(index.search("repair brake")) == ["repair"]
+    assert index.search("repair unknown") == []
+    # Single letters only match whole words
+    assert index.search("r") == []
+
+
+def test_status_filter_and_limit(store):
+    index = SearchIndex()
+    index.refresh(store)
+    assert "done" not in ids(index.search("report", status=PENDING))
+    assert ids(index.search("report", status=COMPLETED)) == ["done"]
+    assert len(index.search("report", limit=1)) == 1
+    assert index.search("report", limit=0) == []
+
+
+def test_refresh_follows_store_changes(store):
+    index = SearchIndex()
+    assert index.refresh(store)
+    assert not index.refresh(store)
+
+    store.modify("repair", title="Service bike")
+    store.remove("notes")
+    store.add(make_task("new", title="Repaint fence"))
+    assert index.refresh(store)
+
+    assert set(ids(index.search("rep"))) == {"report", "done", "new"}
+    assert ids(index.search("service")) == ["repair"]
+    assert len(index) == 4
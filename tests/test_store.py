@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+
+from conftest import NOW, make_task
+from sqlite_store import SqliteTaskStore
+from task_model import COMPLETED, PENDING
+from task_store import TaskStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield TaskStore()
+    else:
+        store = SqliteTaskStore(str(tmp_path / "tasks.db"))
+        yield store
+        store.close()
+
+
+def test_add_get_and_status_partitions(store):
+    store.add(make_task("a", hours=3))
+    store.add(make_task("b", hours=1))
+    store.add(make_task("c", hours=-2, status=COMPLETED))
+
+    assert len(store) == 3 and "a" in store and "x" not in store
+    assert store.get("a").title == "Task a"
+    assert store.get("missing") is None
+    assert [task.id for task in store.pending()] == ["b", "a"]
+    assert [task.id for task in store.completed()] == ["c"]
+    assert store.count(PENDING) == 2 and store.count(COMPLETED) == 1
+
+
+def test_modify_returns_a_new_task_and_reindexes(store):
+    store.add(make_task("a", hours=1))
+    store.add(make_task("b", hours=2))
+    before = store.get("a")
+
+    updated = store.modify("a", due_ts=(NOW + timedelta(hours=5)).timestamp(), priority="High")
+
+    assert updated.priority == "High"
+    assert before.priority == "Medium"
+    assert [task.id for task in store.pending()] == ["b", "a"]
+    assert store.modify("missing", priority="High") is None
+
+
+def test_due_and_manual_reminder_ranges(store):
+    store.add(make_task("soon", hours=0.25, manual_reminder_time=NOW - timedelta(minutes=5)))
+    store.add(make_task("later", hours=5, manual_reminder_time=NOW + timedelta(hours=4)))
+    store.add(make_task("sent", hours=0.5, manual_reminder_time=NOW - timedelta(minutes=5),
+                        manual_reminder_sent=True))
+    store.add(make_task("done", hours=0.1, status=COMPLETED))
+
+    window = [task.id for task in store.due_between(NOW, NOW + timedelta(hours=1))]
+    assert window == ["soon", "sent"]
+    assert store.count_due_between(NOW, NOW + timedelta(hours=1)) == 2
+    assert [task.id for task in store.manual_reminders_before(NOW)] == ["soon"]
+
+
+def test_remove(store):
+    store.add(make_task("a"))
+    removed = store.remove("a")
+    assert removed.id == "a"
+    assert store.get("a") is None and len(store) == 0
+    assert store.remove("a") is None
+
+
+def test_delta_since_classifies_changes(store):
+    store.add(make_task("kept"))
+    store.add(make_task("gone"))
+    version = store.version
+
+    store.add(make_task("new"))
+    store.modify("kept", title="Renamed")
+    store.remove("gone")
+
+    delta = store.delta_since(version)
+    assert [task.id for task in delta.created] == ["new"]
+    assert [task.id for task in delta.updated] == ["kept"]
+    assert list(delta.deleted) == ["gone"]
+    assert delta.version == store.version
+    assert set(store.changes_since(version)) == {"new", "kept", "gone"}
+    assert store.changes_since(store.version) == []
+
+
+def test_memory_store_load_keeps_completed_records_deferred():
+    pending = [make_task(str(i), hours=10 - i) for i in range(5)]
+    done = make_task("done", hours=-1, status=COMPLETED).to_dict()
+    store = TaskStore()
+    store.add(make_task("old"))
+
+    store.load(pending, [done])
+    version = store.version
+
+    assert "old" not in store and len(store) == 6
+    assert [task.id for task in store.pending()] == ["4", "3", "2", "1", "0"]
+    assert store.count(COMPLETED) == 1
+    assert store.completed_before((NOW + timedelta(hours=1)).timestamp()) == [done]
+    # A load replaces everything, so readers holding an older version must rebuild
+    assert store.delta_since(version - 1) is None
+
+    # Building the deferred task on first access is not a change
+    assert store.get("done").status == COMPLETED
+    assert store.version == version
+    assert store.changes_since(version) == []
+
+
+def test_agent_reload_round_trips_tasks(tmp_path):
+    from task_engine import TaskManagerAgent
+
+    path = str(tmp_path / "tasks.json")
+    first = TaskManagerAgent(path, write_behind_interval=None, notification_sinks=[], archive_after_days=None)
+    ids = first.create_tasks([{'title': f"Task {i}", 'description': "", 'due_date': NOW + timedelta(hours=i)}
+                              for i in range(6)])
+    first.complete_tasks(ids[:2])
+    records = sorted(first.store.records(), key=lambda record: record['id'])
+    first.close()
+
+    second = TaskManagerAgent(path, write_behind_interval=None, notification_sinks=[], archive_after_days=None)
+    try:
+        assert second.store.count(PENDING) == 4 and second.store.count(COMPLETED) == 2
+        assert sorted(second.store.records(), key=lambda record: record['id']) == records
+    finally:
+        second.close()
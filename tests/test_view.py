@@ -0,0 +1,69 @@
+import pytest
+
+from conftest import make_task
+from task_model import COMPLETED, PENDING
+from task_store import TaskStore
+from task_view import LiveTaskList
+
+
+@pytest.fixture
+def store():
+    """Three pending tasks and two completed records left deferred, as after a load"""
+    store = TaskStore()
+    pending = [make_task("b", hours=2, priority="High"), make_task("a", hours=1), make_task("c", hours=3)]
+    deferred = [make_task(f"done{i}", hours=-i, status=COMPLETED, category="Archive").to_dict() for i in range(2)]
+    store.load(pending, deferred)
+    return store
+
+
+def ids(live):
+    return [task.id for task in live.tasks]
+
+
+def test_a_pending_list_leaves_completed_records_deferred(store):
+    live = LiveTaskList(PENDING)
+    assert live.refresh(store)
+
+    assert ids(live) == ["a", "b", "c"]
+    assert live.version == store.version
+    assert store.categories() == {"General", "Archive"}
+    assert len(store._deferred) == 2
+
+
+def test_a_completed_list_builds_them(store):
+    live = LiveTaskList(COMPLETED)
+    live.refresh(store)
+    assert ids(live) == ["done1", "done0"]
+    assert not store._deferred
+
+
+def test_refresh_moves_only_changed_tasks(store):
+    live = LiveTaskList(PENDING, priorities=("Medium",))
+    live.refresh(store)
+    assert not live.refresh(store)
+
+    store.modify("a", priority="High")
+    store.add(make_task("d", hours=0.5))
+    store.remove("c")
+    assert live.refresh(store)
+
+    assert ids(live) == ["d"]
+    assert live.times == [store.get("d").due_ts]
+    assert live.position(store.get("d").due_ts + 1) == 1
+    assert len(store._deferred) == 2
+
+
+def test_completing_a_task_moves_it_between_lists(store):
+    pending, completed = LiveTaskList(PENDING), LiveTaskList(COMPLETED)
+    pending.refresh(store)
+    completed.refresh(store)
+
+    task = store.get("a").copy()
+    task.status = COMPLETED
+    task.completed_ts = task.due_ts
+    store.update(task)
+    pending.refresh(store)
+    completed.refresh(store)
+
+    assert ids(pending) == ["b", "c"]
+    assert ids(completed) == ["done1", "done0", "a"]
@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from task_engine import TaskManagerAgent
+from task_storage import WriteBehindStorage
+
+
+class RecordingStorage:
+    """Keeps each append_many batch; fails the next `failures` calls"""
+
+    def __init__(self):
+        self.batches = []
+        self.saved = None
+        self.failures = 0
+        self.closed = False
+        self.written = threading.Event()
+
+    def load(self):
+        return []
+
+    def save(self, records):
+        self.saved = list(records)
+
+    def append_many(self, entries, snapshot=None):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.batches.append(list(entries))
+        self.written.set()
+
+    def close(self):
+        self.closed = True
+
+
+def entry(i: int):
+    return ("update", {'id': f"t{i}", 'title': f"Task {i}"})
+
+
+def test_a_burst_is_written_in_one_batch_after_the_interval():
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, interval=0.2)
+    start = time.perf_counter()
+    for i in range(200):
+        storage.append(*entry(i))
+    assert time.perf_counter() - start < 0.1
+    assert inner.batches == []
+
+    assert inner.written.wait(2)
+    storage.close()
+    assert len(inner.batches) == 1 and len(inner.batches[0]) == 200
+    assert inner.closed
+
+
+def test_a_full_batch_does_not_wait_for_the_interval():
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, interval=60, max_pending=10)
+    storage.append_many([entry(i) for i in range(10)])
+    assert inner.written.wait(2)
+    storage.close()
+
+
+def test_flush_writes_before_returning():
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, interval=60)
+    storage.append(*entry(1))
+    storage.flush()
+    assert inner.batches == [[entry(1)]]
+    storage.close()
+
+
+def test_a_failed_write_keeps_its_mutations_for_the_next_flush():
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, interval=60)
+    inner.failures = 1
+    storage.append(*entry(1))
+    try:
+        storage.flush()
+    except OSError:
+        pass
+    storage.append(*entry(2))
+    storage.close()
+    assert inner.batches == [[entry(1), entry(2)]]
+
+
+def test_save_writes_queued_mutations_after_the_snapshot():
+    inner = RecordingStorage()
+    storage = WriteBehindStorage(inner, interval=60)
+    storage.append(*entry(1))
+    storage.save([{'id': "t0"}])
+    assert inner.saved == [{'id': "t0"}] and inner.batches == [[entry(1)]]
+    storage.close()
+
+
+def test_flushed_writes_survive_a_crash(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    due = datetime.now() + timedelta(days=1)
+    agent = TaskManagerAgent(path, storage_mode="journal", write_behind_interval=60,
+                             notification_sinks=[], archive_after_days=None)
+    kept = agent.create_task("Flushed", "", due)
+    agent.flush()
+    agent.create_task("Still queued", "", due)
+    # No close(): as if the process died here, the journal holds only the flushed task
+    agent = TaskManagerAgent(path, storage_mode="journal", write_behind_interval=None,
+                             notification_sinks=[], archive_after_days=None)
+    try:
+        assert [task.id for task in agent.get_pending_tasks()] == [kept]
+    finally:
+        agent.close()
+
+
+def test_stopping_the_service_flushes(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    agent = TaskManagerAgent(path, storage_mode="journal", write_behind_interval=60,
+                             notification_sinks=[], archive_after_days=None)
+    agent.start_reminder_service()
+    task_id = agent.create_task("Written on stop", "", datetime.now() + timedelta(days=1))
+    agent.stop_reminder_service()
+
+    reader = TaskManagerAgent(path, storage_mode="journal", write_behind_interval=None,
+                              notification_sinks=[], archive_after_days=None)
+    try:
+        assert task_id in reader.store
+    finally:
+        reader.close()
+        agent.close()